@@ -0,0 +1,3 @@
+#!/bin/bash
+
+PYTHONPATH=src python3 -m benchmarks "$@"
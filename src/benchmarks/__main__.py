@@ -0,0 +1,29 @@
+import sys
+from importlib import import_module
+
+BENCHMARKS = [
+    "batch",
+    "blocks",
+    "escape",
+    "extractor",
+    "inline",
+    "memory",
+    "pipeline",
+    "reading",
+    "render",
+    "slowdisk",
+    "startup",
+    "transfer",
+]
+
+
+def main():
+    if len(sys.argv) < 2 or sys.argv[1] not in BENCHMARKS:
+        print(f"usage: bench.sh <{'|'.join(BENCHMARKS)}> [options]")
+        sys.exit(1)
+
+    import_module(f"benchmarks.{sys.argv[1]}").main(sys.argv[2:])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Throughput of converting many small markdown snippets, one call per snippet against `render_many`"""
+
+import argparse
+import os
+import timeit
+from typing import Callable, List
+
+from markdown import markdown_to_html, render_many
+
+from .corpus import SHAPES
+
+
+def snippets_per_second(
+    convert: Callable[[List[str]], object], snippets: List[str], repeat: int
+) -> float:
+    """Returns the best throughput of `repeat` conversions of every snippet"""
+    best = min(timeit.repeat(lambda: convert(snippets), number=1, repeat=repeat))
+    return len(snippets) / best
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Batch rendering benchmark")
+    parser.add_argument(
+        "--snippets", type=int, default=20000, help="Number of snippets (default: 20000)"
+    )
+    parser.add_argument(
+        "--shape", choices=sorted(SHAPES), default="mixed", help="Snippet shape (default: mixed)"
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes of the pooled run (default: number of CPUs)",
+    )
+    parser.add_argument("--chunksize", type=int, default=64, help="Snippets per chunk")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    args = parser.parse_args(argv)
+
+    make_section = SHAPES[args.shape]
+    snippets = [make_section(i) for i in range(args.snippets)]
+
+    runs = {
+        "markdown_to_html loop": lambda items: [markdown_to_html(item) for item in items],
+        "render_many": lambda items: list(render_many(items, chunksize=args.chunksize)),
+        f"render_many, {args.jobs} jobs": lambda items: list(
+            render_many(items, jobs=args.jobs, chunksize=args.chunksize)
+        ),
+    }
+    print(f"{args.snippets} {args.shape} snippets")
+    for name, convert in runs.items():
+        print(f"  {name:<28}{snippets_per_second(convert, snippets, args.repeat):>12,.0f} snippets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Compares the block classifier dispatching on the first character of a block with the chain of
+patterns it replaced, which tried every block type in turn"""
+
+import argparse
+import timeit
+from typing import Dict, List, Tuple
+
+from core import BlockType
+from markdown.block_parser import BlockData, block_to_block_type, iter_blocks
+from markdown.constants import (
+    CODE_PATTERN,
+    HEADING_PATTERN,
+    ORDERED_LIST_PATTERN,
+    QUOTE_PATTERN,
+    UNORDERED_LIST_PATTERN,
+)
+
+from .corpus import SHAPES, make_document
+
+
+def legacy_block_to_block_type(block: str) -> Tuple[BlockType, BlockData]:
+    """The previous classifier: five pattern attempts for every paragraph"""
+    if match := HEADING_PATTERN.match(block):
+        return BlockType.HEADING, match.groups()  # type: ignore[reportReturnType]
+    if match := CODE_PATTERN.match(block):
+        return BlockType.CODE, match.group(1)
+    if match := QUOTE_PATTERN.match(block):
+        return BlockType.QUOTE, match.group(1)
+    if match := UNORDERED_LIST_PATTERN.findall(block):
+        return BlockType.UNORDERED_LIST, match
+    if match := ORDERED_LIST_PATTERN.findall(block):
+        return BlockType.ORDERED_LIST, match
+    return BlockType.PARAGRAPH, block
+
+
+def run(sections: int, repeat: int) -> Dict[str, Tuple[float, float]]:
+    """Times the classification of every block of each corpus shape, returning the (legacy,
+    dispatch) seconds"""
+    results: Dict[str, Tuple[float, float]] = {}
+    for shape in sorted(SHAPES):
+        blocks = list(iter_blocks(make_document(sections, shape)))
+        if [legacy_block_to_block_type(b) for b in blocks] != [
+            block_to_block_type(b) for b in blocks
+        ]:
+            raise AssertionError(f"classifications differ for {shape}")
+        results[shape] = tuple(  # type: ignore[reportArgumentType]
+            min(timeit.repeat(lambda: [classify(b) for b in blocks], number=1, repeat=repeat))
+            for classify in (legacy_block_to_block_type, block_to_block_type)
+        )
+    return results
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Block classification benchmark")
+    parser.add_argument(
+        "--sections", type=int, default=2000, help="Sections of each corpus (default: 2000)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args(argv)
+
+    print(f"{'corpus':<10}{'legacy ms':>12}{'dispatch ms':>14}{'speedup':>10}")
+    for shape, (legacy, dispatch) in run(args.sections, args.repeat).items():
+        print(f"{shape:<10}{legacy * 1000:>12.2f}{dispatch * 1000:>14.2f}{legacy / dispatch:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""Synthetic markdown corpora of configurable size and shape for the benchmarks"""
+
+from pathlib import Path
+from typing import Callable, Dict
+
+MIXED_SECTION = """## Section {i}
+
+This paragraph has **bold text**, *italic text*, `inline code` and a [link](https://example.com/{i}) to another page, followed by an ![image](https://example.com/{i}.png).
+
+* first item with a [reference](https://example.com/ref/{i})
+* second item with **emphasis**
+* third item with `code`
+
+1. step one
+2. step two
+3. step three
+
+> A quote that closes the section {i}"""
+
+CODE_SECTION = """### Example {i}
+
+Call `render({i})` like this:
+
+```
+def render_{i}(page):
+    html = page.to_html()
+    return html.replace("a", "b")
+```"""
+
+
+def _mixed_section(i: int) -> str:
+    return MIXED_SECTION.format(i=i)
+
+
+def _links_section(i: int) -> str:
+    links = " ".join(
+        f"See [page {i}.{j}](https://example.com/{i}/{j}) and *note {j}*." for j in range(20)
+    )
+    return f"## Links {i}\n\n{links}"
+
+
+def _lists_section(i: int) -> str:
+    unordered = "\n".join(f"* item {i}.{j} with **bold**" for j in range(25))
+    ordered = "\n".join(f"{j + 1}. step {i}.{j} with `code`" for j in range(25))
+    return f"## Lists {i}\n\n{unordered}\n\n{ordered}"
+
+
+def _code_section(i: int) -> str:
+    return CODE_SECTION.format(i=i)
+
+
+SHAPES: Dict[str, Callable[[int], str]] = {
+    "mixed": _mixed_section,
+    "links": _links_section,
+    "lists": _lists_section,
+    "code": _code_section,
+}
+
+
+def make_document(sections: int, shape: str = "mixed") -> str:
+    """Builds a markdown document with `sections` sections of the given shape
+
+    Args:
+        sections: The number of sections in the document
+        shape: One of SHAPES (default: "mixed")
+
+    Returns:
+        str: The markdown of the document, which starts with a h1 header
+
+    """
+    make_section = SHAPES[shape]
+    return f"# {shape.title()} document\n\n" + "\n\n".join(
+        make_section(i) for i in range(sections)
+    )
+
+
+def write_corpus(root: Path, pages: int, sections: int, shape: str = "mixed"):
+    """Writes a content directory of `pages` markdown files, ten per directory
+
+    Args:
+        root: The content directory to create
+        pages: The number of markdown files
+        sections: The number of sections of each file
+        shape: One of SHAPES (default: "mixed")
+
+    """
+    for page in range(pages):
+        directory = root / f"section{page // 10}" / f"page{page}"
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "index.md").write_text(make_document(sections, shape))
@@ -0,0 +1,89 @@
+"""Compares the HTML escaping of the renderer, which returns strings with nothing to escape as they
+are, with `html.escape` applied to every value and with no escaping at all, for the strings of a
+page and for whole pages"""
+
+import argparse
+import html
+import timeit
+from typing import Callable, Dict, List, Tuple
+from unittest import mock
+
+from core import escape_attribute, escape_text
+from markdown import inline_parser, iter_page_html, iter_page_nodes, parser
+
+from .corpus import SHAPES, make_document
+
+# The (text, attribute) escape functions compared
+ESCAPES: Dict[str, Tuple[Callable[[str], str], Callable[[str], str]]] = {
+    "none": (str, str),
+    "html.escape": (lambda text: html.escape(text, quote=False), html.escape),
+    "fast path": (escape_text, escape_attribute),
+}
+
+
+def collect_strings(markdown: str) -> Tuple[List[str], List[str]]:
+    """Returns the text values and the attribute values of the nodes of a page"""
+    texts: List[str] = []
+    attributes: List[str] = []
+    pending = list(iter_page_nodes(markdown))
+    while pending:
+        node = pending.pop()
+        if node.value is not None:
+            texts.append(node.value)
+        attributes.extend(str(value) for value in (node.props or {}).values())
+        pending.extend(node.children or [])
+    return texts, attributes
+
+
+def render_with(
+    markdown: str, text_escape: Callable[[str], str], attribute_escape: Callable[[str], str]
+) -> str:
+    """Renders a page with the fused renderer, its escape functions swapped for the given ones"""
+    with (
+        mock.patch.object(inline_parser, "escape_text", text_escape),
+        mock.patch.object(inline_parser, "escape_attribute", attribute_escape),
+        mock.patch.object(parser, "escape_text", text_escape),
+    ):
+        return "\n".join(iter_page_html(markdown))
+
+
+def best(func: Callable[[], object], repeat: int) -> float:
+    """Returns the fastest of `repeat` calls, in seconds"""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def run(sections: int, repeat: int) -> Dict[str, List[float]]:
+    """Times every input with each of ESCAPES, in seconds"""
+    results: Dict[str, List[float]] = {}
+    for shape in sorted(SHAPES):
+        markdown = make_document(sections, shape)
+        texts, attributes = collect_strings(markdown)
+
+        def escape_strings(text_escape, attribute_escape):
+            [text_escape(text) for text in texts]
+            [attribute_escape(value) for value in attributes]
+
+        results[f"strings/{shape}"] = [
+            best(lambda: escape_strings(*escapes), repeat) for escapes in ESCAPES.values()
+        ]
+        results[f"page/{shape}"] = [
+            best(lambda: render_with(markdown, *escapes), repeat) for escapes in ESCAPES.values()
+        ]
+    return results
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="HTML escaping benchmark")
+    parser.add_argument(
+        "--sections", type=int, default=500, help="Sections of each page (default: 500)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args(argv)
+
+    print(f"{'input':<16}" + "".join(f"{name + ' ms':>16}" for name in ESCAPES))
+    for name, timings in run(args.sections, args.repeat).items():
+        print(f"{name:<16}" + "".join(f"{seconds * 1000:>16.2f}" for seconds in timings))
+
+
+if __name__ == "__main__":
+    main()
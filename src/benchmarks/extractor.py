@@ -0,0 +1,80 @@
+"""Per call cost of the extractor functions, against the raw pattern strings they used to pass to
+`re` on every call"""
+
+import argparse
+import re
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from markdown.extractor import (
+    extract_markdown_images,
+    extract_markdown_links,
+    extract_title,
+)
+
+# Typical inputs, most text nodes have no image or link at all
+TEXTS = {
+    "plain": "A sentence of plain text, the most common kind of text node on a page.",
+    "link": "A sentence with [a link](https://example.com/page) in the middle of it.",
+    "mixed": "An ![image](https://example.com/a.png), [a link](https://example.com/b) and "
+    "![another image](https://example.com/c.png) with [another link](https://example.com/d).",
+}
+TITLE_MARKDOWN = "# The title of the page\n\nThe first paragraph of the page."
+
+
+def raw_images(text: str) -> List[Tuple[str, str]]:
+    return re.findall(r"!\[(.*?)\]\((.*?)\)", text)
+
+
+def raw_links(text: str) -> List[Tuple[str, str]]:
+    return re.findall(r"\[(.*?)\]\((.*?)\)", text)
+
+
+def raw_title(markdown: str) -> str:
+    h1 = re.match(r"^# (.+)$", markdown, re.MULTILINE)
+    if h1:
+        return h1.group(1)
+    raise ValueError("H1 header not encountered in markdown passed")
+
+
+def per_call_ns(func: Callable[[], object], number: int, repeat: int) -> float:
+    """Returns the fastest mean time of a call, in nanoseconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number * 1e9
+
+
+def run(number: int, repeat: int) -> Dict[str, Tuple[float, float]]:
+    """Times every (before, after) pair, returning their per call nanoseconds"""
+    results: Dict[str, Tuple[float, float]] = {}
+    for name, text in TEXTS.items():
+        pairs = {
+            "images": (lambda: raw_images(text), lambda: extract_markdown_images(text)),
+            "links": (lambda: raw_links(text), lambda: extract_markdown_links(text)),
+        }
+        for function, (before, after) in pairs.items():
+            results[f"{function}/{name}"] = (
+                per_call_ns(before, number, repeat),
+                per_call_ns(after, number, repeat),
+            )
+
+    results["title"] = (
+        per_call_ns(lambda: raw_title(TITLE_MARKDOWN), number, repeat),
+        per_call_ns(lambda: extract_title(TITLE_MARKDOWN), number, repeat),
+    )
+    return results
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Extractor microbenchmark")
+    parser.add_argument(
+        "--number", type=int, default=20000, help="Calls per timing (default: 20000)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args(argv)
+
+    print(f"{'call/input':<16}{'before ns':>12}{'after ns':>12}{'speedup':>10}")
+    for name, (before, after) in run(args.number, args.repeat).items():
+        print(f"{name:<16}{before:>12.0f}{after:>12.0f}{before / after:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Compares the single pass inline scanner against the multi pass split pipeline it replaced"""
+
+import argparse
+import timeit
+from typing import List
+
+from core import TextNode, TextType
+from markdown.extractor import extract_markdown_images, extract_markdown_links
+from markdown.elements import paragraph_to_html
+from markdown.inline_parser import inline_to_html, split_nodes_delimiter, text_to_textnodes
+
+SPANS = [
+    "plain words between the elements",
+    "**bold words**",
+    "*italic words*",
+    "_underscored words_",
+    "`inline code`",
+    "[a link](https://example.com/page)",
+    "![an image](https://example.com/image.png)",
+]
+
+
+def legacy_split_nodes(old_nodes: List[TextNode], extractor, node_type: TextType):
+    """The previous image/link splitter, which re-splits the remaining text once per element"""
+    new_nodes: List[TextNode] = []
+    for old_node in old_nodes:
+        if old_node.text_type != TextType.TEXT:
+            new_nodes.append(old_node)
+            continue
+        text = old_node.text
+        elements = extractor(text)
+        if len(elements) == 0:
+            new_nodes.append(old_node)
+            continue
+        for el_text, el_url in elements:
+            prefix = "!" if node_type == TextType.IMAGE else ""
+            pre_element_text, text = text.split(f"{prefix}[{el_text}]({el_url})")
+            if pre_element_text != "":
+                new_nodes.append(TextNode(pre_element_text, TextType.TEXT))
+            new_nodes.append(TextNode(el_text, node_type, el_url))
+        if text != "":
+            new_nodes.append(TextNode(text, TextType.TEXT))
+    return new_nodes
+
+
+def legacy_text_to_textnodes(text: str) -> List[TextNode]:
+    """The previous implementation: one full pass over the node list per element type"""
+    nodes = [TextNode(text, TextType.TEXT)]
+    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
+    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+    nodes = legacy_split_nodes(nodes, extract_markdown_images, TextType.IMAGE)
+    nodes = legacy_split_nodes(nodes, extract_markdown_links, TextType.LINK)
+    return nodes
+
+
+def make_paragraph(spans: int, links_only: bool = False) -> str:
+    """Builds a paragraph with `spans` inline elements separated by plain text"""
+    if links_only:
+        parts = [f"[link {i}](https://example.com/{i})" for i in range(spans)]
+    else:
+        parts = [SPANS[i % len(SPANS)] for i in range(spans)]
+    return " and ".join(parts)
+
+
+def make_unmatched(spans: int, shape: str) -> str:
+    """Builds a paragraph of brackets that never make a link, "word [x" or "[a](b" without ")"."""
+    return ("word [x " if shape == "brackets" else "[a](b ") * spans
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Inline parsing benchmark")
+    parser.add_argument(
+        "--sizes",
+        type=int,
+        nargs="+",
+        default=[10, 100, 1000, 5000],
+        help="Number of inline elements per paragraph",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args(argv)
+
+    print(f"{'paragraph':<18}{'spans':>8}{'legacy ms':>12}{'scanner ms':>12}{'speedup':>10}")
+    for shape, links_only in (("mixed", False), ("links", True)):
+        for size in args.sizes:
+            text = make_paragraph(size, links_only)
+            if legacy_text_to_textnodes(text) != text_to_textnodes(text):
+                raise AssertionError(f"outputs differ for {shape} paragraph of {size}")
+
+            number = max(1, 20000 // size)
+            legacy = min(
+                timeit.repeat(
+                    lambda: legacy_text_to_textnodes(text),
+                    number=number,
+                    repeat=args.repeat,
+                )
+            )
+            scanner = min(
+                timeit.repeat(
+                    lambda: text_to_textnodes(text), number=number, repeat=args.repeat
+                )
+            )
+            print(
+                f"{shape:<18}{size:>8}{legacy / number * 1000:>12.3f}"
+                f"{scanner / number * 1000:>12.3f}{legacy / scanner:>9.1f}x"
+            )
+
+    # the legacy pipeline is superlinear on these, only the scanners are timed, a constant time
+    # per character shows they stay linear
+    print(
+        f"\n{'unmatched':<18}{'spans':>8}{'nodes ms':>12}{'html ms':>12}{'paragraph ms':>14}"
+        f"{'ns/char':>10}"
+    )
+    for shape in ("brackets", "links"):
+        for size in args.sizes:
+            text = make_unmatched(size, shape)
+            number = max(1, 20000 // size)
+            timings = [
+                min(timeit.repeat(lambda: render(text), number=number, repeat=args.repeat))
+                / number
+                for render in (text_to_textnodes, inline_to_html, paragraph_to_html)
+            ]
+            print(
+                f"{shape:<18}{size:>8}{timings[0] * 1000:>12.3f}{timings[1] * 1000:>12.3f}"
+                f"{timings[2] * 1000:>14.3f}{timings[1] / len(text) * 1e9:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""Measures the memory used to parse a large synthetic document into nodes and into a `Document`,
+and the peak memory of generating a page from it"""
+
+import argparse
+import gc
+import json
+import os
+import pickle
+import re
+import resource
+import tempfile
+import tracemalloc
+from pathlib import Path
+from typing import List
+
+from markdown import markdown_to_document, markdown_to_html_node, text_to_textnodes
+from utils import Template, write_page
+
+from .corpus import make_document
+
+# Block markers stripped from a line to get its inline content
+LINE_MARKER_PATTERN = re.compile(r"^(#+ |[*-] |[0-9]+\. |> )")
+
+
+def measure(markdown: str) -> dict:
+    """Parses the markdown into nodes, returning the allocations still alive and the peak"""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+
+    nodes = markdown_to_html_node(markdown)
+    text_nodes = [
+        text_to_textnodes(LINE_MARKER_PATTERN.sub("", line))
+        for line in markdown.splitlines()
+        if line
+    ]
+
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    # keep the nodes alive until the snapshot is taken
+    del nodes, text_nodes
+
+    return {
+        "live_bytes": sum(stat.size_diff for stat in stats),
+        "live_blocks": sum(stat.count_diff for stat in stats),
+        "peak_traced_bytes": peak,
+        # kilobytes on Linux
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def measure_document(markdown: str) -> dict:
+    """Parses the markdown into nodes and into a `Document`, returning the allocations still alive
+    and the pickled size of each"""
+    results = {}
+    for name, parse in (("nodes", markdown_to_html_node), ("document", markdown_to_document)):
+        gc.collect()
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        parsed = parse(markdown)
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        stats = after.compare_to(before, "filename")
+        results[f"{name}_live_bytes"] = sum(stat.size_diff for stat in stats)
+        results[f"{name}_live_blocks"] = sum(stat.count_diff for stat in stats)
+        results[f"{name}_pickle_bytes"] = len(pickle.dumps(parsed, pickle.HIGHEST_PROTOCOL))
+        del parsed
+    return results
+
+
+def measure_page(path: Path) -> dict:
+    """Generates a page from a markdown file, streamed block by block and read whole, returning the
+    peak of the traced allocations of each"""
+    template = Template("<title>{{ Title }}</title>{{ Content }}")
+    results = {}
+    for name in ("streamed", "read_whole"):
+        gc.collect()
+        tracemalloc.start()
+        with open(path) as source, open(os.devnull, "w") as out:
+            markdown = source if name == "streamed" else source.read()
+            write_page(markdown, template, out)
+            del markdown
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[f"page_peak_{name}_bytes"] = peak
+    return results
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Node memory benchmark")
+    parser.add_argument(
+        "--sections", type=int, default=5000, help="Sections in the synthetic document"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    markdown = make_document(args.sections)
+    results = {"sections": args.sections, "source_bytes": len(markdown)}
+    results.update(measure(markdown))
+    results.update(measure_document(markdown))
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "page.md"
+        path.write_text("# Title\n\n" + markdown)
+        del markdown
+        results.update(measure_page(path))
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for key, value in results.items():
+        print(f"{key:<28}{value:>16,}")
+
+
+if __name__ == "__main__":
+    main()
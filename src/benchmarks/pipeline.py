@@ -0,0 +1,218 @@
+"""Times each stage of the markdown to HTML pipeline the build runs on synthetic corpora: the
+blocks, their types, the inline rendering, the HTML of the whole page and the page written into
+its template.
+
+Results are written as JSON so runs can be compared, `--compare` flags the stages that got slower
+than a previous run by more than the threshold and exits with a non zero status.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import tempfile
+import time
+import timeit
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from core import BlockType
+from markdown import block_to_block_type, inline_to_html, iter_page_html, markdown_to_blocks
+from utils import Template, generate_page_recursive, write_page
+
+from .corpus import SHAPES, make_document, write_corpus
+
+TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><title>{{ Title }}</title><link href="/index.css" rel="stylesheet"></head>
+<body><article>{{ Content }}</article></body>
+</html>
+"""
+
+
+def best_time(func: Callable[[], object], repeat: int) -> float:
+    """Returns the fastest of `repeat` runs of `func`, in seconds"""
+    return min(timeit.repeat(func, number=1, repeat=repeat))
+
+
+def inline_contents(markdown: str) -> List[str]:
+    """Collects the inline markdown of every block, the input of the inline rendering stage"""
+    contents: List[str] = []
+    for block in markdown_to_blocks(markdown):
+        block_type, data = block_to_block_type(block)
+        match block_type:
+            case BlockType.HEADING:
+                contents.append(data[1])  # type: ignore[index]
+            case BlockType.QUOTE | BlockType.PARAGRAPH:
+                contents.append(data)  # type: ignore[arg-type]
+            case BlockType.UNORDERED_LIST:
+                contents.extend(data)  # type: ignore[arg-type]
+            case BlockType.ORDERED_LIST:
+                contents.extend(content for _, content in data)  # type: ignore[misc]
+    return [content for content in contents if content]
+
+
+def time_stages(markdown: str, repeat: int) -> Dict[str, float]:
+    """Times each stage of the conversion of one document, in seconds"""
+    blocks = markdown_to_blocks(markdown)
+    inline = inline_contents(markdown)
+    template = Template(TEMPLATE, "/docs/")
+
+    return {
+        "markdown_to_blocks": best_time(lambda: markdown_to_blocks(markdown), repeat),
+        "block_to_block_type": best_time(
+            lambda: [block_to_block_type(block) for block in blocks], repeat
+        ),
+        "inline_to_html": best_time(
+            lambda: [inline_to_html(content) for content in inline], repeat
+        ),
+        "iter_page_html": best_time(lambda: list(iter_page_html(markdown)), repeat),
+        "write_page": best_time(
+            lambda: write_page(markdown, template, io.StringIO()), repeat
+        ),
+    }
+
+
+def time_build(pages: int, sections: int, shape: str, repeat: int) -> float:
+    """Times generate_page_recursive over a generated content directory, in seconds"""
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        content = root / "content"
+        template = root / "template.html"
+        template.write_text(TEMPLATE)
+        write_corpus(content, pages, sections, shape)
+
+        timings = []
+        for run in range(repeat):
+            output = root / f"public{run}"
+            output.mkdir()
+            start = time.perf_counter()
+            # the per page progress lines would dominate the timing on a terminal
+            with contextlib.redirect_stdout(io.StringIO()):
+                generate_page_recursive(content, template, output, "/docs/")
+            timings.append(time.perf_counter() - start)
+        return min(timings)
+
+
+def run(args: argparse.Namespace) -> Dict[str, Dict[str, float]]:
+    results: Dict[str, Dict[str, float]] = {}
+
+    for shape in args.shapes:
+        # one huge file per shape, every stage timed separately
+        markdown = make_document(args.huge_sections, shape)
+        stages = time_stages(markdown, args.repeat)
+        stages["source_bytes"] = len(markdown)
+        results[f"huge/{shape}"] = stages
+
+        # many small files, timed end to end
+        results[f"many/{shape}"] = {
+            "generate_page_recursive": time_build(
+                args.pages, args.page_sections, shape, args.repeat
+            )
+        }
+
+    return results
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    threshold: float,
+) -> List[str]:
+    """Returns a description of every stage slower than the baseline by more than `threshold`"""
+    regressions = []
+    for corpus, stages in results.items():
+        for stage, seconds in stages.items():
+            previous = baseline.get(corpus, {}).get(stage)
+            if stage == "source_bytes" or not previous:
+                continue
+            ratio = seconds / previous
+            if ratio > 1 + threshold:
+                regressions.append(
+                    f"{corpus} {stage}: {previous * 1000:.2f} ms -> {seconds * 1000:.2f} ms ({ratio:.2f}x)"
+                )
+    return regressions
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Markdown pipeline benchmark")
+    parser.add_argument(
+        "--shapes",
+        nargs="+",
+        choices=sorted(SHAPES),
+        default=sorted(SHAPES),
+        help="Corpus shapes to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--huge-sections",
+        type=int,
+        default=2000,
+        help="Sections of the huge single file (default: 2000)",
+    )
+    parser.add_argument(
+        "--pages",
+        type=int,
+        default=200,
+        help="Files of the many small files corpus (default: 200)",
+    )
+    parser.add_argument(
+        "--page-sections",
+        type=int,
+        default=3,
+        help="Sections of each small file (default: 3)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    parser.add_argument("--output", type=Path, help="Write the results to a JSON file")
+    parser.add_argument(
+        "--compare", type=Path, help="A previous JSON result to check for regressions"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="Slowdown ratio reported as a regression (default: 0.1, i.e. 10%%)",
+    )
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "args": {
+                key: value
+                for key, value in vars(args).items()
+                if key not in ("output", "compare")
+            },
+        },
+        "results": results,
+    }
+
+    for corpus, stages in results.items():
+        print(corpus)
+        for stage, value in stages.items():
+            if stage == "source_bytes":
+                print(f"  {stage:<24}{value:>12,}")
+            else:
+                print(f"  {stage:<24}{value * 1000:>9.2f} ms")
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2))
+        print(f"Results written to {args.output}")
+
+    if args.compare:
+        baseline = json.loads(args.compare.read_text())["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.compare}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+        print(f"No regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+    main()
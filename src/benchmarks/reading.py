@@ -0,0 +1,115 @@
+"""Compares the ways of reading a large markdown source: read whole into a string, streamed line by
+line from a buffered file, and memory-mapped.
+
+Each mode generates the page in a fresh interpreter, so its peak RSS isn't hidden by the memory
+the previous modes already claimed.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from utils import MappedFile, Template, write_page
+
+from .corpus import make_document
+
+MODES = ["read", "stream", "mmap"]
+
+TEMPLATE = "<title>{{ Title }}</title><article>{{ Content }}</article>"
+
+
+def write_source(path: Path, megabytes: int):
+    """Writes a markdown file of about `megabytes` MB, made of repeated synthetic sections"""
+    chunk = make_document(1000).split("\n\n", 1)[1]
+    target = megabytes * 1024 * 1024
+    with open(path, "w") as f:
+        f.write("# Large document\n\n")
+        while f.tell() < target:
+            f.write(chunk)
+            f.write("\n\n")
+
+
+def generate(path: Path, mode: str) -> Dict[str, float]:
+    """Generates the page in the current process, returning its time and the process peak RSS"""
+    template = Template(TEMPLATE)
+    start = time.perf_counter()
+    with open(os.devnull, "w") as out:
+        if mode == "read":
+            with open(path) as f:
+                write_page(f.read(), template, out)
+        elif mode == "stream":
+            with open(path) as f:
+                write_page(f, template, out)
+        else:
+            with MappedFile(path) as f:
+                write_page(f, template, out)
+    seconds = time.perf_counter() - start
+    return {
+        "seconds": seconds,
+        "mb_per_second": path.stat().st_size / 1024 / 1024 / seconds,
+        # kilobytes on Linux
+        "peak_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+    }
+
+
+def run_mode(path: Path, mode: str) -> Dict[str, float]:
+    """Runs `generate` in a child interpreter"""
+    output = subprocess.run(
+        [sys.executable, "-m", "benchmarks.reading", "--child", mode, str(path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Large source reading benchmark")
+    parser.add_argument(
+        "--megabytes", type=int, default=100, help="Size of the markdown source (default: 100)"
+    )
+    parser.add_argument(
+        "--modes",
+        nargs="+",
+        choices=MODES,
+        default=MODES,
+        help="Reading modes to compare (default: all)",
+    )
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        mode, path = args.child
+        print(json.dumps(generate(Path(path), mode)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "large.md"
+        write_source(path, args.megabytes)
+        results = {"source_bytes": path.stat().st_size}
+        for mode in args.modes:
+            results[mode] = run_mode(path, mode)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"source: {results['source_bytes'] / 1024 / 1024:.1f} MB")
+    print(f"  {'mode':<8}{'seconds':>10}{'MB/s':>10}{'peak RSS MB':>14}")
+    for mode in args.modes:
+        result = results[mode]
+        print(
+            f"  {mode:<8}{result['seconds']:>10.2f}{result['mb_per_second']:>10.2f}"
+            f"{result['peak_rss_kb'] / 1024:>14.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Compares the node based rendering of markdown with the fused renderer that goes straight from
+markdown text to HTML, for single inline spans and for whole pages"""
+
+import argparse
+import timeit
+from io import StringIO
+from typing import Callable, Dict, List, Tuple
+
+from markdown import inline_to_html, iter_page_html, iter_page_nodes, parse_inline
+
+from .corpus import SHAPES, make_document
+from .inline import make_paragraph
+
+
+def nodes_inline(text: str) -> str:
+    return "".join(node.to_html() for node in parse_inline(text))
+
+
+def nodes_page(markdown: str) -> str:
+    # the node tree rendering the build used before the fused renderer
+    out = StringIO()
+    for index, node in enumerate(iter_page_nodes(markdown)):
+        if index:
+            out.write("\n")
+        node.write_html(out)
+    return out.getvalue()
+
+
+def fused_page(markdown: str) -> str:
+    return "\n".join(iter_page_html(markdown))
+
+
+def best(func: Callable[[], object], number: int, repeat: int) -> float:
+    """Returns the fastest mean time of a call, in seconds"""
+    return min(timeit.repeat(func, number=number, repeat=repeat)) / number
+
+
+def run(args: argparse.Namespace) -> Dict[str, Tuple[float, float]]:
+    """Times every (nodes, fused) pair, returning their seconds per call"""
+    cases: Dict[str, Tuple[Callable[[str], str], Callable[[str], str], str, int]] = {}
+    for size in (1, 10, 100):
+        text = make_paragraph(size)
+        cases[f"inline/{size} spans"] = (nodes_inline, inline_to_html, text, 20000 // size)
+    cases["inline/plain"] = (nodes_inline, inline_to_html, "just some plain words", 20000)
+    for shape in sorted(SHAPES):
+        markdown = make_document(args.sections, shape)
+        cases[f"page/{shape}"] = (nodes_page, fused_page, markdown, 1)
+
+    results: Dict[str, Tuple[float, float]] = {}
+    for name, (nodes, fused, text, number) in cases.items():
+        if nodes(text) != fused(text):
+            raise AssertionError(f"outputs differ for {name}")
+        results[name] = (
+            best(lambda: nodes(text), number, args.repeat),
+            best(lambda: fused(text), number, args.repeat),
+        )
+    return results
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Node based against fused rendering benchmark")
+    parser.add_argument(
+        "--sections", type=int, default=500, help="Sections of each page (default: 500)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args(argv)
+
+    print(f"{'input':<18}{'nodes us':>12}{'fused us':>12}{'speedup':>10}")
+    for name, (nodes, fused) in run(args).items():
+        print(f"{name:<18}{nodes * 1e6:>12.1f}{fused * 1e6:>12.1f}{nodes / fused:>9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Times a full build on a simulated slow filesystem, one page at a time and with the async driver.
+
+Every file opened by the page generation waits a fixed latency first, the way each open pays a
+round trip on a network filesystem. The content is generated with the corpus helpers.
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+from unittest import mock
+
+from utils import fs, generate_page_recursive
+
+from .corpus import SHAPES, write_corpus
+
+TEMPLATE = "<title>{{ Title }}</title><article>{{ Content }}</article>"
+
+
+def with_latency(func: Callable, latency: float) -> Callable:
+    """Wraps a file opening function so every call sleeps for `latency` seconds first"""
+
+    def slow(*args, **kwargs):
+        time.sleep(latency)
+        return func(*args, **kwargs)
+
+    return slow
+
+
+def time_build(content: Path, template: Path, output: Path, **options) -> float:
+    """Builds the site once, returning the wall time in seconds"""
+    output.mkdir()
+    start = time.perf_counter()
+    # the per page progress lines would dominate the timing on a terminal
+    with contextlib.redirect_stdout(io.StringIO()):
+        generate_page_recursive(content, template, output, "/docs/", **options)
+    return time.perf_counter() - start
+
+
+def run(args: argparse.Namespace) -> Dict[str, float]:
+    modes = {
+        "serial": {},
+        f"async x{args.concurrency}": {"io_concurrency": args.concurrency},
+    }
+    if args.jobs > 1:
+        modes[f"async x{args.concurrency}, {args.jobs} jobs"] = {
+            "io_concurrency": args.concurrency,
+            "jobs": args.jobs,
+        }
+
+    results: Dict[str, float] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        content = root / "content"
+        template = root / "template.html"
+        template.write_text(TEMPLATE)
+        write_corpus(content, args.pages, args.sections, args.shape)
+
+        latency = args.latency_ms / 1000
+        with (
+            mock.patch.object(fs, "open", with_latency(builtins.open, latency), create=True),
+            mock.patch.object(fs, "open_markdown", with_latency(fs.open_markdown, latency)),
+        ):
+            for index, (name, options) in enumerate(modes.items()):
+                results[name] = time_build(content, template, root / f"public{index}", **options)
+
+    return results
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Slow filesystem build benchmark")
+    parser.add_argument("--pages", type=int, default=500, help="Markdown files (default: 500)")
+    parser.add_argument(
+        "--sections", type=int, default=3, help="Sections of each file (default: 3)"
+    )
+    parser.add_argument(
+        "--shape", choices=sorted(SHAPES), default="mixed", help="Corpus shape (default: mixed)"
+    )
+    parser.add_argument(
+        "--latency-ms",
+        type=float,
+        default=5,
+        help="Latency added to every file opened, in milliseconds (default: 5)",
+    )
+    parser.add_argument(
+        "--concurrency", type=int, default=32, help="Pages in flight with the async driver"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Also time the async driver with worker processes"
+    )
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{args.pages} pages, {args.latency_ms:g} ms per file opened")
+    baseline = results["serial"]
+    for name, seconds in results.items():
+        print(f"  {name:<24}{seconds:>10.2f} s{baseline / seconds:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Startup cost of a build: the import time of the generator and of the daemon client, and the time
+to the first page and to the end of a build, run by a cold `main.py` and by a warm daemon through
+`client.py`. Every build is a new process, the way CI runs them.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+from .corpus import SHAPES, write_corpus
+
+SRC = Path(__file__).resolve().parents[1]
+TEMPLATE = "<title>{{ Title }}</title><article>{{ Content }}</article>"
+
+
+def time_command(argv: List[str], cwd: Path) -> Tuple[float, float]:
+    """Runs a command, returning the seconds until it printed its first line and until it exited"""
+    start = time.perf_counter()
+    process = subprocess.Popen(argv, cwd=cwd, stdout=subprocess.PIPE, text=True)
+    assert process.stdout is not None
+    first_line = time.perf_counter() if process.stdout.readline() else float("nan")
+    process.stdout.read()
+    if process.wait():
+        raise RuntimeError(f"{' '.join(argv)} exited with {process.returncode}")
+    return first_line - start, time.perf_counter() - start
+
+
+def best(argv: List[str], cwd: Path, repeat: int) -> Tuple[float, float]:
+    """Returns the fastest of `repeat` runs of a command, see `time_command`"""
+    runs = [time_command(argv, cwd) for _ in range(repeat)]
+    return min(first for first, _ in runs), min(total for _, total in runs)
+
+
+def time_imports(repeat: int) -> Dict[str, float]:
+    """Times a new interpreter alone and importing the generator or the client, in seconds"""
+    statements = {
+        "interpreter": "pass",
+        "import main": "import main",
+        "import client": "import client",
+    }
+    return {
+        name: best([sys.executable, "-c", f"{statement}; print()"], SRC, repeat)[1]
+        for name, statement in statements.items()
+    }
+
+
+def wait_for(path: Path, timeout: float = 10):
+    deadline = time.monotonic() + timeout
+    while not path.exists():
+        if time.monotonic() > deadline:
+            raise RuntimeError(f"The daemon didn't create {path}")
+        time.sleep(0.01)
+
+
+def time_builds(root: Path, jobs: int, repeat: int) -> Dict[str, Tuple[float, float]]:
+    """Times the builds of the site in `root`, returning the seconds to the first page and to
+    the end of each"""
+    socket_path = root / "daemon.sock"
+    build_args = ["/docs/", "--output", "public", "--jobs", str(jobs)]
+    cli = [sys.executable, str(SRC / "main.py"), *build_args]
+    client = [sys.executable, str(SRC / "client.py"), *build_args, "--socket", str(socket_path)]
+
+    results = {"cli": best(cli, root, repeat)}
+    daemon = subprocess.Popen(
+        [sys.executable, str(SRC / "main.py"), "--daemon", "--socket", str(socket_path)],
+        cwd=root,
+        stdout=subprocess.DEVNULL,
+    )
+    try:
+        wait_for(socket_path)
+        results["daemon, first build"] = time_command(client, root)
+        results["daemon"] = best(client, root, repeat)
+    finally:
+        subprocess.run(
+            [sys.executable, str(SRC / "client.py"), "--stop", "--socket", str(socket_path)],
+            stdout=subprocess.DEVNULL,
+        )
+        daemon.wait(10)
+    return results
+
+
+def run(args: argparse.Namespace) -> Dict[str, Dict]:
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        (root / "template.html").write_text(TEMPLATE)
+        (root / "static").mkdir()
+        write_corpus(root / "content", args.pages, args.sections, args.shape)
+        return {
+            "imports": time_imports(args.repeat),
+            "builds": time_builds(root, args.jobs, args.repeat),
+        }
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Build startup benchmark, cold CLI vs daemon")
+    parser.add_argument("--pages", type=int, default=200, help="Markdown files (default: 200)")
+    parser.add_argument(
+        "--sections", type=int, default=3, help="Sections of each file (default: 3)"
+    )
+    parser.add_argument(
+        "--shape", choices=sorted(SHAPES), default="mixed", help="Corpus shape (default: mixed)"
+    )
+    parser.add_argument(
+        "--jobs", type=int, default=1, help="Worker processes of each build (default: 1)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run(args)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    for name, seconds in results["imports"].items():
+        print(f"{name:<24}{seconds * 1000:>10.1f} ms")
+    print(f"\n{args.pages} pages, {args.jobs} jobs")
+    print(f"{'build':<24}{'first page ms':>16}{'total ms':>12}")
+    for name, (first_page, total) in results["builds"].items():
+        print(f"{name:<24}{first_page * 1000:>16.1f}{total * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
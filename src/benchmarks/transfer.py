@@ -0,0 +1,90 @@
+"""Cost of shipping parse results between processes: a dump and load round trip of the nodes of a
+synthetic document with the default pickling of their slots and with the registered reducers, and
+of the same document as a `Document`"""
+
+import argparse
+import copyreg
+import io
+import pickle
+import re
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+from core import LeafNode, ParentNode, TextNode
+from markdown import markdown_to_document, markdown_to_html_node, text_to_textnodes
+
+from .corpus import SHAPES, make_document
+
+# Block markers stripped from a line to get its inline content
+LINE_MARKER_PATTERN = re.compile(r"^(#+ |[*-] |[0-9]+\. |> )")
+
+# The pickling of the classes before they had reducers
+DEFAULT_DISPATCH_TABLE = {
+    cls: reducer
+    for cls, reducer in copyreg.dispatch_table.items()
+    if cls not in (ParentNode, LeafNode, TextNode)
+}
+
+
+def default_dumps(obj: object) -> bytes:
+    buffer = io.BytesIO()
+    pickler = pickle.Pickler(buffer, pickle.HIGHEST_PROTOCOL)
+    pickler.dispatch_table = DEFAULT_DISPATCH_TABLE
+    pickler.dump(obj)
+    return buffer.getvalue()
+
+
+def dumps(obj: object) -> bytes:
+    return pickle.dumps(obj, pickle.HIGHEST_PROTOCOL)
+
+
+def round_trip(
+    dump: Callable[[object], bytes], load: Callable[[bytes], object], obj: object, repeat: int
+) -> Tuple[float, int]:
+    """Returns the best time of a dump and load round trip, in seconds, and the size of the dump"""
+    seconds = min(timeit.repeat(lambda: load(dump(obj)), number=1, repeat=repeat))
+    return seconds, len(dump(obj))
+
+
+def run(markdown: str, repeat: int) -> Dict[str, Tuple[float, int]]:
+    html_nodes = markdown_to_html_node(markdown)
+    text_nodes = [
+        node
+        for line in markdown.splitlines()
+        if line
+        for node in text_to_textnodes(LINE_MARKER_PATTERN.sub("", line))
+    ]
+    document = markdown_to_document(markdown)
+
+    cases = {
+        "nodes/default pickle": (default_dumps, pickle.loads, html_nodes),
+        "nodes/pickle": (dumps, pickle.loads, html_nodes),
+        "text nodes/default pickle": (default_dumps, pickle.loads, text_nodes),
+        "text nodes/pickle": (dumps, pickle.loads, text_nodes),
+        "document/pickle": (dumps, pickle.loads, document),
+    }
+    return {
+        name: round_trip(dump, load, obj, repeat)  # type: ignore[reportArgumentType]
+        for name, (dump, load, obj) in cases.items()
+    }
+
+
+def main(argv: List[str] | None = None):
+    parser = argparse.ArgumentParser(description="Parse result transfer benchmark")
+    parser.add_argument(
+        "--sections", type=int, default=2000, help="Sections in the synthetic document"
+    )
+    parser.add_argument(
+        "--shape", choices=sorted(SHAPES), default="mixed", help="Section shape (default: mixed)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timing repetitions")
+    args = parser.parse_args(argv)
+
+    markdown = make_document(args.sections, args.shape)
+    print(f"{'payload/format':<28}{'round trip ms':>14}{'bytes':>14}")
+    for name, (seconds, size) in run(markdown, args.repeat).items():
+        print(f"{name:<28}{seconds * 1000:>14.1f}{size:>14,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""Sends a build to the daemon started with `main.py --daemon` and prints its output.
+
+Takes the same arguments as `main.py`, e.g. `python3 src/client.py /base/ --output public`. Only
+the standard library is imported, so a build costs the interpreter startup and a round trip to the
+daemon, see utils/daemon.py for the protocol.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+
+# The same default as in main.py
+DEFAULT_SOCKET = ".ssg.sock"
+
+
+def main():
+    # the other arguments are the ones of the build, parsed by the daemon
+    parser = argparse.ArgumentParser(add_help=False)
+    parser.add_argument("--socket", type=str, default=DEFAULT_SOCKET)
+    parser.add_argument("--stop", action="store_true")
+    args, build_argv = parser.parse_known_args()
+
+    if args.stop:
+        request = {"stop": True}
+    else:
+        request = {"argv": build_argv + ["--socket", args.socket], "cwd": os.getcwd()}
+
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(args.socket)
+    except OSError:
+        client.close()
+        raise SystemExit(
+            f"No build daemon is listening on {args.socket}, "
+            "start one with `python3 src/main.py --daemon`"
+        )
+
+    with client, client.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode() + b"\n")
+        stream.flush()
+        for line in stream:
+            message = json.loads(line)
+            if "exit" in message:
+                sys.exit(message["exit"])
+            if "stdout" in message:
+                sys.stdout.write(message["stdout"])
+            if "stderr" in message:
+                sys.stderr.write(message["stderr"])
+
+    raise SystemExit("The build daemon closed the connection before the build ended")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+from .document import Document, DocumentBuilder
+from .escape import escape_attribute, escape_text
 from .htmlnode import HTMLNode
 from .leafnode import LeafNode
 from .parentnode import ParentNode
+from . import serialization  # registers the pickle reducers of the nodes
 from .textnode import TextNode
 from .types import *
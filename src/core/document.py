@@ -0,0 +1,353 @@
+from array import array
+from io import StringIO
+from typing import Dict, List, TextIO, Tuple
+
+from .escape import escape_attribute, escape_text
+from .htmlnode import HTMLNode
+from .leafnode import LeafNode
+from .parentnode import ParentNode
+
+# The kinds of node of a document
+ELEMENT = 0  # a node with children, like a ParentNode
+LEAF = 1  # a node with a text value, like a LeafNode
+
+Props = Dict[str, str | None]
+
+
+class Document:
+    """A parsed page stored as a struct of arrays instead of a tree of node objects.
+
+    Node `i` is described by the i-th item of each array, nodes are in document order (a parent
+    comes before its children). Tags and attributes are ids into tables shared by the nodes, and
+    the text values are slices of a single string. A document costs a few arrays however many
+    nodes it has, each of the smallest item size holding its values, and pickles as their raw
+    bytes without an object per node.
+    """
+
+    __slots__ = (
+        "kinds",
+        "tags",
+        "parents",
+        "starts",
+        "ends",
+        "attrs",
+        "text",
+        "tag_names",
+        "attributes",
+    )
+
+    def __init__(
+        self,
+        kinds: array,
+        tags: array,
+        parents: array,
+        starts: array,
+        ends: array,
+        attrs: array,
+        text: str,
+        tag_names: List[str | None],
+        attributes: List[Props],
+    ) -> None:
+        """
+        Args:
+            kinds: The kind of each node, ELEMENT or LEAF
+            tags: The id of the tag of each node, an index into `tag_names`
+            parents: The index of the parent of each node, -1 for a top level node
+            starts: The offset in `text` where the value of each leaf starts, -1 for no value
+            ends: The offset in `text` where the value of each leaf ends
+            attrs: The id of the attributes of each node, an index into `attributes`, -1 for none
+            text: The text values of every leaf, concatenated
+            tag_names: The tag of each tag id, None for plain text
+            attributes: The attributes of each attribute id
+        """
+        self.kinds = kinds
+        self.tags = tags
+        self.parents = parents
+        self.starts = starts
+        self.ends = ends
+        self.attrs = attrs
+        self.text = text
+        self.tag_names = tag_names
+        self.attributes = attributes
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def value(self, index: int) -> str | None:
+        """Returns the text value of a node"""
+        start = self.starts[index]
+        return None if start < 0 else self.text[start : self.ends[index]]
+
+    def write_html(self, out: TextIO):
+        """Writes the HTML of the document into `out` in a single walk over the nodes, the top
+        level nodes are separated by line breaks.
+
+        The HTML is the same as the one of the `HTMLNode` tree, including its rules: an element
+        must have a tag and children and its attributes aren't rendered, a leaf must have a value
+        unless it's an image.
+        """
+        kinds, tags, parents, starts, ends, attrs = (
+            self.kinds,
+            self.tags,
+            self.parents,
+            self.starts,
+            self.ends,
+            self.attrs,
+        )
+        text = self.text
+        tag_names = self.tag_names
+        opening = [f"<{tag}>" for tag in tag_names]
+        closing = [f"</{tag}>" for tag in tag_names]
+        rendered_attributes = [_attributes_to_html(props) for props in self.attributes]
+        count = len(kinds)
+        # the HTML is collected in pieces and written once
+        parts: List[str] = []
+        write = parts.append
+        # the open elements, innermost last
+        stack: List[int] = []
+
+        for index in range(count):
+            parent = parents[index]
+            while stack and stack[-1] != parent:
+                write(closing[tags[stack.pop()]])
+            if parent < 0 and index:
+                write("\n")
+
+            tag_id = tags[index]
+            tag = tag_names[tag_id]
+            if kinds[index] == ELEMENT:
+                if not tag:
+                    raise ValueError("ParentNode must have a tag")
+                if index + 1 == count or parents[index + 1] != index:
+                    raise ValueError("ParentNode must have childrens")
+                write(opening[tag_id])
+                stack.append(index)
+                continue
+
+            attr = attrs[index]
+            if tag == "img":
+                write(f"<img{rendered_attributes[attr] if attr >= 0 else ''}>")
+                continue
+            start = starts[index]
+            if start < 0:
+                raise ValueError("Leaf node must have a value")
+            value = escape_text(text[start : ends[index]])
+            if tag is None:
+                write(value)
+            elif attr < 0:
+                write(f"{opening[tag_id]}{value}{closing[tag_id]}")
+            else:
+                write(f"<{tag}{rendered_attributes[attr]}>{value}</{tag}>")
+
+        while stack:
+            write(closing[tags[stack.pop()]])
+        out.write("".join(parts))
+
+    def to_html(self) -> str:
+        """Renders the document as an HTML string"""
+        buffer = StringIO()
+        self.write_html(buffer)
+        return buffer.getvalue()
+
+    def to_nodes(self) -> List[HTMLNode]:
+        """Builds the `HTMLNode` tree view of the document
+
+        Returns:
+            List[HTMLNode]: The top level nodes
+
+        """
+        nodes: List[HTMLNode] = []
+        top_level: List[HTMLNode] = []
+        for index in range(len(self.kinds)):
+            tag = self.tag_names[self.tags[index]]
+            attr = self.attrs[index]
+            # every node gets its own copy, like the nodes built by the parser
+            props = dict(self.attributes[attr]) if attr >= 0 else None
+            if self.kinds[index] == ELEMENT:
+                node: HTMLNode = ParentNode(tag, [], props)
+            else:
+                node = LeafNode(tag, self.value(index), props)
+            nodes.append(node)
+
+            parent = self.parents[index]
+            if parent < 0:
+                top_level.append(node)
+            else:
+                nodes[parent].children.append(node)  # type: ignore[reportOptionalMemberAccess]
+        return top_level
+
+    @classmethod
+    def from_nodes(cls, html_nodes: List[HTMLNode]) -> "Document":
+        """Builds a document from an `HTMLNode` tree
+
+        Args:
+            html_nodes: The top level nodes
+
+        Returns:
+            Document: The document holding the same nodes
+
+        Raises:
+            ValueError: If a node is neither a ParentNode nor a LeafNode
+
+        """
+        builder = DocumentBuilder()
+
+        def _add(node: HTMLNode):
+            if isinstance(node, ParentNode):
+                builder.open(node.tag, node.props)
+                for child in node.children or []:
+                    _add(child)
+                builder.close()
+            elif isinstance(node, LeafNode):
+                builder.leaf(node.tag, node.value, node.props)
+            else:
+                raise ValueError(f"{type(node).__name__} can't be stored in a document")
+
+        for node in html_nodes:
+            _add(node)
+        return builder.build()
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Document):
+            return NotImplemented
+        return self.to_nodes() == other.to_nodes()
+
+    def __repr__(self) -> str:
+        return f"Document(nodes={len(self)}, text_length={len(self.text)}, tags={self.tag_names!r})"
+
+
+class DocumentBuilder:
+    """Appends nodes to a document in document order, without creating node objects"""
+
+    __slots__ = (
+        "kinds",
+        "tags",
+        "parents",
+        "starts",
+        "ends",
+        "attrs",
+        "_texts",
+        "_length",
+        "_open",
+        "_parent",
+        "_tag_ids",
+        "_attribute_ids",
+        "_attributes",
+    )
+
+    def __init__(self) -> None:
+        # plain lists while building, they are packed into arrays once the document is complete
+        self.kinds: List[int] = []
+        self.tags: List[int] = []
+        self.parents: List[int] = []
+        self.starts: List[int] = []
+        self.ends: List[int] = []
+        self.attrs: List[int] = []
+        self._texts: List[str] = []
+        self._length = 0
+        self._open: List[int] = []
+        self._parent = -1
+        self._tag_ids: Dict[str | None, int] = {}
+        self._attribute_ids: Dict[Tuple[Tuple[str, str | None], ...], int] = {}
+        self._attributes: List[Props] = []
+
+    def _tag_id(self, tag: str | None) -> int:
+        tag_id = self._tag_ids.get(tag)
+        if tag_id is None:
+            tag_id = self._tag_ids[tag] = len(self._tag_ids)
+        return tag_id
+
+    def _attribute_id(self, props: Props | None) -> int:
+        if not props:
+            return -1
+        key = tuple(props.items())
+        attr_id = self._attribute_ids.get(key)
+        if attr_id is None:
+            attr_id = self._attribute_ids[key] = len(self._attributes)
+            self._attributes.append(dict(props))
+        return attr_id
+
+    def open(self, tag: str | None, props: Props | None = None) -> int:
+        """Appends an element, the next nodes are its children until `close` is called
+
+        Returns:
+            int: The index of the element
+
+        """
+        index = len(self.kinds)
+        self.kinds.append(ELEMENT)
+        self.tags.append(self._tag_id(tag))
+        self.parents.append(self._parent)
+        self.starts.append(-1)
+        self.ends.append(-1)
+        self.attrs.append(self._attribute_id(props))
+        self._open.append(index)
+        self._parent = index
+        return index
+
+    def close(self):
+        """Closes the innermost open element"""
+        self._open.pop()
+        self._parent = self._open[-1] if self._open else -1
+
+    def leaf(self, tag: str | None, value: str | None, props: Props | None = None) -> int:
+        """Appends a leaf to the innermost open element, or to the top level
+
+        Returns:
+            int: The index of the leaf
+
+        """
+        index = len(self.kinds)
+        self.kinds.append(LEAF)
+        tag_id = self._tag_ids.get(tag)
+        self.tags.append(self._tag_id(tag) if tag_id is None else tag_id)
+        self.parents.append(self._parent)
+        if value is None:
+            self.starts.append(-1)
+            self.ends.append(-1)
+        else:
+            self._texts.append(value)
+            self.starts.append(self._length)
+            self._length += len(value)
+            self.ends.append(self._length)
+        self.attrs.append(self._attribute_id(props) if props else -1)
+        return index
+
+    def build(self) -> Document:
+        """Returns the document, every element must be closed
+
+        Raises:
+            ValueError: If an element is still open
+
+        """
+        if self._open:
+            raise ValueError("Document has unclosed elements")
+        return Document(
+            array("B", self.kinds),
+            _packed(self.tags),
+            _packed(self.parents),
+            _packed(self.starts),
+            _packed(self.ends),
+            _packed(self.attrs),
+            "".join(self._texts),
+            list(self._tag_ids),
+            self._attributes,
+        )
+
+
+def _packed(values: List[int]) -> array:
+    # the smallest signed array holding the values, which are at least -1
+    largest = max(values, default=0)
+    for typecode in "bhi":
+        if largest < 1 << (8 * array(typecode).itemsize - 1):
+            return array(typecode, values)
+    return array("q", values)
+
+
+def _attributes_to_html(props: Props) -> str:
+    # the same format as HTMLNode.props_to_html
+    if props:
+        return " " + " ".join(
+            f'{key}="{escape_attribute(str(value))}"' for key, value in props.items()
+        )
+    return ""
@@ -0,0 +1,37 @@
+def escape_text(text: str) -> str:
+    """Escapes text content for HTML, `&`, `<` and `>` become character references.
+
+    Most text has nothing to escape, it's returned as is after a scan for each special character,
+    which is cheaper than a regex search or the replacements themselves.
+
+    Args:
+        text: The text to escape
+
+    Returns:
+        str: The escaped text
+
+    """
+    if "&" in text or "<" in text or ">" in text:
+        return text.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return text
+
+
+def escape_attribute(value: str) -> str:
+    """Escapes an attribute value for HTML, like `escape_text` plus the double quote that would end
+    the value
+
+    Args:
+        value: The attribute value to escape
+
+    Returns:
+        str: The escaped value
+
+    """
+    if "&" in value or "<" in value or ">" in value or '"' in value:
+        return (
+            value.replace("&", "&amp;")
+            .replace("<", "&lt;")
+            .replace(">", "&gt;")
+            .replace('"', "&quot;")
+        )
+    return value
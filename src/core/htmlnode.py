@@ -1,7 +1,13 @@
-from typing import Dict, List
+from io import StringIO
+from typing import Dict, Iterator, List, TextIO
+
+from .escape import escape_attribute
 
 
 class HTMLNode:
+    # no per-instance __dict__, a large page allocates thousands of nodes
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(
         self,
         tag: str | None = None,
@@ -22,16 +28,27 @@ class HTMLNode:
         self.props = props
 
     def to_html(self) -> str:
+        """Renders the node as an HTML string"""
+        buffer = StringIO()
+        self.write_html(buffer)
+        return buffer.getvalue()
+
+    def write_html(self, out: TextIO):
+        """Writes the HTML of the node fragment by fragment into `out` (e.g. an open file or a StringIO)"""
+        raise NotImplementedError("This method should be overriden by child classes.")
+
+    def iter_html(self) -> Iterator[str]:
+        """Yields the HTML of the node fragment by fragment"""
         raise NotImplementedError("This method should be overriden by child classes.")
 
     def props_to_html(self) -> str:
         """
-        Returns a string that represents the HTML attributes of the node.
+        Returns a string that represents the HTML attributes of the node, the values are escaped.
         """
         if self.props:
             leading_space = " "
             return leading_space + " ".join(
-                f'{key}="{value}"' for key, value in self.props.items()
+                f'{key}="{escape_attribute(str(value))}"' for key, value in self.props.items()
             )
         return ""
 
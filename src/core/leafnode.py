@@ -1,11 +1,14 @@
-from typing import Dict
+from typing import Dict, Iterator, TextIO
 
+from .escape import escape_text
 from .htmlnode import HTMLNode
 
 
 class LeafNode(HTMLNode):
     """Represents a single HTML tag with no children. For example, a simple `<p>` tag."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         tag: str | None = None,
@@ -15,7 +18,7 @@ class LeafNode(HTMLNode):
         super().__init__(tag=tag, value=value, children=None, props=props)
 
     def to_html(self) -> str:
-        """Renders a leaf node as an HTML string"""
+        """Renders a leaf node as an HTML string, the value is escaped"""
         props_parsed = self.props_to_html()
 
         if self.tag == "img":
@@ -24,6 +27,12 @@ class LeafNode(HTMLNode):
         if self.value is None:
             raise ValueError("Leaf node must have a value")
         if self.tag is None:
-            return self.value
+            return escape_text(self.value)
+
+        return f"<{self.tag}{props_parsed}>{escape_text(self.value)}</{self.tag}>"
+
+    def write_html(self, out: TextIO):
+        out.write(self.to_html())
 
-        return f"<{self.tag}{props_parsed}>{self.value}</{self.tag}>"
+    def iter_html(self) -> Iterator[str]:
+        yield self.to_html()
@@ -1,10 +1,13 @@
-from typing import Dict, List
+from typing import Dict, Iterator, List, TextIO
+
 from .htmlnode import HTMLNode
 
 
 class ParentNode(HTMLNode):
     """Represents a HTML node with nested children. For example, a `<ul>` tag with multiple childrens `<li>` tags."""
 
+    __slots__ = ()
+
     def __init__(
         self,
         tag: str | None = None,
@@ -13,13 +16,23 @@ class ParentNode(HTMLNode):
     ) -> None:
         super().__init__(tag=tag, value=None, children=children, props=props)
 
-    def to_html(self) -> str:
+    def _validate(self):
         if not self.tag:
             raise ValueError("ParentNode must have a tag")
         if not self.children:
             raise ValueError("ParentNode must have childrens")
-        content = ""
-        for node in self.children:
-            content += node.to_html()
 
-        return f"<{self.tag}>{content}</{self.tag}>"
+    def write_html(self, out: TextIO):
+        """Writes the node and its descendants straight into `out`, no intermediate strings are built"""
+        self._validate()
+        out.write(f"<{self.tag}>")
+        for node in self.children:  # type: ignore[reportOptionalIterable]
+            node.write_html(out)
+        out.write(f"</{self.tag}>")
+
+    def iter_html(self) -> Iterator[str]:
+        self._validate()
+        yield f"<{self.tag}>"
+        for node in self.children:  # type: ignore[reportOptionalIterable]
+            yield from node.iter_html()
+        yield f"</{self.tag}>"
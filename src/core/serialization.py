@@ -0,0 +1,16 @@
+"""Cheap pickling of the nodes, e.g. when parse results are sent back from worker processes.
+
+The reducers registered here make `pickle` rebuild the nodes with a plain constructor call instead
+of restoring the generic state of their slots, which makes the pickles smaller and faster to load.
+A `Document` needs no reducer, its arrays are pickled as raw bytes.
+"""
+
+import copyreg
+
+from .leafnode import LeafNode
+from .parentnode import ParentNode
+from .textnode import TextNode
+
+copyreg.pickle(ParentNode, lambda node: (ParentNode, (node.tag, node.children, node.props)))
+copyreg.pickle(LeafNode, lambda node: (LeafNode, (node.tag, node.value, node.props)))
+copyreg.pickle(TextNode, lambda node: (TextNode, (node.text, node.text_type, node.url)))
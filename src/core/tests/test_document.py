@@ -0,0 +1,121 @@
+import pickle
+import unittest
+from io import StringIO
+
+from core.document import Document, DocumentBuilder
+from core.leafnode import LeafNode
+from core.parentnode import ParentNode
+
+
+def make_nodes():
+    return [
+        ParentNode(
+            "p",
+            [
+                LeafNode(None, "Normal text "),
+                LeafNode("b", "bold"),
+                LeafNode("a", "a link", {"href": "https://example.com"}),
+            ],
+        ),
+        ParentNode(
+            "ul",
+            [
+                ParentNode("li", [LeafNode("i", "first")]),
+                ParentNode("li", [LeafNode("img", None, {"src": "a.png", "alt": "A"})]),
+            ],
+        ),
+        LeafNode("a", "another link", {"href": "https://example.com"}),
+    ]
+
+
+class TestDocumentBuilder(unittest.TestCase):
+    def test_arrays(self):
+        builder = DocumentBuilder()
+        builder.open("p")
+        builder.leaf(None, "Hello ")
+        builder.leaf("b", "world")
+        builder.close()
+        document = builder.build()
+
+        self.assertEqual(len(document), 3)
+        self.assertEqual(list(document.parents), [-1, 0, 0])
+        self.assertEqual(document.tag_names, ["p", None, "b"])
+        self.assertEqual(document.text, "Hello world")
+        self.assertEqual(document.value(0), None)
+        self.assertEqual(document.value(2), "world")
+
+    def test_shared_attributes(self):
+        builder = DocumentBuilder()
+        builder.leaf("a", "one", {"href": "/a"})
+        builder.leaf("a", "two", {"href": "/a"})
+        builder.leaf("a", "three", {"href": "/b"})
+        document = builder.build()
+
+        self.assertEqual(document.attributes, [{"href": "/a"}, {"href": "/b"}])
+        self.assertEqual(list(document.attrs), [0, 0, 1])
+
+    def test_item_size_fits_the_values(self):
+        builder = DocumentBuilder()
+        builder.leaf(None, "x" * 200)
+        builder.leaf("b", "bold")
+        document = builder.build()
+
+        self.assertEqual(document.tags.typecode, "b")
+        self.assertEqual(document.parents.typecode, "b")
+        self.assertEqual(document.starts.typecode, "h")
+        self.assertEqual(list(document.ends), [200, 204])
+        self.assertEqual(document.value(1), "bold")
+
+    def test_unclosed_element(self):
+        builder = DocumentBuilder()
+        builder.open("p")
+        with self.assertRaises(ValueError) as context:
+            builder.build()
+        self.assertEqual(str(context.exception), "Document has unclosed elements")
+
+
+class TestDocument(unittest.TestCase):
+    def test_to_html(self):
+        nodes = make_nodes()
+        expected = "\n".join(node.to_html() for node in nodes)
+        self.assertEqual(Document.from_nodes(nodes).to_html(), expected)
+
+    def test_write_html(self):
+        out = StringIO()
+        Document.from_nodes(make_nodes()).write_html(out)
+        self.assertEqual(out.getvalue(), Document.from_nodes(make_nodes()).to_html())
+
+    def test_to_nodes(self):
+        self.assertEqual(Document.from_nodes(make_nodes()).to_nodes(), make_nodes())
+
+    def test_empty(self):
+        document = Document.from_nodes([])
+        self.assertEqual(len(document), 0)
+        self.assertEqual(document.to_html(), "")
+        self.assertEqual(document.to_nodes(), [])
+
+    def test_pickle(self):
+        document = Document.from_nodes(make_nodes())
+        self.assertEqual(pickle.loads(pickle.dumps(document)), document)
+
+    def test_element_without_tag(self):
+        document = Document.from_nodes([ParentNode(None, [LeafNode(None, "text")])])
+        with self.assertRaises(ValueError) as context:
+            document.to_html()
+        self.assertEqual(str(context.exception), "ParentNode must have a tag")
+
+    def test_element_without_children(self):
+        document = Document.from_nodes([ParentNode("p", None)])
+        with self.assertRaises(ValueError) as context:
+            document.to_html()
+        self.assertEqual(str(context.exception), "ParentNode must have childrens")
+
+    def test_leaf_without_value(self):
+        document = Document.from_nodes([LeafNode("b", None)])
+        with self.assertRaises(ValueError) as context:
+            document.to_html()
+        self.assertEqual(str(context.exception), "Leaf node must have a value")
+
+
+if __name__ == "__main__":
+    unittest.main()
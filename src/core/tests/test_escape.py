@@ -0,0 +1,36 @@
+import html
+import unittest
+
+from core.escape import escape_attribute, escape_text
+
+
+class TestEscapeText(unittest.TestCase):
+    def test_special_characters(self):
+        self.assertEqual(escape_text('a < b && c > "d"'), 'a &lt; b &amp;&amp; c &gt; "d"')
+
+    def test_nothing_to_escape(self):
+        text = "plain prose, with 'quotes' and \"double quotes\""
+        self.assertIs(escape_text(text), text)
+
+    def test_same_as_html_escape(self):
+        for text in ["<script>alert(1)</script>", "&amp;", "1 > 0", "x&y<z"]:
+            with self.subTest(text=text):
+                self.assertEqual(escape_text(text), html.escape(text, quote=False))
+
+
+class TestEscapeAttribute(unittest.TestCase):
+    def test_special_characters(self):
+        self.assertEqual(
+            escape_attribute('/search?q="a"&b=<c>'), "/search?q=&quot;a&quot;&amp;b=&lt;c&gt;"
+        )
+
+    def test_nothing_to_escape(self):
+        value = "https://example.com/page?id=1"
+        self.assertIs(escape_attribute(value), value)
+
+    def test_single_quotes_are_kept(self):
+        self.assertEqual(escape_attribute("it's"), "it's")
+
+
+if __name__ == "__main__":
+    unittest.main()
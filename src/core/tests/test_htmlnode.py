@@ -21,6 +21,11 @@ class TestHTMLNode(unittest.TestCase):
         node = HTMLNode(props=test_props)
         self.assertEqual(node.props_to_html(), expected_result)
 
+    def test_props_to_html_escapes_values(self):
+        node = HTMLNode(props={"alt": 'a "quoted" <alt>', "src": "/a.png?x=1&y=2"})
+        expected = ' alt="a &quot;quoted&quot; &lt;alt&gt;" src="/a.png?x=1&amp;y=2"'
+        self.assertEqual(node.props_to_html(), expected)
+
     def test_props_to_html_with_no_props(self):
         expected_result = ""
         test_props = None
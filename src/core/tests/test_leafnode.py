@@ -21,9 +21,27 @@ class TestLeafNode(unittest.TestCase):
         expected = "This is a text node."
         self.assertEqual(node.to_html(), expected)
 
+    def test_value_is_escaped(self):
+        node = LeafNode(tag="code", value="if a < b && b > c")
+        expected = "<code>if a &lt; b &amp;&amp; b &gt; c</code>"
+        self.assertEqual(node.to_html(), expected)
+
+    def test_raw_text_is_escaped(self):
+        node = LeafNode(value="< Back Home")
+        self.assertEqual(node.to_html(), "&lt; Back Home")
+
     def test_invalid_leaf_node_no_value(self):
         node = LeafNode(
             tag="p",
         )
         with self.assertRaises(ValueError):
             print(node.to_html())
+
+    def test_repr(self):
+        node = LeafNode("a", "Click me!", {"href": "/"})
+        expected = "LeafNode(tag='a', value='Click me!', children=None, props={'href': '/'})"
+        self.assertEqual(repr(node), expected)
+
+    def test_no_instance_dict(self):
+        node = LeafNode("p", "This is a paragraph of text.")
+        self.assertFalse(hasattr(node, "__dict__"))
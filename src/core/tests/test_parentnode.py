@@ -1,4 +1,5 @@
 import unittest
+from io import StringIO
 
 from core.parentnode import ParentNode
 from core.leafnode import LeafNode
@@ -106,3 +107,26 @@ class TestParentNode(unittest.TestCase):
         outer_parent = ParentNode(tag="div", children=[inner_parent])
         expected = "<div><p><span><b>Bold text</b>Normal text</span></p></div>"
         self.assertEqual(outer_parent.to_html(), expected)
+
+    def test_write_html_matches_to_html(self):
+        node = ParentNode(
+            tag="ul",
+            children=[
+                ParentNode("li", [LeafNode("b", "Bold text"), LeafNode(None, "text")]),
+                ParentNode("li", [LeafNode("a", "link", {"href": "/"})]),
+            ],
+        )
+        out = StringIO()
+        node.write_html(out)
+        self.assertEqual(out.getvalue(), node.to_html())
+
+    def test_iter_html_fragments(self):
+        node = ParentNode("p", [LeafNode("b", "Bold text"), LeafNode(None, "text")])
+        expected = ["<p>", "<b>Bold text</b>", "text", "</p>"]
+        self.assertEqual(list(node.iter_html()), expected)
+
+    def test_iter_html_invalid_nested(self):
+        node = ParentNode("div", [ParentNode("p", None)])
+        with self.assertRaises(ValueError) as context:
+            list(node.iter_html())
+        self.assertEqual(str(context.exception), "ParentNode must have childrens")
@@ -0,0 +1,66 @@
+import copyreg
+import pickle
+import unittest
+
+from core.document import Document
+from core.leafnode import LeafNode
+from core.parentnode import ParentNode
+from core.textnode import TextNode
+from core.types import TextType
+
+
+def make_nodes():
+    return [
+        ParentNode(
+            "p",
+            [
+                LeafNode(None, "Unicode text: café ☃ "),
+                LeafNode("b", "bold"),
+                LeafNode("a", "a link", {"href": "https://example.com"}),
+                LeafNode("a", "a link without url", {"href": None}),
+            ],
+        ),
+        ParentNode(
+            "ul",
+            [
+                ParentNode("li", [LeafNode("i", "")]),
+                ParentNode("li", [LeafNode("img", None, {"src": "a.png", "alt": "A"})]),
+            ],
+        ),
+        ParentNode("pre", [LeafNode("code", "line one\nline two\n")]),
+    ]
+
+
+def make_text_nodes():
+    return [
+        TextNode("Some text with café ", TextType.TEXT),
+        TextNode("bold", TextType.BOLD),
+        TextNode("", TextType.ITALIC),
+        TextNode("code", TextType.CODE),
+        TextNode("a link", TextType.LINK, "https://example.com"),
+        TextNode("an image", TextType.IMAGE, "image.png"),
+    ]
+
+
+class TestPickle(unittest.TestCase):
+    def test_nodes(self):
+        nodes = make_nodes()
+        restored = pickle.loads(pickle.dumps(nodes))
+        self.assertEqual(restored, nodes)
+        self.assertIsInstance(restored[0], ParentNode)
+        self.assertIsInstance(restored[0].children[0], LeafNode)
+
+    def test_text_nodes(self):
+        self.assertEqual(pickle.loads(pickle.dumps(make_text_nodes())), make_text_nodes())
+
+    def test_reducers_are_registered(self):
+        for cls in (ParentNode, LeafNode, TextNode):
+            self.assertIn(cls, copyreg.dispatch_table)
+
+    def test_document(self):
+        document = Document.from_nodes(make_nodes())
+        self.assertEqual(pickle.loads(pickle.dumps(document)), document)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -24,6 +24,15 @@ class TestTextNode(unittest.TestCase):
         node2 = TextNode("This is a text node", TextType.BOLD, "https://url2")
         self.assertNotEqual(node, node2)
 
+    def test_repr(self):
+        node = TextNode("link", TextType.LINK, "https://url")
+        expected = "TextNode(text='link', text_type='link', url='https://url')"
+        self.assertEqual(repr(node), expected)
+
+    def test_no_instance_dict(self):
+        node = TextNode("This is a text node", TextType.BOLD)
+        self.assertFalse(hasattr(node, "__dict__"))
+
 
 if __name__ == "__main__":
     unittest.main()
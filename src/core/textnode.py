@@ -2,6 +2,9 @@ from .types import TextType
 
 
 class TextNode:
+    # no per-instance __dict__, a large page allocates thousands of nodes
+    __slots__ = ("text", "text_type", "url")
+
     def __init__(self, text: str, text_type: TextType, url: str | None = None) -> None:
         """
         Args:
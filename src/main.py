@@ -1,10 +1,32 @@
 import argparse
+import os
 from pathlib import Path
+from typing import List
 
-from utils import generate_page_recursive, sync_directories
+from markdown import InlineCache, set_inline_cache
+from utils import (
+    BuildDaemon,
+    BuildError,
+    BuildManifest,
+    DevServer,
+    NullProfiler,
+    Profiler,
+    RenderCache,
+    SiteCache,
+    SiteWatcher,
+    generate_page_recursive,
+    get_profiler,
+    mirror_directories,
+    set_profiler,
+    sync_directories,
+)
 
 
-def main():
+# The socket of the build daemon, relative to the working directory. The same as in client.py
+DEFAULT_SOCKET = ".ssg.sock"
+
+
+def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Static Site Generator")
     parser.add_argument(
         "basepath",
@@ -37,8 +59,107 @@ def main():
         default="docs",
         help="Path to output directory (default: 'docs')",
     )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only regenerate pages whose source, template or basepath changed since the last build, and only copy the static files that changed",
+    )
+    parser.add_argument(
+        "--checksum",
+        action="store_true",
+        help="With --incremental, compare static files by content hash instead of size and modification time",
+    )
+    parser.add_argument(
+        "--link",
+        action="store_true",
+        help="With --incremental, hardlink static files into the output instead of copying them",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=str,
+        help="Reuse the HTML of pages rendered before from this directory, which can be shared between builds and machines",
+    )
+    parser.add_argument(
+        "--cache-size",
+        type=int,
+        default=1024,
+        help="With --cache-dir, the size in MB the cache is trimmed to after the build (default: 1024)",
+    )
+    parser.add_argument(
+        "--inline-cache",
+        type=int,
+        default=0,
+        help="Render each inline string once while it is among this many most recently used, and print the hit rate after the build (default: 0, disabled)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Number of worker processes used to render pages (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--io-concurrency",
+        type=int,
+        default=0,
+        help="Read and write the files of up to this many pages concurrently, which speeds up builds on slow or network filesystems (default: 0, one page at a time)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After building, keep running and update the output as the sources change",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Start a development server that renders pages on demand and reloads the browser on changes, nothing is written to the output",
+    )
+    parser.add_argument(
+        "--port",
+        type=int,
+        default=8888,
+        help="Port of the development server (default: 8888)",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record the time spent in each stage of the build and print a report at the end",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=10,
+        help="With --profile, the number of slowest pages listed (default: 10)",
+    )
+    parser.add_argument(
+        "--profile-trace",
+        type=str,
+        help="With --profile, also write a Chrome trace event JSON file to this path",
+    )
+    parser.add_argument(
+        "--daemon",
+        action="store_true",
+        help="Keep running and serve the builds sent by client.py over a Unix socket, which saves the interpreter startup, the imports and the walk of the content on every build",
+    )
+    parser.add_argument(
+        "--socket",
+        type=str,
+        default=DEFAULT_SOCKET,
+        help=f"With --daemon, the path of the Unix socket (default: '{DEFAULT_SOCKET}')",
+    )
+    return parser
 
-    args = parser.parse_args()
+
+def run(args: argparse.Namespace, site: SiteCache | None = None):
+    """Runs a build, as described by the command line arguments
+
+    Args:
+        args: The parsed command line arguments
+        site: The content inventories and templates kept by the build daemon, if the build
+            was sent to it
+
+    """
+    if site is not None and (args.watch or args.serve or args.daemon):
+        raise SystemExit("--watch, --serve and --daemon can't be sent to the build daemon")
 
     basepath = args.basepath
     source = Path(args.source)
@@ -46,14 +167,100 @@ def main():
     statics = Path(args.static)
     output = Path(args.output)
 
+    if args.serve:
+        server = DevServer(("localhost", args.port), source, template, statics, basepath)
+        server.serve()
+        return
+
     # Ensure the "public" directory exists.
     # Create the directory along with any necessary parent directories.
     output.mkdir(parents=True, exist_ok=True)
 
-    # cleans the destination, then syncs the contents
-    sync_directories(statics, output)
+    profiler = get_profiler()
+    if args.profile:
+        profiler = Profiler()
+        set_profiler(profiler)
+
+    cache = None
+    if args.cache_dir:
+        cache = RenderCache(Path(args.cache_dir), args.cache_size * 1024 * 1024)
+
+    inline_cache = None
+    if args.inline_cache > 0:
+        inline_cache = InlineCache(args.inline_cache)
+        set_inline_cache(inline_cache)
+
+    manifest = None
+    with profiler.stage("sync"):
+        if args.incremental:
+            # keep the previous output, the manifest tells which pages are still valid
+            manifest = BuildManifest.load(output / BuildManifest.FILENAME)
+            mirror_directories(
+                statics, output, manifest, checksum=args.checksum, link=args.link
+            )
+        else:
+            # cleans the destination, then syncs the contents
+            sync_directories(statics, output)
+
+    pages = compiled_template = None
+    if site is not None:
+        pages = site.pages(source, output)
+        compiled_template = site.template(template, basepath)
+
+    try:
+        with profiler.stage("generate"):
+            generate_page_recursive(
+                source,
+                template,
+                output,
+                basepath,
+                manifest=manifest,
+                jobs=args.jobs,
+                cache=cache,
+                io_concurrency=args.io_concurrency,
+                pages=pages,
+                template=compiled_template,
+            )
+    except BuildError as e:
+        if not args.watch:
+            raise SystemExit(str(e))
+        # the failed pages are generated again on their next change
+        print(e)
+    finally:
+        if inline_cache is not None:
+            print(inline_cache.summary())
+        if isinstance(profiler, Profiler):
+            print(profiler.report(args.profile_top))
+            if args.profile_trace:
+                profiler.write_trace(Path(args.profile_trace))
+                print(f"Trace written to {args.profile_trace}")
+        # the watch mode isn't profiled
+        set_profiler(NullProfiler())
+
+    if args.watch:
+        watcher = SiteWatcher(
+            source, template, statics, output, basepath, manifest=manifest, jobs=args.jobs
+        )
+        watcher.run()
+
+
+def main():
+    parser = build_parser()
+    args = parser.parse_args()
+
+    if args.daemon:
+
+        def build(argv: List[str], site: SiteCache):
+            run(parser.parse_args(argv), site)
+
+        try:
+            daemon = BuildDaemon(Path(args.socket), build)
+        except ValueError as e:
+            raise SystemExit(str(e))
+        daemon.serve()
+        return
 
-    generate_page_recursive(source, template, output, basepath)
+    run(args)
 
 
 if __name__ == "__main__":
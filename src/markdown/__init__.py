@@ -1,4 +1,6 @@
 from .block_parser import *
 from .elements import *
+from .inline_parser import *
 from .parser import *
 from .extractor import *
+from .batch import *
@@ -0,0 +1,104 @@
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from typing import Deque, Iterable, Iterator, List, NamedTuple, TextIO
+
+from .parser import iter_page_html
+
+
+class RenderResult(NamedTuple):
+    """The outcome of converting one markdown string, either its HTML or the error it raised"""
+
+    html: str | None
+    error: Exception | None
+
+
+def write_html_blocks(out: TextIO, html_blocks: Iterable[str]):
+    """Writes the HTML of top level blocks into `out`, one block per line
+
+    Args:
+        out: The file-like object the HTML is written into
+        html_blocks: The HTML of each block, e.g. from `iter_page_html`
+
+    """
+    for index, html in enumerate(html_blocks):
+        if index:
+            out.write("\n")
+        out.write(html)
+
+
+def markdown_to_html(markdown: str) -> str:
+    """Converts markdown to HTML, the top level elements are separated by line breaks
+
+    Args:
+        markdown: The markdown to convert
+
+    Returns:
+        str: The HTML
+
+    """
+    return "\n".join(iter_page_html(markdown))
+
+
+def render_chunk(chunk: List[str]) -> List[RenderResult]:
+    """Converts a list of markdown strings, catching the error of each one
+
+    Args:
+        chunk: The markdown strings
+
+    Returns:
+        List[RenderResult]: A result per markdown string, in the same order
+
+    """
+    results: List[RenderResult] = []
+    for markdown in chunk:
+        try:
+            html = "\n".join(iter_page_html(markdown))
+        except Exception as e:
+            results.append(RenderResult(None, e))
+        else:
+            results.append(RenderResult(html, None))
+    return results
+
+
+def render_many(
+    markdowns: Iterable[str], jobs: int = 1, chunksize: int = 64
+) -> Iterator[RenderResult]:
+    """Converts many markdown strings to HTML, a failing string doesn't stop the others.
+
+    The strings are consumed lazily and converted in chunks, optionally spread across a pool of
+    worker processes. Only a few chunks per worker are in flight at once, so an endless stream of
+    strings can be converted with bounded memory.
+
+    Args:
+        markdowns: The markdown strings, any iterable
+        jobs: The number of worker processes, 1 converts in the current process (default: 1)
+        chunksize: The number of strings sent to a worker at once (default: 64)
+
+    Returns:
+        Iterator[RenderResult]: A result per markdown string, in the same order
+
+    Raises:
+        ValueError: If chunksize is not positive
+
+    """
+    if chunksize < 1:
+        raise ValueError("chunksize must be positive")
+
+    iterator = iter(markdowns)
+    chunks = iter(lambda: list(islice(iterator, chunksize)), [])
+
+    if jobs <= 1:
+        for chunk in chunks:
+            yield from render_chunk(chunk)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        # a couple of chunks per worker keeps them busy while the results are consumed
+        pending: Deque[Future[List[RenderResult]]] = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(render_chunk, chunk))
+            if len(pending) >= jobs * 2:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
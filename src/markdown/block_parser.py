@@ -1,6 +1,7 @@
-from typing import List, Tuple, Union
+import hashlib
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Tuple, Union
 
-from core import BlockType
+from core import BlockType, DocumentBuilder, HTMLNode
 
 from .constants import (
     CODE_PATTERN,
@@ -21,15 +22,56 @@ def markdown_to_blocks(markdown: str) -> List[str]:
     Returns:
         List[str]: A list of string, where each string is a block of markdown. Blocks are seperated by a blank line
     """
-    blocks = []
+    return list(iter_blocks(markdown))
 
-    for block in markdown.split("\n\n"):
-        stripped_block = block.strip()
 
-        if stripped_block != "":
-            blocks.append(stripped_block)
+def iter_lines(text: str) -> Iterator[str]:
+    """Yields the lines of a string with their line break, without splitting it all at once"""
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start) + 1 or len(text)
+        yield text[start:end]
+        start = end
 
-    return blocks
+
+def iter_blocks(markdown: str | Iterable[str]) -> Iterator[str]:
+    """
+    Yields the blocks of a markdown document as they are read, only one block is held in memory
+
+    Args:
+        markdown: A string containing markdown text, or an iterable of its lines such as an open file
+
+    Returns:
+        Iterator[str]: The blocks of markdown, stripped. Blocks are seperated by a blank line, except
+        inside a fenced code block, which ends with its closing fence
+    """
+    lines = iter_lines(markdown) if isinstance(markdown, str) else markdown
+    block: List[str] = []
+    # whether the block has any text yet, and whether it's a code block waiting for its closing fence
+    started = False
+    fenced = False
+
+    for line in lines:
+        content = line.rstrip("\n")
+        if content == "" and not fenced:
+            if started:
+                yield "".join(block).strip()
+            block.clear()
+            started = False
+            continue
+
+        block.append(line)
+        if fenced:
+            fenced = not content.rstrip().endswith("```")
+        elif not started and content.strip():
+            started = True
+            stripped = content.strip()
+            fenced = stripped.startswith("```") and not (
+                len(stripped) > 3 and stripped.endswith("```")
+            )
+
+    if started:
+        yield "".join(block).strip()
 
 
 # Type aliases for clarity
@@ -44,10 +86,200 @@ BlockData = Union[
 ]
 
 
-def block_to_block_type(block: str) -> Tuple[BlockType, BlockData]:
+# The type of a block: a BlockType, or a name such as "table" for the types registered on top
+BlockKind = BlockType | str
+
+# A block rule returns the type and the data of a block, or None if the block isn't of its type
+BlockRule = Callable[[str], Tuple[BlockKind, Any] | None]
+
+
+class BlockRenderer(NamedTuple):
+    """The conversions of the data of a block type, one per output of the parser, all of them
+    must give the same HTML"""
+
+    block_type: BlockKind
+    to_node: Callable[[Any], HTMLNode]  # for `iter_page_nodes`
+    to_html: Callable[[Any], str]  # for `iter_page_html`
+    build: Callable[[DocumentBuilder, Any], None]  # for `markdown_to_document`
+
+
+class BlockClassifier:
+    """A registry of block rules, dispatched on the first character of a block, and of the
+    renderers of the block types.
+
+    Only the rules registered for the leading character of a block are tried, so a plain
+    paragraph costs a single dictionary lookup however many rules there are. Rules with a higher
+    priority are tried first, rules of the same priority in the order they were registered. A
+    block no rule claims is a paragraph. The parser renders a block with the renderer of its type,
+    so a new block type is added with a rule and a renderer.
+    """
+
+    def __init__(self) -> None:
+        # (leading characters, priority, rule) in registration order
+        self._registrations: List[Tuple[str, int, BlockRule]] = []
+        self._rules: Dict[str, List[BlockRule]] = {}
+        self._digest: str | None = None
+        self.renderers: Dict[BlockKind, BlockRenderer] = {}
+
+    def register(
+        self,
+        leading_characters: str,
+        rule: BlockRule,
+        renderer: BlockRenderer | None = None,
+        priority: int = 0,
+    ):
+        """Registers a rule for the blocks starting with any of the given characters
+
+        Args:
+            leading_characters: The characters a block of this type can start with, e.g. "*-"
+            rule: The function returning the type and the data of a block, or None
+            renderer: The renderer of the type the rule returns, required for a new block type
+            priority: Rules with a higher priority are tried first (default: 0, the priority of
+                the built-in rules, which are tried before the rules registered after them)
+
+        Raises:
+            ValueError: If no leading character is given
+
+        """
+        if not leading_characters:
+            raise ValueError("leading_characters must not be empty")
+        self._registrations.append((leading_characters, priority, rule))
+        self._index_rules()
+        if renderer is not None:
+            self.register_renderer(renderer)
+
+    def unregister(self, rule: BlockRule, renderer: BlockRenderer | None = None):
+        """Removes a rule, and the renderer registered with it if given
+
+        Raises:
+            ValueError: If the rule isn't registered
+
+        """
+        registrations = [entry for entry in self._registrations if entry[2] is not rule]
+        if len(registrations) == len(self._registrations):
+            raise ValueError("rule is not registered")
+        self._registrations = registrations
+        self._index_rules()
+        if renderer is not None and self.renderers.get(renderer.block_type) == renderer:
+            del self.renderers[renderer.block_type]
+            self._digest = None
+
+    def _index_rules(self):
+        # the rules of each leading character, in the order they are tried
+        self._rules = {}
+        registrations = sorted(self._registrations, key=lambda entry: -entry[1])
+        for leading_characters, _, rule in registrations:
+            for character in leading_characters:
+                self._rules.setdefault(character, []).append(rule)
+        self._digest = None
+
+    def register_renderer(self, renderer: BlockRenderer):
+        """Sets the renderer of a block type, replacing the previous one"""
+        self.renderers[renderer.block_type] = renderer
+        self._digest = None
+
+    def digest(self) -> str:
+        """Returns a digest of the registered rules and renderers, their names and code.
+
+        Registering a rule changes the generated HTML, so the render caches key their entries on
+        it along with `PARSER_VERSION`.
+        """
+        if self._digest is None:
+            digest = hashlib.sha256()
+            for leading_characters, priority, rule in self._registrations:
+                digest.update(f"{leading_characters}\0{priority}\0".encode())
+                digest.update(_describe(rule))
+            for block_type in sorted(self.renderers, key=str):
+                digest.update(f"{block_type}\0".encode())
+                for function in self.renderers[block_type][1:]:
+                    digest.update(_describe(function))
+            self._digest = digest.hexdigest()
+        return self._digest
+
+    def renderer(self, block_type: BlockKind) -> BlockRenderer:
+        """Returns the renderer of a block type
+
+        Raises:
+            ValueError: If no renderer is registered for the type
+
+        """
+        renderer = self.renderers.get(block_type)
+        if renderer is None:
+            raise ValueError("not matched block type")
+        return renderer
+
+    def classify(self, block: str) -> Tuple[BlockKind, Any]:
+        """Returns the type and the data of a block, see `block_to_block_type`"""
+        for rule in self._rules.get(block[:1], ()):
+            if (result := rule(block)) is not None:
+                return result
+        return BlockType.PARAGRAPH, block
+
+    def __repr__(self) -> str:
+        return f"BlockClassifier(leading_characters={''.join(sorted(self._rules))!r})"
+
+
+def _describe(function: Callable) -> bytes:
+    # the qualified name and the bytecode of a function, which are the same in every process, so
+    # editing a rule changes the digest too
+    name = getattr(function, "__qualname__", type(function).__qualname__)
+    code = getattr(function, "__code__", None)
+    description = f"{getattr(function, '__module__', None)}.{name}\0".encode()
+    return description + (code.co_code if code is not None else b"") + b"\0"
+
+
+def _heading_rule(block: str) -> Tuple[BlockType, HeadingData] | None:
+    # e.g. "## Heading", the marker (e.g. "##") and the content
+    if match := HEADING_PATTERN.match(block):
+        return BlockType.HEADING, (match.group("marker"), match.group("content"))
+    return None
+
+
+def _code_rule(block: str) -> Tuple[BlockType, CodeData] | None:
+    # e.g. ```\ncode\n```, the code content
+    if match := CODE_PATTERN.match(block):
+        return BlockType.CODE, match.group(1)
+    return None
+
+
+def _quote_rule(block: str) -> Tuple[BlockType, QuoteData] | None:
+    # e.g. "> Quote text", the quote content
+    if match := QUOTE_PATTERN.match(block):
+        return BlockType.QUOTE, match.group(1)
+    return None
+
+
+def _unordered_list_rule(block: str) -> Tuple[BlockType, UnorderedListData] | None:
+    # e.g. "- Item", the content of every item
+    if items := UNORDERED_LIST_PATTERN.findall(block):
+        return BlockType.UNORDERED_LIST, items
+    return None
+
+
+def _ordered_list_rule(block: str) -> Tuple[BlockType, OrderedListData] | None:
+    # e.g. "1. Item", the (number, content) of every item
+    if items := ORDERED_LIST_PATTERN.findall(block):
+        return BlockType.ORDERED_LIST, items
+    return None
+
+
+# The classifier of the parser, extra block types are registered on it. The renderers of the
+# built-in types are registered by the parser
+BLOCK_CLASSIFIER = BlockClassifier()
+BLOCK_CLASSIFIER.register("#", _heading_rule)
+BLOCK_CLASSIFIER.register("`", _code_rule)
+BLOCK_CLASSIFIER.register(">", _quote_rule)
+BLOCK_CLASSIFIER.register("*-", _unordered_list_rule)
+BLOCK_CLASSIFIER.register("0123456789", _ordered_list_rule)
+
+
+def block_to_block_type(block: str) -> Tuple[BlockKind, Any]:
     """
     Determine the type of a markdown block and extract associated data.
 
+    The type is decided by the rules registered on `BLOCK_CLASSIFIER` for the first character of
+    the block, a list must start with its first item.
+
     Args:
         block: A string representing a single block of markdown.
 
@@ -63,27 +295,20 @@ def block_to_block_type(block: str) -> Tuple[BlockType, BlockData]:
             - BlockType.ORDERED_LIST: List[Tuple[str, str]] - A list of tuples, each containing (number, content),
               where number is the item number as a string and content is the item text.
             - BlockType.PARAGRAPH: str - The entire block as a string, if no other patterns match.
+            - A registered block type: the data its rule returns.
     """
-    # Check if the block is a heading (e.g., "## Heading")
-    if match := HEADING_PATTERN.match(block):
-        marker, content = match.groups()  # Extract marker (e.g., "##") and content
-        return BlockType.HEADING, (marker, content)
+    return BLOCK_CLASSIFIER.classify(block)
 
-    # Check if the block is a code block (e.g., ```\ncode\n```)
-    if match := CODE_PATTERN.match(block):
-        return BlockType.CODE, match.group(1)  # Extract the code content
-
-    # Check if the block is a quote (e.g., "> Quote text")
-    if match := QUOTE_PATTERN.match(block):
-        return BlockType.QUOTE, match.group(1)  # Extract the quote content
 
-    # Check if the block contains unordered list items (e.g., "- Item")
-    if match := UNORDERED_LIST_PATTERN.findall(block):
-        return BlockType.UNORDERED_LIST, match  # Returns list of item contents
+def iter_block_types(markdown: str | Iterable[str]) -> Iterator[Tuple[BlockKind, Any]]:
+    """
+    Yields the type and the associated data of each block of a markdown document as it is read
 
-    # Check if the block contains ordered list items (e.g., "1. Item")
-    if match := ORDERED_LIST_PATTERN.findall(block):
-        return BlockType.ORDERED_LIST, match  # Returns list of (number, content) tuples
+    Args:
+        markdown: A string containing markdown text, or an iterable of its lines such as an open file
 
-    # Default case: if no patterns match, treat the block as a paragraph
-    return BlockType.PARAGRAPH, block
+    Returns:
+        Iterator[Tuple[BlockKind, Any]]: The result of `block_to_block_type` for every block
+    """
+    for block in iter_blocks(markdown):
+        yield block_to_block_type(block)
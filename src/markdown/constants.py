@@ -25,3 +25,17 @@ ORDERED_LIST_PATTERN = re.compile(
     r"(?P<content>.+)$",  # and the content
     flags=re.VERBOSE | re.MULTILINE,
 )
+# The h1 header on the first line of a markdown document or block
+TITLE_PATTERN = re.compile(r"^# (?P<title>.+)$", flags=re.MULTILINE)
+
+# Captures the image alt text and url
+IMAGE_PATTERN = re.compile(r"!\[(?P<alt>.*?)\]\((?P<src>.*?)\)")
+# A link not preceded by "!", the check comes after the literal "[" so `re` can still scan for it
+LINK_PATTERN = re.compile(r"\[(?<!!\[)(?P<text>.*?)\]\((?P<href>.*?)\)")
+# Finds where the next inline element may start: an image or link bracket, or an emphasis/code
+# delimiter. The rest of an image or a link is matched by hand, see `iter_inline_elements`
+INLINE_START_PATTERN = re.compile(r"!?\[|\*\*|[*_`]")
+
+# Version of the markdown to HTML conversion, bump it whenever the generated HTML or page metadata
+# changes so the render caches keyed on it stop serving stale pages
+PARSER_VERSION = "6"
@@ -1,9 +1,10 @@
-from typing import Callable, List, Literal, Tuple
+import re
+from typing import Callable, List, Tuple
 
-from core import LeafNode, ParentNode, TextNode, TextType
-from markdown.inline_parser import text_to_textnodes
+from core import DocumentBuilder, LeafNode, ParentNode, TextNode, TextType
+from markdown.inline_parser import inline_to_html, iter_inline_elements, text_to_textnodes
 
-from .extractor import extract_markdown_images, extract_markdown_links
+from .constants import IMAGE_PATTERN, LINK_PATTERN
 
 
 def parse_inline(inline_content: str, exclude: List[TextType] = []) -> List[LeafNode]:
@@ -152,21 +153,87 @@ def parse_paragraph(content: str):
     return ParentNode(tag="p", children=children)
 
 
-def split_nodes(
+def paragraph_to_html(content: str) -> str:
+    """Renders a markdown paragraph straight to HTML, the same HTML as the node of `parse_paragraph`
+
+    Args:
+        content: The content of the paragraph
+
+    Returns:
+        str: The HTML of the paragraph, a lone link or image isn't wrapped into a "p" tag
+
+    """
+    element = next(iter_inline_elements(content), None)
+    if (
+        element is not None
+        and element[0] == 0
+        and element[1] == len(content)
+        and element[2] in (TextType.LINK, TextType.IMAGE)
+    ):
+        return inline_to_html(content)
+
+    return f"<p>{inline_to_html(content)}</p>"
+
+
+def build_inline(builder: DocumentBuilder, text_nodes: List[TextNode]):
+    """Appends the leaves of inline content to a document, the same leaves `parse_inline` creates
+
+    Args:
+        builder: The document being built
+        text_nodes: The text nodes of the inline content, from `text_to_textnodes`
+
+    """
+    for node in text_nodes:
+        match node.text_type:
+            case TextType.BOLD:
+                builder.leaf("b", node.text)
+            case TextType.ITALIC:
+                builder.leaf("i", node.text)
+            case TextType.CODE:
+                builder.leaf("code", node.text)
+            case TextType.LINK:
+                builder.leaf("a", node.text, {"href": node.url})
+            case TextType.IMAGE:
+                builder.leaf("img", None, {"src": node.url, "alt": node.text})
+            case _:
+                builder.leaf(None, node.text)
+
+
+def build_paragraph(builder: DocumentBuilder, content: str):
+    """Appends a markdown paragraph to a document, like `parse_paragraph` a lone link or image
+    isn't wrapped into a "p" tag
+
+    Args:
+        builder: The document being built
+        content: The content of the paragraph
+
+    """
+    text_nodes = text_to_textnodes(content)
+    if len(text_nodes) == 1 and text_nodes[0].text_type in (TextType.LINK, TextType.IMAGE):
+        build_inline(builder, text_nodes)
+        return
+
+    builder.open("p")
+    build_inline(builder, text_nodes)
+    builder.close()
+
+
+def split_nodes_matching(
     old_nodes: List[TextNode],
-    extractor: Callable[[str], List[Tuple[str, str]]],
-    node_type: Literal[TextType.IMAGE, TextType.LINK],
+    pattern: re.Pattern[str],
+    to_node: Callable[[re.Match[str]], TextNode],
 ):
     """
-    Generic function to split TextNode objects based on a delimiter extractor
+    Splits TextNode objects on every match of a compiled pattern, the matches are located while
+    they are found, without searching for them again in the text
 
     Args:
         old_nodes: List of TextNode to process
-        extractor: Function to extract the markdown elements (e.g, link or images)
-        node_type: Type of TextNode to create for the extracted elements
+        pattern: The compiled pattern of the markdown elements (e.g, IMAGE_PATTERN)
+        to_node: Function building the TextNode of a match
 
     Returns:
-        List[TextNode]: New list of TextNode objects with the extracted elements split
+        List[TextNode]: New list of TextNode objects with the matched elements split
     """
     new_nodes: List[TextNode] = []
 
@@ -177,41 +244,34 @@ def split_nodes(
             continue
 
         text = old_node.text
-        elements = extractor(old_node.text)
+        # position after the last processed element, None until an element is found
+        cursor = None
+
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            # append the text before the element
+            if start > (cursor or 0):
+                new_nodes.append(TextNode(text[cursor or 0 : start], TextType.TEXT))
+            # append the element
+            new_nodes.append(to_node(match))
+            cursor = end
 
         # if no elements are found, preserve the original
-        if len(elements) == 0:
+        if cursor is None:
             new_nodes.append(old_node)
-            continue
-
-        # process each extracted element
-        for element in elements:
-            el_text, el_url = element
-
-            # the delimiter change depending if it's an image or a link
-            element_delimiter = (
-                f"![{el_text}]({el_url})"
-                if node_type == TextType.IMAGE
-                else f"[{el_text}]({el_url})"
-            )
+        # append any remaining text after processing all elements
+        elif cursor < len(text):
+            new_nodes.append(TextNode(text[cursor:], TextType.TEXT))
 
-            # split the text using and capture the pre and post text
-            pre_element_text, post_element_text = text.split(element_delimiter)
+    return new_nodes
 
-            # append the text before the element
-            if pre_element_text != "":
-                new_nodes.append(TextNode(pre_element_text, TextType.TEXT))
-            # append the element
-            new_nodes.append(TextNode(el_text, node_type, el_url))
 
-            # continue processing the text after the element
-            text = post_element_text
+def _image_node(match: re.Match[str]) -> TextNode:
+    return TextNode(match["alt"], TextType.IMAGE, match["src"])
 
-        # append any remaining text after processing all elements
-        if text != "":
-            new_nodes.append(TextNode(text, TextType.TEXT))
 
-    return new_nodes
+def _link_node(match: re.Match[str]) -> TextNode:
+    return TextNode(match["text"], TextType.LINK, match["href"])
 
 
 def split_nodes_image(old_nodes: List[TextNode]):
@@ -224,7 +284,7 @@ def split_nodes_image(old_nodes: List[TextNode]):
     Returns:
         List[TextNode]: New list of TextNode object with images split into individual nodes
     """
-    return split_nodes(old_nodes, extract_markdown_images, TextType.IMAGE)
+    return split_nodes_matching(old_nodes, IMAGE_PATTERN, _image_node)
 
 
 def split_nodes_link(old_nodes: List[TextNode]):
@@ -237,4 +297,4 @@ def split_nodes_link(old_nodes: List[TextNode]):
     Returns:
         List[TextNode]: New list of TextNode object with links split into individual nodes
     """
-    return split_nodes(old_nodes, extract_markdown_links, TextType.LINK)
+    return split_nodes_matching(old_nodes, LINK_PATTERN, _link_node)
@@ -1,6 +1,7 @@
-import re
 from typing import List, Tuple
 
+from .constants import IMAGE_PATTERN, LINK_PATTERN, TITLE_PATTERN
+
 
 def extract_markdown_images(text: str) -> List[Tuple[str, str]]:
     """
@@ -12,13 +13,12 @@ def extract_markdown_images(text: str) -> List[Tuple[str, str]]:
     Returns:
         List[Tuple[str, str]]: The list of tuples each one being (image alt text, image url)
     """
-    regex = r"!\[(.*?)\]\((.*?)\)"
-    return re.findall(regex, text)
+    return IMAGE_PATTERN.findall(text)
 
 
 def extract_markdown_links(text: str) -> List[Tuple[str, str]]:
     """
-    Extracts the link text and url from inline markdown
+    Extracts the link text and url from inline markdown, images are not links
 
     Args:
         text: Raw markdown text that contains the link or links
@@ -26,8 +26,7 @@ def extract_markdown_links(text: str) -> List[Tuple[str, str]]:
     Returns:
         List[Tuple[str, str]]: The list of tuples each one beign (link text, link url)
     """
-    regex = r"\[(.*?)\]\((.*?)\)"
-    return re.findall(regex, text)
+    return LINK_PATTERN.findall(text)
 
 
 def extract_title(markdown: str):
@@ -40,8 +39,7 @@ def extract_title(markdown: str):
         ValueError: If the h1 header is not encountered
 
     """
-    h1_pattern = r"^# (.+)$"
-    h1 = re.match(h1_pattern, markdown, re.MULTILINE)
+    h1 = TITLE_PATTERN.match(markdown)
     if h1:
         return h1.group(1)
     raise ValueError("H1 header not encountered in markdown passed")
@@ -1,6 +1,31 @@
-from typing import List
+import threading
+from functools import lru_cache
+from typing import Iterator, List, NamedTuple, Tuple
 
-from core import TextNode, TextType
+from core import TextNode, TextType, escape_attribute, escape_text
+
+from .constants import INLINE_START_PATTERN
+
+# The text type of the span enclosed by each inline delimiter
+DELIMITER_TYPES = {
+    "**": TextType.BOLD,
+    "*": TextType.ITALIC,
+    "_": TextType.ITALIC,
+    "`": TextType.CODE,
+}
+
+# The HTML of each text type, formatted with the escaped text and url of the span. The same HTML
+# as the LeafNode `parse_inline` creates for it
+TEXT_TYPE_HTML = {
+    TextType.TEXT: "{0}",
+    TextType.BOLD: "<b>{0}</b>",
+    TextType.ITALIC: "<i>{0}</i>",
+    TextType.CODE: "<code>{0}</code>",
+    TextType.LINK: '<a href="{1}">{0}</a>',
+    TextType.IMAGE: '<img src="{1}" alt="{0}">',
+}
+IMAGE_HTML = TEXT_TYPE_HTML[TextType.IMAGE]
+LINK_HTML = TEXT_TYPE_HTML[TextType.LINK]
 
 
 def split_nodes_delimiter(
@@ -39,18 +64,254 @@ def split_nodes_delimiter(
     return new_nodes
 
 
+def iter_inline_elements(text: str) -> Iterator[Tuple[int, int, TextType, str, str | None]]:
+    """
+    Yields the inline elements of markdown in a single left to right pass, in time linear in the
+    length of the text
+
+    Emphasis (`**`, `*`, `_`) and code (`` ` ``) spans run until the next occurrence of the same
+    delimiter. A link runs from a "[" to the first "](" after it and the first ")" after that, on
+    the same line, an image is a link preceded by "!". Brackets that don't make a link are text.
+
+    Args:
+        text: The inline markdown to be scanned
+
+    Returns:
+        Iterator[Tuple[int, int, TextType, str, str | None]]: The (start, end, text type, text,
+        url) of every element, the url is None for emphasis and code spans
+
+    Raises:
+        Exception: If an emphasis or code delimiter is never closed
+    """
+    length = len(text)
+    # the next "](", the first ")" after it and the next line break, len(text) if there is none.
+    # They are only looked up again once the scan is past them, so a run of unmatched brackets
+    # doesn't search the rest of the text from every one of them
+    bracket = paren = newline = -1
+    position = 0
+
+    while start := INLINE_START_PATTERN.search(text, position):
+        marker = start.group()
+        if marker[-1] != "[":
+            end = text.find(marker, start.end())
+            if end == -1:
+                raise Exception(f'Unamtched delimiter "{marker}"')
+            position = end + len(marker)
+            yield start.start(), position, DELIMITER_TYPES[marker], text[start.end() : end], None
+            continue
+
+        opening = start.end() - 1
+        if bracket <= opening:
+            bracket = text.find("](", opening + 1)
+            if bracket == -1:
+                bracket = length
+        if paren < bracket + 2:
+            paren = text.find(")", bracket + 2) if bracket < length else -1
+            if paren == -1:
+                paren = length
+        if newline < opening:
+            newline = text.find("\n", opening)
+            if newline == -1:
+                newline = length
+
+        if paren < newline:
+            text_type = TextType.IMAGE if len(marker) == 2 else TextType.LINK
+            position = paren + 1
+            yield start.start(), position, text_type, text[opening + 1 : bracket], text[
+                bracket + 2 : paren
+            ]
+        else:
+            position = opening + 1
+
+
 def text_to_textnodes(text: str) -> List[TextNode]:
-    from .elements import split_nodes_image, split_nodes_link
+    """
+    Converts inline markdown into a list of TextNode in a single left to right pass, see
+    `iter_inline_elements`. Text between elements becomes plain TEXT nodes.
+
+    Args:
+        text: The inline markdown to be converted
+
+    Returns:
+        List[TextNode]: The list of TextNode objects, in the order they appear in the text
 
+    Raises:
+        ValueError: If the text is empty
+        Exception: If an emphasis or code delimiter is never closed
+    """
     if text == "":
         raise ValueError("cannot be empty")
 
-    nodes = [TextNode(text, TextType.TEXT)]
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "*", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    nodes: List[TextNode] = []
+    # start of the plain text not emitted yet
+    pending = 0
+
+    for start, end, text_type, content, url in iter_inline_elements(text):
+        if pending < start:
+            nodes.append(TextNode(text[pending:start], TextType.TEXT))
+        nodes.append(TextNode(content, text_type, url))
+        pending = end
+
+    if pending < len(text):
+        nodes.append(TextNode(text[pending:], TextType.TEXT))
 
     return nodes
+
+
+def inline_to_html(text: str) -> str:
+    """
+    Renders inline markdown straight to HTML, scanning it like `text_to_textnodes` without
+    creating any node
+
+    The HTML is the same as the one of the nodes `parse_inline` creates for the text, escaped the
+    same way. When an `InlineCache` is set, repeated texts are rendered once.
+
+    Args:
+        text: The inline markdown to be rendered
+
+    Returns:
+        str: The HTML of the text
+
+    Raises:
+        ValueError: If the text is empty
+        Exception: If an emphasis or code delimiter is never closed
+    """
+    cache = _inline_cache
+    if cache is not None:
+        return cache.render(text)
+    return _render_inline(text)
+
+
+def _render_inline(text: str) -> str:
+    if text == "":
+        raise ValueError("cannot be empty")
+
+    parts: List[str] = []
+    # start of the plain text not emitted yet
+    pending = 0
+
+    for start, end, text_type, content, url in iter_inline_elements(text):
+        if pending < start:
+            parts.append(escape_text(text[pending:start]))
+        if text_type == TextType.IMAGE:
+            parts.append(IMAGE_HTML.format(escape_attribute(content), escape_attribute(url)))
+        elif text_type == TextType.LINK:
+            parts.append(LINK_HTML.format(escape_text(content), escape_attribute(url)))
+        else:
+            parts.append(TEXT_TYPE_HTML[text_type].format(escape_text(content)))
+        pending = end
+
+    if pending == 0:
+        # no inline element at all, the most common case
+        return escape_text(text)
+    if pending < len(text):
+        parts.append(escape_text(text[pending:]))
+    return "".join(parts)
+
+
+class InlineCacheStats(NamedTuple):
+    """The counters of an `InlineCache`"""
+
+    hits: int
+    misses: int
+    entries: int
+    max_entries: int
+
+    @property
+    def hit_rate(self) -> float:
+        """The share of the lookups served from the cache, 0 before any lookup"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class InlineCache:
+    """A size-bounded LRU cache of the HTML of inline markdown, keyed on the raw inline string.
+
+    Docs repeat the same inline strings across pages (navigation lists, "See also" items, standard
+    sentences), each is rendered once while it stays among the `max_entries` most recently used.
+    The cached HTML is a string, so it's safe to share across pages and threads. Texts failing to
+    render aren't cached, they raise again on every lookup.
+    """
+
+    def __init__(self, max_entries: int = 4096) -> None:
+        """
+        Args:
+            max_entries: The number of inline strings kept (default: 4096)
+
+        Raises:
+            ValueError: If max_entries is not positive
+        """
+        if max_entries < 1:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        # the C implementation of lru_cache is safe to use from many threads
+        self._render = lru_cache(maxsize=max_entries)(_render_inline)
+        self._lock = threading.Lock()
+        # the lookups made by worker processes, merged with `add_counts`
+        self._merged_hits = 0
+        self._merged_misses = 0
+        # the counters already shipped by `take_counts`
+        self._taken_hits = 0
+        self._taken_misses = 0
+
+    def render(self, text: str) -> str:
+        """Returns the HTML of inline markdown, see `inline_to_html`"""
+        return self._render(text)
+
+    def stats(self) -> InlineCacheStats:
+        """Returns the counters of the lookups since the cache was created or cleared"""
+        info = self._render.cache_info()
+        with self._lock:
+            return InlineCacheStats(
+                info.hits + self._merged_hits,
+                info.misses + self._merged_misses,
+                info.currsize,
+                self.max_entries,
+            )
+
+    def take_counts(self) -> Tuple[int, int]:
+        """Returns the (hits, misses) since the last call, used to ship them out of a worker"""
+        info = self._render.cache_info()
+        with self._lock:
+            counts = (info.hits - self._taken_hits, info.misses - self._taken_misses)
+            self._taken_hits, self._taken_misses = info.hits, info.misses
+        return counts
+
+    def add_counts(self, hits: int, misses: int):
+        """Merges the lookups made by another process"""
+        with self._lock:
+            self._merged_hits += hits
+            self._merged_misses += misses
+
+    def clear(self):
+        """Forgets every entry and resets the counters, e.g. between the builds of the watch mode"""
+        with self._lock:
+            self._render.cache_clear()
+            self._merged_hits = self._merged_misses = 0
+            self._taken_hits = self._taken_misses = 0
+
+    def summary(self) -> str:
+        """Returns a line describing the hit rate, for the build summary"""
+        stats = self.stats()
+        return (
+            f"Inline cache: {stats.hits:,} hits, {stats.misses:,} misses "
+            f"({stats.hit_rate:.1%} hit rate)"
+        )
+
+    def __repr__(self) -> str:
+        return f"InlineCache(max_entries={self.max_entries})"
+
+
+# The inline cache of the process, None renders every text
+_inline_cache: InlineCache | None = None
+
+
+def get_inline_cache() -> InlineCache | None:
+    """Returns the inline cache of the process, if any"""
+    return _inline_cache
+
+
+def set_inline_cache(cache: InlineCache | None):
+    """Sets the inline cache used by `inline_to_html`, None disables caching"""
+    global _inline_cache
+    _inline_cache = cache
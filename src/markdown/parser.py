@@ -1,38 +1,279 @@
-from typing import List
+from typing import Iterable, Iterator, List, NamedTuple, Tuple
 
-from core import BlockType, HTMLNode
+from core import BlockType, Document, DocumentBuilder, HTMLNode, ParentNode, escape_text
 
-from .block_parser import block_to_block_type, markdown_to_blocks
+from .block_parser import BLOCK_CLASSIFIER, BlockKind, BlockRenderer, iter_block_types
+from .constants import TITLE_PATTERN
 from .elements import (
+    build_inline,
+    build_paragraph,
+    paragraph_to_html,
     parse_code,
     parse_heading,
+    parse_inline,
     parse_ordered_list,
     parse_paragraph,
     parse_quote,
     parse_unordered_list,
 )
+from .inline_parser import inline_to_html, text_to_textnodes
 
 
-def markdown_to_html_node(markdown: str) -> List[HTMLNode]:
-    markdown_blocks = markdown_to_blocks(markdown)
-    html_nodes = []
-
-    for block in markdown_blocks:
-        block_type, block_content = block_to_block_type(block)
-
-        match block_type:
-            case BlockType.HEADING:
-                html_nodes.append(parse_heading(*block_content))  # type: ignore[reportArgumentType]
-            case BlockType.CODE:
-                html_nodes.append(parse_code(block_content))  # type: ignore[reportArgumentType]
-            case BlockType.QUOTE:
-                html_nodes.append(parse_quote(block_content))  # type: ignore[reportArgumentType]
-            case BlockType.UNORDERED_LIST:
-                html_nodes.append(parse_unordered_list(block_content))  # type: ignore[reportArgumentType]
-            case BlockType.ORDERED_LIST:
-                html_nodes.append(parse_ordered_list(block_content))  # type: ignore[reportArgumentType]
-            case BlockType.PARAGRAPH:
-                html_nodes.append(parse_paragraph(block_content))  # type: ignore[reportArgumentType]
-            case _:
-                raise ValueError("not matched block type")
-    return html_nodes
+class Page(NamedTuple):
+    """A parsed markdown page with the metadata collected while parsing it"""
+
+    nodes: List[HTMLNode]
+    title: str | None  # The text of the first h1 header, if any
+    outline: List[Tuple[int, str]]  # The (level, text) of every header, in order
+    word_count: int
+
+
+class PageMetadata:
+    """The metadata of a page, filled in while its blocks are parsed"""
+
+    __slots__ = ("title", "outline", "word_count")
+
+    def __init__(self) -> None:
+        self.title: str | None = None
+        self.outline: List[Tuple[int, str]] = []
+        self.word_count = 0
+
+
+def iter_page_nodes(
+    markdown: str | Iterable[str], metadata: PageMetadata | None = None
+) -> Iterator[HTMLNode]:
+    """Converts markdown to HTML nodes one block at a time, collecting the page metadata on the way
+
+    Args:
+        markdown: The markdown of the page, or an iterable of its lines such as an open file
+        metadata: The metadata to fill in, complete once the iterator is exhausted
+
+    Returns:
+        Iterator[HTMLNode]: The HTML node of each block
+
+    Raises:
+        ValueError: If no renderer is registered for the type of a block
+
+    """
+    if metadata is None:
+        metadata = PageMetadata()
+
+    for block_type, block_content in iter_block_types(markdown):
+        _record_metadata(metadata, block_type, block_content)
+        yield BLOCK_CLASSIFIER.renderer(block_type).to_node(block_content)
+
+
+def iter_page_html(
+    markdown: str | Iterable[str], metadata: PageMetadata | None = None
+) -> Iterator[str]:
+    """Converts markdown straight to HTML one block at a time, collecting the page metadata on the
+    way. The fast path of the build: no node is created, the HTML is the same as the one of the
+    nodes of `iter_page_nodes`
+
+    Args:
+        markdown: The markdown of the page, or an iterable of its lines such as an open file
+        metadata: The metadata to fill in, complete once the iterator is exhausted
+
+    Returns:
+        Iterator[str]: The HTML of each block
+
+    Raises:
+        ValueError: If no renderer is registered for the type of a block
+
+    """
+    if metadata is None:
+        metadata = PageMetadata()
+
+    for block_type, block_content in iter_block_types(markdown):
+        _record_metadata(metadata, block_type, block_content)
+        yield BLOCK_CLASSIFIER.renderer(block_type).to_html(block_content)
+
+
+def markdown_to_document(
+    markdown: str | Iterable[str], metadata: PageMetadata | None = None
+) -> Document:
+    """Converts markdown to a `Document`, appending the nodes of each block directly to its arrays
+    without creating node objects
+
+    Args:
+        markdown: The markdown of the page, or an iterable of its lines such as an open file
+        metadata: The metadata to fill in, if any
+
+    Returns:
+        Document: The document, its HTML and its nodes are the same as `iter_page_nodes` ones
+
+    Raises:
+        ValueError: If no renderer is registered for the type of a block
+
+    """
+    if metadata is None:
+        metadata = PageMetadata()
+
+    builder = DocumentBuilder()
+    for block_type, block_content in iter_block_types(markdown):
+        _record_metadata(metadata, block_type, block_content)
+        BLOCK_CLASSIFIER.renderer(block_type).build(builder, block_content)
+
+    return builder.build()
+
+
+# The renderers of the built-in block types, one function per output of the parser
+
+
+def _heading_to_node(block_content: Tuple[str, str]) -> HTMLNode:
+    marker, content = block_content
+    return parse_heading(marker, content)
+
+
+def _heading_to_html(block_content: Tuple[str, str]) -> str:
+    marker, content = block_content
+    level = len(marker)
+    return f"<h{level}>{inline_to_html(content)}</h{level}>"
+
+
+def _build_heading(builder: DocumentBuilder, block_content: Tuple[str, str]):
+    marker, content = block_content
+    builder.open(f"h{len(marker)}")
+    build_inline(builder, text_to_textnodes(content))
+    builder.close()
+
+
+def _code_to_html(block_content: str) -> str:
+    return f"<pre><code>{escape_text(block_content)}</code></pre>"
+
+
+def _build_code(builder: DocumentBuilder, block_content: str):
+    builder.open("pre")
+    builder.leaf("code", block_content)
+    builder.close()
+
+
+def _quote_to_html(block_content: str) -> str:
+    return f"<blockquote>{inline_to_html(block_content)}</blockquote>"
+
+
+def _build_quote(builder: DocumentBuilder, block_content: str):
+    builder.open("blockquote")
+    build_inline(builder, text_to_textnodes(block_content))
+    builder.close()
+
+
+def _unordered_list_to_html(block_content: List[str]) -> str:
+    items = "".join(f"<li>{inline_to_html(item)}</li>" for item in block_content)
+    return f"<ul>{items}</ul>"
+
+
+def _ordered_list_to_html(block_content: List[Tuple[str, str]]) -> str:
+    # get just content, ignore number
+    items = "".join(f"<li>{inline_to_html(item)}</li>" for _, item in block_content)
+    return f"<ol>{items}</ol>"
+
+
+def _build_list(builder: DocumentBuilder, tag: str, items: Iterable[str]):
+    builder.open(tag)
+    for item in items:
+        builder.open("li")
+        build_inline(builder, text_to_textnodes(item))
+        builder.close()
+    builder.close()
+
+
+def _build_unordered_list(builder: DocumentBuilder, block_content: List[str]):
+    _build_list(builder, "ul", block_content)
+
+
+def _build_ordered_list(builder: DocumentBuilder, block_content: List[Tuple[str, str]]):
+    # ordered list items keep their number, which isn't rendered
+    _build_list(builder, "ol", (item for _, item in block_content))
+
+
+for _renderer in (
+    BlockRenderer(BlockType.HEADING, _heading_to_node, _heading_to_html, _build_heading),
+    BlockRenderer(BlockType.CODE, parse_code, _code_to_html, _build_code),
+    BlockRenderer(BlockType.QUOTE, parse_quote, _quote_to_html, _build_quote),
+    BlockRenderer(
+        BlockType.UNORDERED_LIST,
+        parse_unordered_list,
+        _unordered_list_to_html,
+        _build_unordered_list,
+    ),
+    BlockRenderer(
+        BlockType.ORDERED_LIST, parse_ordered_list, _ordered_list_to_html, _build_ordered_list
+    ),
+    BlockRenderer(BlockType.PARAGRAPH, parse_paragraph, paragraph_to_html, build_paragraph),
+):
+    BLOCK_CLASSIFIER.register_renderer(_renderer)
+
+
+def _record_metadata(metadata: PageMetadata, block_type: BlockKind, block_content):
+    # the title, the header outline and the word count of a block, the blocks of registered types
+    # add no words
+    match block_type:
+        case BlockType.HEADING:
+            marker, content = block_content
+            if metadata.title is None and marker == "#":
+                metadata.title = content
+            metadata.outline.append((len(marker), content))
+            metadata.word_count += len(content.split())
+        case BlockType.UNORDERED_LIST:
+            metadata.word_count += sum(len(item.split()) for item in block_content)
+        case BlockType.ORDERED_LIST:
+            metadata.word_count += sum(len(item.split()) for _, item in block_content)
+        case BlockType.PARAGRAPH:
+            # a "# Title" line followed directly by text makes a paragraph, it's still the title
+            if metadata.title is None and (h1 := TITLE_PATTERN.match(block_content)):
+                metadata.title = h1["title"]
+            metadata.word_count += len(block_content.split())
+        case BlockType.CODE | BlockType.QUOTE:
+            metadata.word_count += len(block_content.split())
+
+
+def markdown_to_page(markdown: str | Iterable[str]) -> Page:
+    """Converts markdown to HTML nodes and collects the page metadata in the same pass
+
+    Args:
+        markdown: The markdown of the page, or an iterable of its lines such as an open file
+
+    Returns:
+        Page: The HTML nodes, the title, the header outline and the word count of the page
+
+    """
+    metadata = PageMetadata()
+    html_nodes = list(iter_page_nodes(markdown, metadata))
+    return Page(html_nodes, metadata.title, metadata.outline, metadata.word_count)
+
+
+def markdown_to_html_node(markdown: str | Iterable[str]) -> List[HTMLNode]:
+    return list(iter_page_nodes(markdown))
+
+
+def outline_to_html(outline: List[Tuple[int, str]]) -> str:
+    """Renders a header outline as nested HTML lists, a header goes inside the list of the closest
+    preceding header of a lower level
+
+    Args:
+        outline: The (level, text) of every header, in order
+
+    Returns:
+        str: The HTML of the outline, empty if there are no headers
+
+    """
+    if not outline:
+        return ""
+
+    root = ParentNode(tag="ul", children=[])
+    # the open lists, innermost last, with the level of their items
+    stack: List[Tuple[int, ParentNode]] = [(outline[0][0], root)]
+    for level, text in outline:
+        while len(stack) > 1 and stack[-1][0] > level:
+            stack.pop()
+        current_level, current = stack[-1]
+        if level > current_level:
+            # nest it into the last item of the enclosing list
+            nested = ParentNode(tag="ul", children=[])
+            current.children[-1].children.append(nested)  # type: ignore[reportOptionalMemberAccess]
+            stack.append((level, nested))
+            current = nested
+        current.children.append(ParentNode(tag="li", children=parse_inline(text)))  # type: ignore[reportOptionalMemberAccess]
+
+    return root.to_html()
@@ -0,0 +1,80 @@
+import unittest
+from io import StringIO
+
+from markdown.batch import RenderResult, markdown_to_html, render_many, write_html_blocks
+from markdown.parser import iter_page_html, markdown_to_html_node
+
+SNIPPETS = [
+    "# Title\n\nSome **bold** text",
+    "* one\n* two",
+    "an *unmatched delimiter",
+    "```\ncode\n\nwith a blank line\n```",
+    "",
+    "1. first\n2. [second](/second)",
+]
+
+
+class TestMarkdownToHtml(unittest.TestCase):
+    def test_matches_nodes(self):
+        markdown = SNIPPETS[0]
+        expected = "\n".join(node.to_html() for node in markdown_to_html_node(markdown))
+        self.assertEqual(markdown_to_html(markdown), expected)
+
+    def test_write_html_blocks(self):
+        markdown = SNIPPETS[0]
+        out = StringIO()
+        write_html_blocks(out, iter_page_html(markdown))
+        self.assertEqual(out.getvalue(), markdown_to_html(markdown))
+
+
+class TestRenderMany(unittest.TestCase):
+    def expected(self):
+        results = []
+        for markdown in SNIPPETS:
+            try:
+                results.append(RenderResult(markdown_to_html(markdown), None))
+            except Exception as e:
+                results.append(RenderResult(None, e))
+        return results
+
+    def assertResultsEqual(self, results, expected):
+        self.assertEqual(len(results), len(expected))
+        for result, expected_result in zip(results, expected):
+            self.assertEqual(result.html, expected_result.html)
+            self.assertEqual(repr(result.error), repr(expected_result.error))
+
+    def test_serial(self):
+        for chunksize in (1, 4, 64):
+            results = list(render_many(SNIPPETS, chunksize=chunksize))
+            self.assertResultsEqual(results, self.expected())
+
+    def test_errors_do_not_abort_the_batch(self):
+        results = list(render_many(SNIPPETS))
+        self.assertIsNone(results[2].html)
+        self.assertIn("Unamtched delimiter", str(results[2].error))
+        self.assertEqual(results[3].html, "<pre><code>code\n\nwith a blank line</code></pre>")
+        self.assertEqual(results[4], RenderResult("", None))
+
+    def test_worker_pool(self):
+        results = list(render_many(iter(SNIPPETS * 5), jobs=2, chunksize=3))
+        self.assertResultsEqual(results, self.expected() * 5)
+
+    def test_lazy_consumption(self):
+        consumed = []
+
+        def snippets():
+            for markdown in SNIPPETS:
+                consumed.append(markdown)
+                yield markdown
+
+        results = render_many(snippets(), chunksize=2)
+        self.assertEqual(next(results).html, markdown_to_html(SNIPPETS[0]))
+        self.assertEqual(len(consumed), 2)
+
+    def test_invalid_chunksize(self):
+        with self.assertRaises(ValueError):
+            list(render_many(SNIPPETS, chunksize=0))
+
+
+if __name__ == "__main__":
+    unittest.main()
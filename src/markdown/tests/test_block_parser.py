@@ -1,8 +1,18 @@
+import io
 import unittest
 from textwrap import dedent
 
 from core import BlockType
-from markdown.block_parser import block_to_block_type, markdown_to_blocks
+from markdown.block_parser import (
+    BLOCK_CLASSIFIER,
+    BlockClassifier,
+    BlockRenderer,
+    block_to_block_type,
+    iter_block_types,
+    iter_blocks,
+    iter_lines,
+    markdown_to_blocks,
+)
 
 
 class TestMarkdownToBlocks(unittest.TestCase):
@@ -42,6 +52,34 @@ class TestMarkdownToBlocks(unittest.TestCase):
         result = markdown_to_blocks(markdown)
         self.assertEqual(result, expected)
 
+    def test_markdown_to_blocks_fenced_code_with_blank_lines(self):
+        markdown = "# Heading\n\n```\nfirst\n\n\nsecond\n```\n\nAfter"
+        expected = ["# Heading", "```\nfirst\n\n\nsecond\n```", "After"]
+        self.assertEqual(markdown_to_blocks(markdown), expected)
+
+    def test_markdown_to_blocks_inline_fence(self):
+        markdown = "```code```\n\nAfter"
+        self.assertEqual(markdown_to_blocks(markdown), ["```code```", "After"])
+
+    def test_iter_blocks_from_lines(self):
+        markdown = "\n\n# Heading\n  \ntext\n\n\n* item\n* item\n"
+        self.assertEqual(list(iter_blocks(io.StringIO(markdown))), markdown_to_blocks(markdown))
+        self.assertEqual(
+            list(iter_blocks(markdown)), [b.strip() for b in markdown.split("\n\n") if b.strip()]
+        )
+
+    def test_iter_lines(self):
+        self.assertEqual(list(iter_lines("a\n\nb")), ["a\n", "\n", "b"])
+        self.assertEqual(list(iter_lines("a\n")), ["a\n"])
+        self.assertEqual(list(iter_lines("")), [])
+
+    def test_iter_block_types(self):
+        markdown = "# Heading\n\n```\ncode\n\nmore\n```"
+        self.assertEqual(
+            list(iter_block_types(markdown)),
+            [(BlockType.HEADING, ("#", "Heading")), (BlockType.CODE, "code\n\nmore")],
+        )
+
 
 class TestBlockToBlockType(unittest.TestCase):
     def test_block_to_block_type_multiple_blocks(self):
@@ -127,3 +165,95 @@ class TestBlockToBlockType(unittest.TestCase):
         expected = BlockType.PARAGRAPH, ""
         result = block_to_block_type(block)
         self.assertEqual(result, expected)
+
+    def test_block_to_block_type_list_must_start_the_block(self):
+        block = "Some text\n* not a list item"
+        self.assertEqual(block_to_block_type(block), (BlockType.PARAGRAPH, block))
+
+    def test_block_to_block_type_emphasis_is_not_a_list(self):
+        block = "*italic* words"
+        self.assertEqual(block_to_block_type(block), (BlockType.PARAGRAPH, block))
+
+    def test_block_to_block_type_number_is_not_a_list(self):
+        block = "2024 was a year"
+        self.assertEqual(block_to_block_type(block), (BlockType.PARAGRAPH, block))
+
+
+class TestBlockClassifier(unittest.TestCase):
+    def test_only_rules_of_the_leading_character_are_tried(self):
+        calls = []
+
+        def rule(block):
+            calls.append(block)
+            return None
+
+        classifier = BlockClassifier()
+        classifier.register("|", rule)
+        self.assertEqual(classifier.classify("plain"), (BlockType.PARAGRAPH, "plain"))
+        self.assertEqual(calls, [])
+        classifier.classify("| a | b |")
+        self.assertEqual(calls, ["| a | b |"])
+
+    def test_rules_are_tried_in_registration_order(self):
+        classifier = BlockClassifier()
+        classifier.register("!", lambda block: None)
+        classifier.register("!", lambda block: (BlockType.QUOTE, block[2:]))
+        classifier.register("!", lambda block: (BlockType.CODE, block))
+        self.assertEqual(classifier.classify("! note"), (BlockType.QUOTE, "note"))
+
+    def test_priority_goes_before_the_builtin_rules(self):
+        def task_rule(block):
+            return ("task", block[6:]) if block.startswith("- [ ] ") else None
+
+        self.addCleanup(BLOCK_CLASSIFIER.unregister, task_rule)
+        BLOCK_CLASSIFIER.register("-", task_rule)
+        # the list rule was registered first with the same priority
+        self.assertEqual(
+            block_to_block_type("- [ ] write"), (BlockType.UNORDERED_LIST, ["[ ] write"])
+        )
+
+        BLOCK_CLASSIFIER.unregister(task_rule)
+        BLOCK_CLASSIFIER.register("-", task_rule, priority=1)
+        self.assertEqual(block_to_block_type("- [ ] write"), ("task", "write"))
+        self.assertEqual(block_to_block_type("- item"), (BlockType.UNORDERED_LIST, ["item"]))
+
+    def test_unregister(self):
+        def rule(block):
+            return BlockType.CODE, block
+
+        classifier = BlockClassifier()
+        classifier.register("!", rule)
+        classifier.unregister(rule)
+        self.assertEqual(classifier.classify("! note"), (BlockType.PARAGRAPH, "! note"))
+        with self.assertRaises(ValueError):
+            classifier.unregister(rule)
+
+    def test_digest_follows_the_registrations(self):
+        def rule(block):
+            return None
+
+        classifier = BlockClassifier()
+        digest = classifier.digest()
+        classifier.register("!", rule)
+        self.assertNotEqual(classifier.digest(), digest)
+        classifier.unregister(rule)
+        self.assertEqual(classifier.digest(), digest)
+
+    def test_empty_leading_characters(self):
+        with self.assertRaises(ValueError):
+            BlockClassifier().register("", lambda block: None)
+
+    def test_register_with_renderer(self):
+        renderer = BlockRenderer("rule", lambda data: None, lambda data: "<hr>", print)
+        classifier = BlockClassifier()
+        classifier.register("-", lambda block: ("rule", None) if block == "---" else None, renderer)
+        self.assertEqual(classifier.classify("---"), ("rule", None))
+        self.assertIs(classifier.renderer("rule"), renderer)
+
+    def test_unknown_block_type(self):
+        with self.assertRaises(ValueError):
+            BlockClassifier().renderer("table")
+
+
+if __name__ == "__main__":
+    unittest.main()
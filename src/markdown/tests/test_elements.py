@@ -8,6 +8,7 @@ from markdown.elements import (
     parse_ordered_list,
     parse_paragraph,
     parse_quote,
+    paragraph_to_html,
     parse_unordered_list,
     split_nodes_image,
     split_nodes_link,
@@ -79,6 +80,23 @@ class TestParseParagraph(unittest.TestCase):
         self.assertEqual(result, expected)
 
 
+class TestParagraphToHtml(unittest.TestCase):
+    def test_same_html_as_node(self):
+        paragraphs = [
+            "this is some text",
+            "[a lone link](https://example.com)",
+            "![a lone image](image.png)",
+            "[a link](https://example.com) followed by text",
+            "[a link](/a) and ![an image](/b.png)",
+            "**only bold**",
+        ]
+        for paragraph in paragraphs:
+            with self.subTest(paragraph=paragraph):
+                self.assertEqual(
+                    paragraph_to_html(paragraph), parse_paragraph(paragraph).to_html()
+                )
+
+
 class TestSplitNodesDelimiter(unittest.TestCase):
     def test_split_basic(self):
         node = TextNode("This is text with a `code block` word", TextType.TEXT)
@@ -313,6 +331,14 @@ class TestSplitNodesLink(unittest.TestCase):
         result = split_nodes_link([node])
         self.assertEqual(result, expected)
 
+    def test_split_nodes_link_skips_images(self):
+        node = TextNode("an ![image](/a.png) and a [link](/b)", TextType.TEXT)
+        expected = [
+            TextNode("an ![image](/a.png) and a ", TextType.TEXT),
+            TextNode("link", TextType.LINK, "/b"),
+        ]
+        self.assertEqual(split_nodes_link([node]), expected)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -44,6 +44,10 @@ class TestExtractMarkdownLinks(unittest.TestCase):
         result = extract_markdown_links(text)
         self.assertEqual(result, expected)
 
+    def test_extract_markdown_links_skips_images(self):
+        text = "An ![image](/a.png) and a [link](/b)"
+        self.assertEqual(extract_markdown_links(text), [("link", "/b")])
+
 
 class TestExtractTitle(unittest.TestCase):
     def test_extract_title_base(self):
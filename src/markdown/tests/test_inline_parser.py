@@ -0,0 +1,222 @@
+import threading
+import unittest
+
+from core import TextNode, TextType
+from markdown.elements import parse_inline
+from markdown.inline_parser import (
+    InlineCache,
+    get_inline_cache,
+    inline_to_html,
+    set_inline_cache,
+    text_to_textnodes,
+)
+
+
+class TestTextToTextNodes(unittest.TestCase):
+    def test_text_to_textnodes_all_types(self):
+        text = "This is **text** with an *italic* word and a `code block` and an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)"
+        expected = [
+            TextNode("This is ", TextType.TEXT),
+            TextNode("text", TextType.BOLD),
+            TextNode(" with an ", TextType.TEXT),
+            TextNode("italic", TextType.ITALIC),
+            TextNode(" word and a ", TextType.TEXT),
+            TextNode("code block", TextType.CODE),
+            TextNode(" and an ", TextType.TEXT),
+            TextNode(
+                "obi wan image", TextType.IMAGE, "https://i.imgur.com/fJRm4Vk.jpeg"
+            ),
+            TextNode(" and a ", TextType.TEXT),
+            TextNode("link", TextType.LINK, "https://boot.dev"),
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_text_to_textnodes_plain_text(self):
+        text = "just some text"
+        self.assertEqual(text_to_textnodes(text), [TextNode(text, TextType.TEXT)])
+
+    def test_text_to_textnodes_underscore_italic(self):
+        expected = [
+            TextNode("an ", TextType.TEXT),
+            TextNode("italic", TextType.ITALIC),
+            TextNode(" word", TextType.TEXT),
+        ]
+        self.assertEqual(text_to_textnodes("an _italic_ word"), expected)
+
+    def test_text_to_textnodes_consecutive_elements(self):
+        text = "**bold***italic*`code`"
+        expected = [
+            TextNode("bold", TextType.BOLD),
+            TextNode("italic", TextType.ITALIC),
+            TextNode("code", TextType.CODE),
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_text_to_textnodes_repeated_link(self):
+        link = "[home](/)"
+        expected = [
+            TextNode("home", TextType.LINK, "/"),
+            TextNode(" and ", TextType.TEXT),
+            TextNode("home", TextType.LINK, "/"),
+        ]
+        self.assertEqual(text_to_textnodes(f"{link} and {link}"), expected)
+
+    def test_text_to_textnodes_link_url_with_underscore(self):
+        text = "see [the docs](https://example.com/some_page)"
+        expected = [
+            TextNode("see ", TextType.TEXT),
+            TextNode("the docs", TextType.LINK, "https://example.com/some_page"),
+        ]
+        self.assertEqual(text_to_textnodes(text), expected)
+
+    def test_text_to_textnodes_delimiters_inside_code(self):
+        expected = [
+            TextNode("call ", TextType.TEXT),
+            TextNode("snake_case(*args)", TextType.CODE),
+        ]
+        self.assertEqual(text_to_textnodes("call `snake_case(*args)`"), expected)
+
+    def test_text_to_textnodes_brackets_without_link(self):
+        text = "a [note] and a ! mark"
+        self.assertEqual(text_to_textnodes(text), [TextNode(text, TextType.TEXT)])
+
+    def test_text_to_textnodes_link_after_unmatched_brackets(self):
+        expected = [
+            TextNode("[x [y\n", TextType.TEXT),
+            TextNode("a", TextType.LINK, "b"),
+            TextNode(" [c](d", TextType.TEXT),
+        ]
+        self.assertEqual(text_to_textnodes("[x [y\n[a](b) [c](d"), expected)
+
+    def test_text_to_textnodes_link_spans_brackets(self):
+        expected = [TextNode("a] b [c", TextType.LINK, "d")]
+        self.assertEqual(text_to_textnodes("[a] b [c](d)"), expected)
+
+    def test_text_to_textnodes_link_on_one_line(self):
+        text = "[a\n](b) [c](d\n)"
+        self.assertEqual(text_to_textnodes(text), [TextNode(text, TextType.TEXT)])
+
+    def test_text_to_textnodes_unmatched_delimiter(self):
+        with self.assertRaises(Exception) as context:
+            text_to_textnodes("this is **not closed")
+        self.assertEqual(str(context.exception), 'Unamtched delimiter "**"')
+
+    def test_text_to_textnodes_empty(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("")
+
+
+class TestInlineToHtml(unittest.TestCase):
+    texts = [
+        "plain text without any element",
+        "This is **text** with an *italic* word and a `code block` and an _underscored_ one",
+        "an ![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev)",
+        "**bold**_italic_`code`[link](/a)![image](/b.png)",
+        "[see the docs](https://example.com/some_page) then call `snake_case(*args)`",
+        "a [note] and a ! mark",
+        "****",
+        'if a < b && "c" > d, [<back](/?a=1&b="2") ![a "quoted" alt](/x.png?a=<b>)',
+        "`<div class=\"x\">`",
+    ]
+
+    def test_same_html_as_nodes(self):
+        for text in self.texts:
+            with self.subTest(text=text):
+                expected = "".join(node.to_html() for node in parse_inline(text))
+                self.assertEqual(inline_to_html(text), expected)
+
+    def test_unmatched_delimiter(self):
+        with self.assertRaises(Exception) as context:
+            inline_to_html("this is **not closed")
+        self.assertEqual(str(context.exception), 'Unamtched delimiter "**"')
+
+    def test_empty(self):
+        with self.assertRaises(ValueError):
+            inline_to_html("")
+
+
+class TestInlineCache(unittest.TestCase):
+    def tearDown(self):
+        set_inline_cache(None)
+
+    def test_hits_and_misses(self):
+        cache = InlineCache()
+        for text in ["some **bold** text", "a [link](/a)", "some **bold** text"]:
+            self.assertEqual(cache.render(text), inline_to_html(text))
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.entries), (1, 2, 2))
+        self.assertAlmostEqual(stats.hit_rate, 1 / 3)
+
+    def test_bounded(self):
+        cache = InlineCache(max_entries=2)
+        for text in ["one", "two", "three", "one"]:
+            cache.render(text)
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses, stats.entries), (0, 4, 2))
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            InlineCache(max_entries=0)
+
+    def test_errors_not_cached(self):
+        cache = InlineCache()
+        for _ in range(2):
+            with self.assertRaises(Exception):
+                cache.render("this is **not closed")
+        self.assertEqual(cache.stats().entries, 0)
+
+    def test_clear(self):
+        cache = InlineCache()
+        cache.render("text")
+        cache.render("text")
+        cache.add_counts(3, 4)
+        cache.clear()
+        self.assertEqual(tuple(cache.stats()), (0, 0, 0, 4096))
+
+    def test_take_and_add_counts(self):
+        worker = InlineCache()
+        worker.render("text")
+        worker.render("text")
+        self.assertEqual(worker.take_counts(), (1, 1))
+        worker.render("text")
+        self.assertEqual(worker.take_counts(), (1, 0))
+
+        cache = InlineCache()
+        cache.add_counts(2, 1)
+        self.assertEqual(cache.summary(), "Inline cache: 2 hits, 1 misses (66.7% hit rate)")
+
+    def test_set_inline_cache(self):
+        cache = InlineCache()
+        set_inline_cache(cache)
+        self.assertIs(get_inline_cache(), cache)
+        inline_to_html("some `code`")
+        inline_to_html("some `code`")
+        self.assertEqual(cache.stats().hits, 1)
+
+        set_inline_cache(None)
+        inline_to_html("some `code`")
+        self.assertEqual(cache.stats().hits, 1)
+
+    def test_threads(self):
+        cache = InlineCache(max_entries=8)
+        texts = [f"item **{index}** of [the list](/{index % 12})" for index in range(24)]
+        failures = []
+
+        def render():
+            for text in texts * 20:
+                if cache.render(text) != inline_to_html(text):
+                    failures.append(text)
+
+        threads = [threading.Thread(target=render) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(failures, [])
+        stats = cache.stats()
+        self.assertEqual(stats.hits + stats.misses, 4 * 20 * 24)
+        self.assertLessEqual(stats.entries, 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,7 +2,17 @@ import unittest
 from textwrap import dedent
 
 from core import LeafNode, ParentNode
-from markdown.parser import markdown_to_html_node
+from markdown.batch import markdown_to_html
+from markdown.block_parser import BLOCK_CLASSIFIER, BlockRenderer
+from markdown.parser import (
+    PageMetadata,
+    iter_page_html,
+    iter_page_nodes,
+    markdown_to_document,
+    markdown_to_html_node,
+    markdown_to_page,
+    outline_to_html,
+)
 
 
 class TestMarkdownToHtmlNodes(unittest.TestCase):
@@ -50,3 +60,160 @@ class TestMarkdownToHtmlNodes(unittest.TestCase):
         ]
         result = markdown_to_html_node(markdown)
         self.assertEqual(result, expected)
+
+
+class TestMarkdownToPage(unittest.TestCase):
+    def test_metadata(self):
+        markdown = dedent("""
+        Some intro
+
+        # The **title**
+
+        ## First section
+
+        * one item
+        * two more items
+
+        ### Detail
+
+        # Another h1
+        """)
+        page = markdown_to_page(markdown)
+        self.assertEqual(page.nodes, markdown_to_html_node(markdown))
+        self.assertEqual(page.title, "The **title**")
+        self.assertEqual(
+            page.outline,
+            [(1, "The **title**"), (2, "First section"), (3, "Detail"), (1, "Another h1")],
+        )
+        self.assertEqual(page.word_count, 14)
+
+    def test_title_followed_by_text(self):
+        markdown = "# Title\nSome text\n\nMore"
+        page = markdown_to_page(markdown)
+        self.assertEqual(page.title, "Title")
+        metadata = PageMetadata()
+        list(iter_page_html(markdown, metadata))
+        self.assertEqual(metadata.title, "Title")
+
+    def test_no_title(self):
+        page = markdown_to_page("## Not a title\n\nsome text")
+        self.assertIsNone(page.title)
+        self.assertEqual(page.outline, [(2, "Not a title")])
+
+
+class TestMarkdownToDocument(unittest.TestCase):
+    markdown = dedent("""
+    # The **title**
+
+    A paragraph with `code`, _italic_ text and [a link](https://example.com)
+
+    [a lone link](https://example.com)
+
+    ![a lone image](image.png)
+
+    > a quote
+
+    ```
+    some <code> & more
+    ```
+
+    * one item
+    * two **more** items
+
+    1. first
+    2. second
+    """)
+
+    def test_same_html(self):
+        document = markdown_to_document(self.markdown)
+        self.assertEqual(document.to_html(), markdown_to_html(self.markdown))
+
+    def test_same_nodes(self):
+        document = markdown_to_document(self.markdown)
+        self.assertEqual(document.to_nodes(), markdown_to_html_node(self.markdown))
+
+    def test_metadata(self):
+        metadata = PageMetadata()
+        markdown_to_document(self.markdown, metadata)
+        page = markdown_to_page(self.markdown)
+        self.assertEqual(metadata.title, page.title)
+        self.assertEqual(metadata.outline, page.outline)
+        self.assertEqual(metadata.word_count, page.word_count)
+
+
+class TestIterPageHtml(unittest.TestCase):
+    def test_code_is_escaped(self):
+        html = list(iter_page_html("```\n<p>a & b</p>\n```"))
+        self.assertEqual(html, ["<pre><code>&lt;p&gt;a &amp; b&lt;/p&gt;</code></pre>"])
+
+    def test_same_html_as_nodes(self):
+        markdown = TestMarkdownToDocument.markdown
+        expected = [node.to_html() for node in markdown_to_html_node(markdown)]
+        self.assertEqual(list(iter_page_html(markdown)), expected)
+
+    def test_metadata(self):
+        markdown = TestMarkdownToDocument.markdown
+        metadata = PageMetadata()
+        list(iter_page_html(markdown, metadata))
+        page = markdown_to_page(markdown)
+        self.assertEqual(
+            (metadata.title, metadata.outline, metadata.word_count),
+            (page.title, page.outline, page.word_count),
+        )
+
+
+class TestRegisteredBlockType(unittest.TestCase):
+    def setUp(self):
+        def rule(block):
+            if block.startswith("!!! "):
+                return "admonition", block[4:]
+            return None
+
+        def build(builder, text):
+            builder.open("aside")
+            builder.leaf(None, text)
+            builder.close()
+
+        renderer = BlockRenderer(
+            "admonition",
+            lambda text: ParentNode(tag="aside", children=[LeafNode(tag=None, value=text)]),
+            lambda text: f"<aside>{text}</aside>",
+            build,
+        )
+        BLOCK_CLASSIFIER.register("!", rule, renderer)
+        self.addCleanup(BLOCK_CLASSIFIER.unregister, rule, renderer)
+        self.markdown = "!!! Careful\n\n! not one"
+        self.html = ["<aside>Careful</aside>", "<p>! not one</p>"]
+
+    def test_nodes(self):
+        html = [node.to_html() for node in iter_page_nodes(self.markdown)]
+        self.assertEqual(html, self.html)
+
+    def test_html(self):
+        self.assertEqual(list(iter_page_html(self.markdown)), self.html)
+
+    def test_document(self):
+        nodes = markdown_to_document(self.markdown).to_nodes()
+        self.assertEqual([node.to_html() for node in nodes], self.html)
+
+    def test_no_renderer(self):
+        def rule(block):
+            return "question", block
+
+        BLOCK_CLASSIFIER.register("?", rule)
+        self.addCleanup(BLOCK_CLASSIFIER.unregister, rule)
+        with self.assertRaises(ValueError):
+            list(iter_page_html("? why"))
+
+
+class TestOutlineToHtml(unittest.TestCase):
+    def test_empty(self):
+        self.assertEqual(outline_to_html([]), "")
+
+    def test_nesting(self):
+        outline = [(1, "Title"), (2, "A"), (3, "A.1"), (2, "B"), (3, "B.1"), (1, "*End*")]
+        self.assertEqual(
+            outline_to_html(outline),
+            "<ul><li>Title<ul><li>A<ul><li>A.1</li></ul></li><li>B<ul><li>B.1</li></ul></li></ul>"
+            "</li><li><i>End</i></li></ul>",
+        )
@@ -1 +1,21 @@
-from .fs import generate_page, generate_page_recursive, sync_directories
+from .fs import (
+    BuildError,
+    discover_pages,
+    generate_page,
+    generate_page_recursive,
+    mirror_directories,
+    remove_output,
+    render_page,
+    render_pages,
+    render_pages_async,
+    sync_directories,
+    write_page,
+)
+from .cache import RenderCache
+from .manifest import BuildManifest, file_digest
+from .mapped import MappedFile, open_markdown
+from .template import Template, rewrite_urls
+from .watch import SiteWatcher, TreeSnapshot
+from .server import DevServer, PageCache
+from .profiling import NullProfiler, Profiler, StageEvent, get_profiler, set_profiler
+from .daemon import BuildDaemon, SiteCache
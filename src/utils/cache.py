@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import uuid
+from pathlib import Path
+from typing import Any, Dict, Tuple
+
+from markdown.block_parser import BLOCK_CLASSIFIER
+from markdown.constants import PARSER_VERSION
+
+
+class RenderCache:
+    """A content addressed cache of rendered pages, stored on disk.
+
+    Entries are keyed by the hash of the markdown, the parser version and the registered block
+    rules (see `BlockClassifier.digest`) and hold the page metadata and the HTML of the page
+    content, before it is placed in the template, so they stay valid across templates and base
+    paths. Entries are written atomically, so the directory can be shared
+    between builds and machines (e.g. a CI cache volume or an NFS mount).
+    """
+
+    def __init__(self, directory: Path, max_bytes: int = 1 << 30) -> None:
+        """
+        Args:
+            directory: The directory of the cache, created if needed
+            max_bytes: The size the cache is trimmed to by `evict` (default: 1 GiB)
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(markdown: str) -> str:
+        """Returns the cache key of a markdown document"""
+        digest = hashlib.sha256(PARSER_VERSION.encode())
+        digest.update(b"\0")
+        # the block rules registered on the parser change the HTML too
+        digest.update(BLOCK_CLASSIFIER.digest().encode())
+        digest.update(b"\0")
+        digest.update(markdown.encode())
+        return digest.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        # a level of subdirectories keeps the directories small on large sites
+        return self.directory / key[:2] / key[2:]
+
+    def get(self, key: str) -> Tuple[Dict[str, Any], str] | None:
+        """Looks up a rendered page
+
+        Args:
+            key: The cache key of the markdown
+
+        Returns:
+            Tuple[Dict[str, Any], str] | None: The page metadata (e.g. its title) and the content
+            HTML, or None on a miss
+
+        """
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                metadata = json.loads(f.readline())
+                html = f.read()
+        except (OSError, ValueError):
+            # missing, evicted meanwhile by another build or unreadable
+            return None
+        try:
+            # the modification time tracks the last use, for the LRU eviction
+            os.utime(path)
+        except OSError:
+            # a read-only cache still serves its entries
+            pass
+        if not isinstance(metadata, dict):
+            return None
+        return metadata, html
+
+    def put(self, key: str, metadata: Dict[str, Any], html: str):
+        """Stores a rendered page
+
+        Args:
+            key: The cache key of the markdown
+            metadata: The page metadata, e.g. its title
+            html: The content HTML of the page
+
+        """
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        # a unique name per writer, the rename makes the entry visible all at once
+        tmp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(json.dumps(metadata))
+                f.write("\n")
+                f.write(html)
+            tmp_path.replace(path)
+        except OSError:
+            # a cache that can't be written is just a cache miss next time
+            tmp_path.unlink(missing_ok=True)
+
+    def evict(self) -> int:
+        """Removes the least recently used entries until the cache fits in `max_bytes`
+
+        Returns:
+            int: The number of removed entries
+
+        """
+        entries = []
+        total = 0
+        for current_dir, _, files in os.walk(self.directory):
+            for name in files:
+                path = Path(current_dir) / name
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+                total += stat.st_size
+
+        removed = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+    def __repr__(self) -> str:
+        return f"RenderCache(directory={self.directory!r}, max_bytes={self.max_bytes!r})"
@@ -0,0 +1,262 @@
+"""A build daemon, a warm process that runs builds sent over a local Unix socket.
+
+Every run of `main.py` pays for the interpreter startup, the import of the generator and a walk of
+the content tree before the first page is rendered. The daemon pays for them once, keeps the
+inventory of the content and the compiled templates between builds, and `client.py` sends it the
+arguments of each build without importing the generator.
+
+Protocol, one JSON object per line:
+    request: {"argv": [...], "cwd": "..."} to build, or {"stop": true} to stop the daemon
+    response: any number of {"stdout": "..."} and {"stderr": "..."}, then {"exit": <code>}
+"""
+
+import io
+import json
+import os
+import socket
+import socketserver
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, List, Tuple
+
+from markdown import set_inline_cache
+
+from .profiling import NullProfiler, set_profiler
+from .template import Template
+from .watch import TreeSnapshot
+
+
+class SiteCache:
+    """The content inventories and compiled templates a daemon keeps between builds.
+
+    A content directory is walked once, the next builds only check its known directories and
+    files for changes (see `TreeSnapshot`). A template is compiled again only when its file changed.
+    """
+
+    def __init__(self) -> None:
+        self.inventories: Dict[Path, TreeSnapshot] = {}
+        self.templates: Dict[Tuple[Path, Path, str], Tuple[Tuple[int, int], Template]] = {}
+
+    def pages(self, source: Path, output: Path) -> List[Tuple[Path, Path]] | None:
+        """Pairs every file of a content directory with the path of its HTML file, the same
+        pages as `discover_pages`
+
+        Args:
+            source: Path to the markdown content
+            output: Path to the output directory
+
+        Returns:
+            List[Tuple[Path, Path]] | None: The (markdown path, HTML path) tuples, or None if the
+            content directory doesn't exist
+
+        """
+        root = source.resolve()
+        if not root.is_dir():
+            self.inventories.pop(root, None)
+            return None
+
+        snapshot = self.inventories.get(root)
+        if snapshot is None:
+            snapshot = self.inventories[root] = TreeSnapshot(root)
+        else:
+            snapshot.changes()
+
+        pages: List[Tuple[Path, Path]] = []
+        for path in sorted(snapshot.files):
+            relative = path.relative_to(root)
+            pages.append((source / relative, output / relative.parent / (relative.stem + ".html")))
+        return pages
+
+    def template(self, path: Path, basepath: str = "/") -> Template | None:
+        """Returns a compiled template, loading it again if its file changed since the last call
+
+        Args:
+            path: Path to the template file
+            basepath: The base path for relative URLs (default: "/")
+
+        Returns:
+            Template | None: The template, or None if the file doesn't exist
+
+        """
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None
+        version = (stat.st_mtime_ns, stat.st_size)
+        # the path as given is part of the key, it's the one the build prints
+        key = (path.resolve(), path, basepath)
+
+        cached = self.templates.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        template = Template.load(path, basepath)
+        self.templates[key] = (version, template)
+        return template
+
+
+class BuildDaemon(socketserver.UnixStreamServer):
+    """Runs the builds sent by clients over a Unix socket, one at a time.
+
+    Builds share the working directory and the profiler and inline cache of the process, so they
+    are never run concurrently, a client connecting during a build waits for its turn. What a
+    build prints is streamed to its client, including the output of the worker processes.
+    """
+
+    def __init__(
+        self, socket_path: Path, build: Callable[[List[str], SiteCache], None]
+    ) -> None:
+        """
+        Args:
+            socket_path: The path of the Unix socket to listen on
+            build: Runs a build from its command line arguments, the same as the command line
+                of `main.py`, with the site cache of the daemon
+
+        Raises:
+            ValueError: If another daemon is already listening on the socket
+        """
+        if socket_path.exists():
+            if _is_listening(socket_path):
+                raise ValueError(f"A build daemon is already listening on {socket_path}")
+            # left behind by a daemon that didn't stop cleanly
+            socket_path.unlink()
+
+        super().__init__(str(socket_path), BuildRequestHandler)
+        # builds change the working directory, the socket is removed from the original one
+        self.socket_path = socket_path.absolute()
+        self.build = build
+        self.site = SiteCache()
+        self.stopped = False
+
+    def run_build(
+        self, argv: List[str], cwd: str, stdout: io.TextIOBase, stderr: io.TextIOBase
+    ) -> int:
+        """Runs a build in the working directory of its client
+
+        Args:
+            argv: The command line arguments of the build
+            cwd: The working directory of the client, the paths of argv are relative to it
+            stdout: Receives what the build prints
+            stderr: Receives the errors of the build
+
+        Returns:
+            int: The exit code of the build, as the one of `main.py`
+
+        """
+        previous = os.getcwd()
+        try:
+            with redirect_stdout(stdout), redirect_stderr(stderr):
+                try:
+                    os.chdir(cwd)
+                    self.build(argv, self.site)
+                    return 0
+                except SystemExit as e:
+                    return _exit_code(e, stderr)
+                except Exception:
+                    traceback.print_exc()
+                    return 1
+                finally:
+                    stdout.flush()
+                    stderr.flush()
+        finally:
+            os.chdir(previous)
+            # the next build starts from the defaults of the process
+            set_profiler(NullProfiler())
+            set_inline_cache(None)
+
+    def serve(self):
+        """Serves builds until interrupted or stopped by a client"""
+        print(f"Build daemon listening on {self.socket_path}")
+        try:
+            while not self.stopped:
+                self.handle_request()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.server_close()
+        print("Stopped the build daemon")
+
+    def server_close(self):
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+class BuildRequestHandler(socketserver.StreamRequestHandler):
+    server: BuildDaemon
+
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+            if request.get("stop"):
+                self.server.stopped = True
+                code = 0
+            else:
+                code = self.server.run_build(
+                    list(request["argv"]),
+                    request["cwd"],
+                    _MessageWriter(self.wfile, "stdout"),
+                    _MessageWriter(self.wfile, "stderr"),
+                )
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            _MessageWriter(self.wfile, "stderr").write(f"Invalid request: {e}\n")
+            code = 2
+        _send(self.wfile, {"exit": code})
+
+
+class _MessageWriter(io.TextIOBase):
+    """Sends the text written to it to the client, one message per complete line.
+
+    Worker processes inherit the writer and the socket, sending whole lines keeps their output from
+    interleaving with the one of the other processes. A client gone in the middle of a build loses
+    the rest of the output, the build itself goes on.
+    """
+
+    def __init__(self, wfile: BinaryIO, stream: str) -> None:
+        self.wfile = wfile
+        self.stream = stream
+        self.pending: List[str] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        self.pending.append(text)
+        if "\n" in text:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        if not self.pending:
+            return
+        text = "".join(self.pending)
+        self.pending.clear()
+        if not text:
+            return
+        try:
+            _send(self.wfile, {self.stream: text})
+        except OSError:
+            pass
+
+
+def _send(wfile: BinaryIO, message: dict):
+    wfile.write(json.dumps(message).encode() + b"\n")
+    wfile.flush()
+
+
+def _exit_code(exit: SystemExit, stderr: io.TextIOBase) -> int:
+    """Converts the argument of a SystemExit the way the interpreter does"""
+    if exit.code is None:
+        return 0
+    if isinstance(exit.code, int):
+        return exit.code
+    print(exit.code, file=stderr)
+    return 1
+
+
+def _is_listening(socket_path: Path) -> bool:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+        except OSError:
+            return False
+    return True
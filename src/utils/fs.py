@@ -1,14 +1,53 @@
+import asyncio
 import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from io import StringIO
 from pathlib import Path
-
-from markdown import extract_title, markdown_to_html_node
+from tempfile import SpooledTemporaryFile
+from typing import Iterable, List, Set, TextIO, Tuple
+
+from core import escape_text
+from markdown import (
+    InlineCache,
+    PageMetadata,
+    get_inline_cache,
+    iter_page_html,
+    outline_to_html,
+    set_inline_cache,
+    write_html_blocks,
+)
+
+from .cache import RenderCache
+from .manifest import BuildManifest, file_digest
+from .mapped import MappedFile, open_markdown
+from .profiling import Profiler, StageEvent, get_profiler, set_profiler
+from .template import Template
+
+# The HTML of a page is kept in memory up to this many characters, larger pages are spooled to disk
+SPOOL_SIZE = 1 << 22
 
 
 def invalid_path_error(context):
     raise ValueError(f"{context} must be a valid path")
 
 
+class BuildError(Exception):
+    """Raised when one or more pages could not be generated"""
+
+    def __init__(self, failures: List[Tuple[Path, Exception]]) -> None:
+        """
+        Args:
+            failures: A list of (markdown path, exception) tuples, one per failed page
+        """
+        self.failures = failures
+        details = "\n".join(
+            f"  {from_path}: {type(error).__name__}: {error}"
+            for from_path, error in failures
+        )
+        super().__init__(f"{len(failures)} page(s) failed to generate:\n{details}")
+
+
 def sync_directories(source: Path, destination: Path):
     """Cleans the destination then syncronizes the contents of source directory to destination directory.
 
@@ -56,6 +95,123 @@ def sync_directories(source: Path, destination: Path):
     _copy_recursive(source, destination)
 
 
+def is_unchanged(source: Path, destination: Path, checksum: bool = False) -> bool:
+    """Checks if a destination file is already an up to date copy of the source file
+
+    Args:
+        source: The path of the source file
+        destination: The path of the copy
+        checksum: Compare the contents hashes instead of the size and modification time
+
+    Returns:
+        bool: True if the file doesn't need to be copied again
+
+    """
+    try:
+        source_stat = source.stat()
+        destination_stat = destination.stat()
+    except FileNotFoundError:
+        return False
+
+    if source_stat.st_size != destination_stat.st_size:
+        return False
+    if checksum:
+        return file_digest(source) == file_digest(destination)
+    return source_stat.st_mtime_ns == destination_stat.st_mtime_ns
+
+
+def copy_file(source: Path, destination: Path, link: bool = False):
+    """Copies a file preserving its modification time, using the cheapest method available
+
+    Args:
+        source: The path of the file to copy
+        destination: The path of the copy
+        link: Hardlink the file instead of copying its bytes, when the filesystem supports it
+
+    """
+    # never write through the old destination, it may be a hardlink to a source file
+    destination.unlink(missing_ok=True)
+
+    if link:
+        try:
+            os.link(source, destination)
+            return
+        except OSError:
+            # e.g. a different filesystem, fall back to a copy
+            pass
+
+    try:
+        # copy_file_range keeps the copy inside the kernel, and reflinks on filesystems that support it
+        with open(source, "rb") as fsrc, open(destination, "wb") as fdst:
+            remaining = os.fstat(fsrc.fileno()).st_size
+            while remaining > 0:
+                copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                if copied == 0:
+                    break
+                remaining -= copied
+    except (AttributeError, OSError):
+        # not available on this platform or filesystem
+        shutil.copyfile(source, destination)
+
+    # the modification time is what tells an unchanged copy on the next sync
+    shutil.copystat(source, destination)
+
+
+def mirror_directories(
+    source: Path,
+    destination: Path,
+    manifest: BuildManifest,
+    checksum: bool = False,
+    link: bool = False,
+):
+    """Synchronizes the contents of the source directory into the destination without cleaning it.
+
+    Only new or changed files are copied. Files synced by a previous run that no longer exist in
+    the source are removed, anything else in the destination (e.g. generated pages) is left alone.
+
+    Args:
+        source: Path to the source directory to copy from
+        destination: Path to the destination directory to copy to
+        manifest: The build manifest, which records the synced files between runs. It is updated
+            but not saved
+        checksum: Compare files by content hash instead of size and modification time
+        link: Hardlink files instead of copying them, when the filesystem supports it
+
+    Raises:
+        ValueError: If source or destination paths are invalid
+
+    """
+    if not source.exists():
+        invalid_path_error("source")
+
+    if not destination.exists():
+        invalid_path_error("destination")
+
+    synced: Set[str] = set()
+
+    for current_dir, _, files in os.walk(source):
+        current_path = Path(current_dir)
+        copy_destination = destination / current_path.relative_to(source)
+        copy_destination.mkdir(parents=True, exist_ok=True)
+
+        for item in files:
+            item_path = current_path / item
+            item_destination = copy_destination / item
+            synced.add(item_destination.relative_to(destination).as_posix())
+
+            if is_unchanged(item_path, item_destination, checksum):
+                continue
+            print(f"Copying {item_path} to {item_destination}")
+            copy_file(item_path, item_destination, link)
+
+    # prune the files synced by a previous run that were removed from the source
+    for removed in manifest.static - synced:
+        print(f"Removing {destination / removed}, it was removed from {source}")
+        remove_output(destination / removed, destination)
+
+    manifest.static = synced
+
+
 def generate_page(
     from_path: Path, template_path: Path, dest_path: Path, basepath: str = "/"
 ):
@@ -71,40 +227,406 @@ def generate_page(
         ValueError: If from_path or template_path are invalid paths
 
     """
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    # check if path are valid
-    if not from_path.exists():
-        invalid_path_error("from_path")
     if not template_path.exists():
         invalid_path_error("template_path")
+
+    template = Template.load(template_path, basepath)
+    _announce(from_path, dest_path, template)
+    render_page(from_path, template, dest_path)
+
+
+def _announce(from_path: Path, dest_path: Path, template: Template):
+    # printed by the process driving the build, never by a worker, so the lines don't interleave
+    print(f"Generating page from {from_path} to {dest_path} using {template.path}")
+
+
+def render_page(
+    from_path: Path,
+    template: Template,
+    dest_path: Path,
+    cache: RenderCache | None = None,
+):
+    """Generate an HTML page from a markdown file using an already compiled template, the caller
+    reports the progress
+
+    Args:
+        from_path: The path of the markdown file
+        template: The compiled template, which carries the basepath
+        dest_path: The path where the generated HTML file will be
+        cache: The render cache to reuse the HTML of unchanged markdown from, if any
+
+    Raises:
+        ValueError: If from_path is an invalid path
+
+    """
+    # check if path is valid
+    if not from_path.exists():
+        invalid_path_error("from_path")
     # create `dest_path`'s parents if nedeed
     dest_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # read the markdown
-    with open(from_path) as f:
-        markdown = f.read()
-    # read the template
-    with open(template_path) as f:
-        template = f.read()
+    # stream the html into a sibling file, so a page failing halfway never leaves a truncated file
+    tmp_path = dest_path.with_name(dest_path.name + ".tmp")
+    try:
+        # large sources are memory-mapped rather than copied into the process
+        with open_markdown(from_path) as source, open(tmp_path, "w") as f:
+            write_page(source, template, f, str(from_path), cache)
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    tmp_path.replace(dest_path)
+
+
+def write_page(
+    markdown: str | TextIO | MappedFile,
+    template: Template,
+    out: TextIO,
+    page: str | None = None,
+    cache: RenderCache | None = None,
+):
+    """Converts markdown to HTML and writes the filled template into `out`.
+
+    Besides `{{ Title }}` and `{{ Content }}`, the template can use `{{ Outline }}`, the headers of
+    the page as nested lists, and `{{ WordCount }}`.
+
+    Args:
+        markdown: The markdown of the page, or the open markdown file, which is read block by block
+            unless a cache is used
+        template: The compiled template, which carries the basepath
+        out: The file-like object the page is written into
+        page: The source of the page, labels the profiled stages
+        cache: The render cache to look the HTML up in and store it into, if any
+
+    Raises:
+        ValueError: If the markdown has no h1 header
+
+    """
+    profiler = get_profiler()
+
+    if cache is None:
+        metadata = PageMetadata()
+        # the title comes before the content in the template but may be anywhere in the markdown,
+        # the content is held until the end of the parse, spilling to disk if the page is large
+        with SpooledTemporaryFile(max_size=SPOOL_SIZE, mode="w+") as content:
+            with profiler.stage("parse", page):
+                write_html_blocks(content, iter_page_html(markdown, metadata))
+            if metadata.title is None:
+                raise ValueError("H1 header not encountered in markdown passed")
+
+            content.seek(0)
+            with profiler.stage("write", page):
+                # the spooled content is read back line by line, a URL never spans two lines
+                _fill_template(
+                    template,
+                    out,
+                    metadata.title,
+                    metadata.outline,
+                    metadata.word_count,
+                    content,
+                )
+        return
+
+    if not isinstance(markdown, str):
+        with profiler.stage("read", page):
+            markdown = markdown.read()
+
+    with profiler.stage("cache", page):
+        key = cache.key(markdown)
+        cached = cache.get(key)
+
+    if cached is None:
+        collected = PageMetadata()
+        with profiler.stage("parse", page):
+            # the HTML and the metadata come out of the same pass over the markdown, the content
+            # is stored before the template and the basepath are applied, so an entry is valid
+            # for any site using the same markdown
+            content = "\n".join(iter_page_html(markdown, collected))
+        if collected.title is None:
+            raise ValueError("H1 header not encountered in markdown passed")
+        metadata = {
+            "title": collected.title,
+            "outline": collected.outline,
+            "word_count": collected.word_count,
+        }
+        with profiler.stage("cache", page):
+            cache.put(key, metadata, content)
+    else:
+        metadata, content = cached
+
+    with profiler.stage("write", page):
+        _fill_template(
+            template,
+            out,
+            metadata["title"],
+            metadata["outline"],
+            metadata["word_count"],
+            content,
+        )
+
+
+def _fill_template(
+    template: Template,
+    out: TextIO,
+    title: str,
+    outline: List[Tuple[int, str]],
+    word_count: int,
+    content: str | Iterable[str],
+):
+    # URLs are updated to use the basepath on the way, the title is raw markdown text
+    template.write(
+        out,
+        Title=escape_text(title),
+        Outline=outline_to_html(outline),
+        WordCount=str(word_count),
+        Content=content,
+    )
+
+
+def discover_pages(dir_path_content: Path, dest_dir_path: Path) -> List[Tuple[Path, Path]]:
+    """Walks the content directory and pairs every markdown file with the path of its HTML file
+
+    Args:
+        dir_path_content: The path to the source directory containing markdown files
+        dest_dir_path: The path to the destination directory
 
-    # extract the nodes from markdown
-    html_nodes = markdown_to_html_node(markdown)
-    # extract the title from markdown
-    title = extract_title(markdown)
-    # build html content
-    html_content = "\n".join([node.to_html() for node in html_nodes])
+    Returns:
+        List[Tuple[Path, Path]]: A list of (markdown path, HTML path) tuples
 
-    # replace placeholders
-    template = template.replace("{{ Title }}", title)
-    template = template.replace("{{ Content }}", html_content)
+    """
+    pages: List[Tuple[Path, Path]] = []
 
-    # update URls to use the basepath
-    template = template.replace('href="/', f'href="{basepath}')
-    template = template.replace('src="/', f'src="{basepath}')
+    def _process_directory(current_path: Path, dest_path: Path):
+        for item in os.listdir(current_path):
+            item_path = current_path / item
+
+            # If is a file, pair it with its generated file name
+            if item_path.is_file():
+                pages.append((item_path, dest_path / (item_path.stem + ".html")))
+            # If is a directory, continue recursion
+            elif item_path.is_dir():
+                _process_directory(item_path, dest_path / item_path.name)
+
+    _process_directory(dir_path_content, dest_dir_path)
+    return pages
 
-    # write the new html file
-    with open(dest_path, "w") as f:
-        f.write(template)
+
+# The template of the build, sent once to each worker process instead of once per page
+_worker_template: Template | None = None
+# Whether the worker ships its profiled stages back with each page
+_worker_profiling = False
+# The render cache of the build, if any
+_worker_cache: RenderCache | None = None
+# Whether the worker has its own inline cache, whose counts are shipped back with each page
+_worker_inline_cache = False
+
+# The (hits, misses) of the inline cache of a worker during a page
+InlineCounts = Tuple[int, int]
+
+
+def _init_worker(
+    template: Template,
+    profiling: bool = False,
+    cache: RenderCache | None = None,
+    inline_cache_size: int = 0,
+):
+    global _worker_template, _worker_profiling, _worker_cache, _worker_inline_cache
+    _worker_template = template
+    _worker_cache = cache
+    if profiling:
+        _worker_profiling = True
+        set_profiler(Profiler())
+    if inline_cache_size > 0:
+        _worker_inline_cache = True
+        set_inline_cache(InlineCache(inline_cache_size))
+
+
+def _take_inline_counts() -> InlineCounts:
+    inline_cache = get_inline_cache()
+    if _worker_inline_cache and inline_cache is not None:
+        return inline_cache.take_counts()
+    return 0, 0
+
+
+def _worker_options(cache: RenderCache | None) -> tuple:
+    # the arguments of `_init_worker` after the template, for a pool of worker processes
+    inline_cache = get_inline_cache()
+    inline_cache_size = inline_cache.max_entries if inline_cache is not None else 0
+    return get_profiler().enabled, cache, inline_cache_size
+
+
+def _merge_inline_counts(counts: InlineCounts):
+    inline_cache = get_inline_cache()
+    if inline_cache is not None:
+        inline_cache.add_counts(*counts)
+
+
+def _render_page(
+    task: Tuple[Path, Path],
+) -> Tuple[Exception | None, List[StageEvent], InlineCounts]:
+    """Generates a single page with the worker's template, returning the error instead of raising
+    it so a failed page doesn't abort the rest of the build"""
+    from_path, dest_path = task
+    error = None
+    try:
+        render_page(from_path, _worker_template, dest_path, _worker_cache)  # type: ignore[reportArgumentType]
+    except Exception as e:
+        error = e
+    events = get_profiler().take_events() if _worker_profiling else []
+    return error, events, _take_inline_counts()
+
+
+def render_pages(
+    pages: List[Tuple[Path, Path]],
+    template: Template,
+    jobs: int = 1,
+    cache: RenderCache | None = None,
+    io_concurrency: int = 0,
+) -> List[Tuple[Path, Exception]]:
+    """Generates a list of pages, optionally spreading them across a pool of worker processes
+
+    Args:
+        pages: A list of (markdown path, HTML path) tuples
+        template: The compiled template shared by every page
+        jobs: The number of worker processes, 1 renders in the current process (default: 1)
+        cache: The render cache shared by every page, if any
+        io_concurrency: When positive, the files of up to this many pages are read and written
+            concurrently, see `render_pages_async` (default: 0)
+
+    Returns:
+        List[Tuple[Path, Exception]]: The (markdown path, exception) tuples of the pages that failed
+
+    """
+    if io_concurrency > 0:
+        return asyncio.run(
+            render_pages_async(pages, template, jobs, cache, io_concurrency)
+        )
+    if jobs <= 1 or len(pages) <= 1:
+        _init_worker(template, cache=cache)
+        results = []
+        for page in pages:
+            _announce(*page, template)
+            results.append(_render_page(page))
+    else:
+        profiler = get_profiler()
+        # a few chunks per worker amortizes the IPC cost while still balancing uneven pages
+        chunksize = max(1, len(pages) // (jobs * 4))
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(pages)),
+            initializer=_init_worker,
+            initargs=(template, *_worker_options(cache)),
+        ) as executor:
+            results = []
+            # the progress is printed here as the results come back, in the order of the pages
+            for page, result in zip(
+                pages, executor.map(_render_page, pages, chunksize=chunksize)
+            ):
+                _announce(*page, template)
+                results.append(result)
+        for _, events, inline_counts in results:
+            profiler.add_events(events)
+            _merge_inline_counts(inline_counts)
+
+    return [(page[0], e) for page, (e, _, _) in zip(pages, results) if e is not None]
+
+
+def _render_markdown(task: Tuple[str, str]) -> Tuple[str, List[StageEvent], InlineCounts]:
+    """Converts the markdown of a page to its HTML with the worker's template, the files are read
+    and written by the caller"""
+    markdown, page = task
+    out = StringIO()
+    write_page(markdown, _worker_template, out, page, _worker_cache)  # type: ignore[reportArgumentType]
+    events = get_profiler().take_events() if _worker_profiling else []
+    return out.getvalue(), events, _take_inline_counts()
+
+
+def _read_markdown(from_path: Path) -> str:
+    if not from_path.exists():
+        invalid_path_error("from_path")
+    with get_profiler().stage("read", str(from_path)):
+        with open_markdown(from_path) as f:
+            return f.read()
+
+
+def _write_output(dest_path: Path, html: str, page: str):
+    with get_profiler().stage("output", page):
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        # written next to the page then renamed, like `render_page`
+        tmp_path = dest_path.with_name(dest_path.name + ".tmp")
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(html)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        tmp_path.replace(dest_path)
+
+
+async def render_pages_async(
+    pages: List[Tuple[Path, Path]],
+    template: Template,
+    jobs: int = 1,
+    cache: RenderCache | None = None,
+    concurrency: int = 32,
+) -> List[Tuple[Path, Exception]]:
+    """Generates a list of pages, overlapping the reads and writes of many pages.
+
+    The blocking file calls run in a pool of `concurrency` threads, so the latency of a slow or
+    network filesystem is paid for many pages at once instead of one after the other. The
+    conversion itself runs in a pool of `jobs` worker processes, or in a single thread when `jobs`
+    is 1. At most `concurrency` pages are in flight, which bounds the memory used. The generated
+    pages are identical to the ones of `render_pages`.
+
+    Args:
+        pages: A list of (markdown path, HTML path) tuples
+        template: The compiled template shared by every page
+        jobs: The number of worker processes converting the pages (default: 1)
+        cache: The render cache shared by every page, if any
+        concurrency: The number of pages read, converted or written at the same time (default: 32)
+
+    Returns:
+        List[Tuple[Path, Exception]]: The (markdown path, exception) tuples of the pages that failed
+
+    """
+    loop = asyncio.get_running_loop()
+    profiler = get_profiler()
+    limit = asyncio.Semaphore(concurrency)
+
+    if jobs > 1 and len(pages) > 1:
+        converter = ProcessPoolExecutor(
+            max_workers=min(jobs, len(pages)),
+            initializer=_init_worker,
+            initargs=(template, *_worker_options(cache)),
+        )
+    else:
+        # the worker globals of the current process, used by the converter thread
+        _init_worker(template, cache=cache)
+        converter = ThreadPoolExecutor(max_workers=1)
+    io_pool = ThreadPoolExecutor(max_workers=concurrency)
+
+    async def render(from_path: Path, dest_path: Path):
+        async with limit:
+            _announce(from_path, dest_path, template)
+            markdown = await loop.run_in_executor(io_pool, _read_markdown, from_path)
+            html, events, inline_counts = await loop.run_in_executor(
+                converter, _render_markdown, (markdown, str(from_path))
+            )
+            profiler.add_events(events)
+            _merge_inline_counts(inline_counts)
+            await loop.run_in_executor(
+                io_pool, _write_output, dest_path, html, str(from_path)
+            )
+
+    with converter, io_pool:
+        results = await asyncio.gather(
+            *(render(from_path, dest_path) for from_path, dest_path in pages),
+            return_exceptions=True,
+        )
+
+    return [
+        (page[0], result)
+        for page, result in zip(pages, results)
+        if isinstance(result, Exception)
+    ]
 
 
 def generate_page_recursive(
@@ -112,6 +634,12 @@ def generate_page_recursive(
     template_path: Path,
     dest_dir_path: Path,
     basepath: str = "/",
+    manifest: BuildManifest | None = None,
+    jobs: int = 1,
+    cache: RenderCache | None = None,
+    io_concurrency: int = 0,
+    pages: List[Tuple[Path, Path]] | None = None,
+    template: Template | None = None,
 ):
     """Converts markdown files from a source directory to HTML using a template and puts them in a destination directory
 
@@ -119,10 +647,25 @@ def generate_page_recursive(
         dir_path_content (Path): The path to the source directory containing markdown files.
         template_path (Path): The path to the template file.
         dest_dir_path (Path): The path to the destination directory where the generated HTML files will be placed.
+        basepath (str): The base path for relative URLs (default: "/")
+        manifest (BuildManifest | None): When passed, only pages whose source, template or basepath
+            changed since the last build are generated, and pages whose source disappeared are removed.
+        jobs (int): The number of worker processes used to render the pages (default: 1)
+        cache (RenderCache | None): When passed, pages whose markdown was rendered before, by this
+            or another build sharing the cache directory, reuse the stored HTML. The cache is
+            trimmed to its size once the pages are generated.
+        io_concurrency (int): When positive, the files of up to this many pages are read and
+            written concurrently, which hides the latency of slow filesystems (default: 0)
+        pages (List[Tuple[Path, Path]] | None): The (markdown path, HTML path) tuples of the
+            content, when they are already known, e.g. kept by a `SiteCache`. By default the
+            content directory is walked with `discover_pages`.
+        template (Template | None): The template compiled from `template_path` with `basepath`,
+            when it's already loaded. By default the template file is read and compiled.
 
     Raises:
         ValueError: If the source directory does not exist.
         ValueError: If the destination directory does not exist.
+        BuildError: If any page failed to generate, after every other page was generated.
 
     """
     # validate paths
@@ -131,28 +674,85 @@ def generate_page_recursive(
     if not dest_dir_path.exists():
         invalid_path_error("dest_dir_path")
 
-    def _process_directory(current_path: Path, dest_path: Path):
-        """Recursively converts markdown files to HTML
-
-        Args:
-            current_path (Path): The current path being processed.
-            dest_path (Path): The destination path for the generated HTML files.
-        """
-        # Create the destination directory if it doesn't exist
-        Path.mkdir(dest_path, exist_ok=True)
+    if not template_path.exists():
+        invalid_path_error("template_path")
 
-        # Process each item in the current directory
-        for item in os.listdir(current_path):
-            # Get the full path of the current item
-            item_path = current_path / item
+    if pages is None:
+        pages = discover_pages(dir_path_content, dest_dir_path)
+    if template is None:
+        # the template is read and compiled once for the whole build
+        template = Template.load(template_path, basepath)
+
+    if manifest is None:
+        failures = render_pages(pages, template, jobs, cache, io_concurrency)
+        _evict(cache)
+        if failures:
+            raise BuildError(failures)
+        return
+
+    template_hash = file_digest(template_path)
+    source_hashes = {}
+    stale_pages = []
+    for from_path, dest_path in pages:
+        source_hash = file_digest(from_path)
+        if not manifest.is_current(
+            from_path.relative_to(dir_path_content),
+            dest_path,
+            source_hash,
+            template_hash,
+            basepath,
+        ):
+            source_hashes[from_path] = source_hash
+            stale_pages.append((from_path, dest_path))
+
+    failures = render_pages(stale_pages, template, jobs, cache, io_concurrency)
+    _evict(cache)
+    failed_sources = {from_path for from_path, _ in failures}
+    for from_path, dest_path in stale_pages:
+        if from_path not in failed_sources:
+            manifest.record(
+                from_path.relative_to(dir_path_content),
+                dest_path,
+                source_hashes[from_path],
+                template_hash,
+                basepath,
+            )
+
+    # remove the pages whose markdown source no longer exists
+    current_outputs = {manifest.page_key(dest_path) for _, dest_path in pages}
+    for stale_output in manifest.outputs() - current_outputs:
+        stale_path = dest_dir_path / stale_output
+        print(f"Removing {stale_path}, its source is gone")
+        manifest.forget(stale_path)
+        remove_output(stale_path, dest_dir_path)
+
+    manifest.save()
+
+    if failures:
+        raise BuildError(failures)
+
+
+def _evict(cache: RenderCache | None):
+    if cache is not None:
+        with get_profiler().stage("evict"):
+            cache.evict()
+
+
+def remove_output(path: Path, root: Path):
+    """Removes a generated file and the directories it leaves empty, up to `root`
 
-            # If is a file, process it
-            if item_path.is_file():
-                # Generated file name
-                new_file = item_path.stem + ".html"
-                generate_page(item_path, template_path, dest_path / new_file, basepath)
-            # If is a directory, continue recursion
-            elif item_path.is_dir():
-                _process_directory(item_path, dest_path / item_path.name)
+    Args:
+        path: The path of the generated file
+        root: The output directory, never removed
 
-    _process_directory(dir_path_content, dest_dir_path)
+    """
+    path.unlink(missing_ok=True)
+
+    parent = path.parent
+    while parent != root and root in parent.parents:
+        try:
+            parent.rmdir()
+        except OSError:
+            # not empty (or already gone), stop climbing
+            break
+        parent = parent.parent
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Set
+
+from markdown.block_parser import BLOCK_CLASSIFIER
+from markdown.constants import PARSER_VERSION
+
+
+def file_digest(path: Path) -> str:
+    """Hashes the contents of a file
+
+    Args:
+        path: The path of the file to hash
+
+    Returns:
+        str: The hex encoded sha256 digest of the file contents
+
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class BuildManifest:
+    """Persistent record of the inputs every generated page was built from.
+
+    Each entry is keyed by the path of the generated page, relative to the output directory, and
+    stores the path of the source relative to the content directory, the hash of the source, the
+    hash of the template, the basepath, and the version and the registered block rules of the
+    parser. A page whose recorded inputs match the current ones doesn't need to be generated
+    again, a new parser version or block rule regenerates every page. The relative paths keep the
+    entries valid whatever the spelling of the directories on the command line.
+
+    It also records the static files synced into the output, so the ones removed from the static
+    directory can be pruned without touching the generated pages.
+    """
+
+    FILENAME = ".build-manifest.json"
+    # bumped when the layout of the entries changes, older manifests are ignored
+    FORMAT_VERSION = 2
+
+    def __init__(
+        self,
+        path: Path,
+        pages: Dict[str, Dict[str, str]] | None = None,
+        static: Iterable[str] | None = None,
+    ) -> None:
+        """
+        Args:
+            path: The path of the file where the manifest is persisted
+            pages: The recorded entries, keyed by output path relative to the output directory
+            static: The paths of the synced static files, relative to the output directory
+        """
+        self.path = path
+        self.pages = pages if pages is not None else {}
+        self.static = set(static) if static is not None else set()
+
+    @classmethod
+    def load(cls, path: Path) -> "BuildManifest":
+        """Loads a manifest from disk, starting an empty one if it is missing, unreadable or of
+        another format version
+
+        Args:
+            path: The path of the manifest file
+
+        Returns:
+            BuildManifest: The loaded manifest
+
+        """
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return cls(path)
+
+        if not isinstance(data, dict) or data.get("version") != cls.FORMAT_VERSION:
+            return cls(path)
+        pages = data.get("pages")
+        static = data.get("static")
+        return cls(
+            path,
+            pages if isinstance(pages, dict) else None,
+            static if isinstance(static, list) else None,
+        )
+
+    def save(self):
+        """Writes the manifest to disk"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # write to a sibling file first so an interrupted build never leaves a truncated manifest
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {
+                    "version": self.FORMAT_VERSION,
+                    "pages": self.pages,
+                    "static": sorted(self.static),
+                },
+                f,
+                indent=2,
+                sort_keys=True,
+            )
+        tmp_path.replace(self.path)
+
+    def is_current(
+        self,
+        source: Path,
+        dest: Path,
+        source_hash: str,
+        template_hash: str,
+        basepath: str,
+    ) -> bool:
+        """Checks if the page at `dest` was generated from the same inputs
+
+        Args:
+            source: The path of the markdown file, relative to the content directory
+            dest: The path of the generated HTML file
+            source_hash: The current hash of the markdown file
+            template_hash: The current hash of the template
+            basepath: The current base path
+
+        Returns:
+            bool: True if the recorded inputs match, the page was rendered by the current version
+            and block rules of the parser and the output still exists
+
+        """
+        entry = self.pages.get(self.page_key(dest))
+        if entry is None:
+            return False
+        return (
+            entry.get("source") == source.as_posix()
+            and entry.get("source_hash") == source_hash
+            and entry.get("template_hash") == template_hash
+            and entry.get("basepath") == basepath
+            and entry.get("parser_version") == PARSER_VERSION
+            and entry.get("block_rules") == BLOCK_CLASSIFIER.digest()
+            and dest.exists()
+        )
+
+    def record(
+        self,
+        source: Path,
+        dest: Path,
+        source_hash: str,
+        template_hash: str,
+        basepath: str,
+    ):
+        """Records the inputs the page at `dest` was generated from, `source` is relative to the
+        content directory"""
+        self.pages[self.page_key(dest)] = {
+            "source": source.as_posix(),
+            "source_hash": source_hash,
+            "template_hash": template_hash,
+            "basepath": basepath,
+            "parser_version": PARSER_VERSION,
+            "block_rules": BLOCK_CLASSIFIER.digest(),
+        }
+
+    def page_key(self, dest: Path) -> str:
+        """Returns the key of a generated page, its path relative to the output directory"""
+        return Path(os.path.relpath(dest, self.path.parent)).as_posix()
+
+    def forget(self, dest: Path):
+        """Removes the entry of a generated page"""
+        self.pages.pop(self.page_key(dest), None)
+
+    def outputs(self) -> Set[str]:
+        """Returns the keys of the generated pages recorded in the manifest, see `page_key`"""
+        return set(self.pages)
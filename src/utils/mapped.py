@@ -0,0 +1,95 @@
+import io
+import mmap
+from pathlib import Path
+from typing import Iterator, TextIO
+
+# Markdown files at least this large are memory-mapped instead of read through a buffered file
+MMAP_THRESHOLD = 8 << 20
+# The bytes of a mapped file decoded at once
+WINDOW_SIZE = 1 << 20
+
+_can_release = hasattr(mmap.mmap, "madvise") and hasattr(mmap, "MADV_DONTNEED")
+
+
+class MappedFile:
+    """A read-only, memory-mapped markdown file, iterated line by line.
+
+    The file stays in the page cache instead of being copied into a Python string, it is decoded a
+    window at a time as the parser consumes its lines, and the pages already parsed are released.
+    It can be used in place of a text file opened with `open`, the file is decoded as UTF-8 and
+    line breaks are translated the same way.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Args:
+            path: The path of the markdown file, which must not be empty
+
+        Raises:
+            ValueError: If the file is empty, an empty file can't be mapped
+        """
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except BaseException:
+            self._file.close()
+            raise
+        if _can_release:
+            # the parser reads the file once from start to end
+            self._map.madvise(mmap.MADV_SEQUENTIAL)
+
+    def __iter__(self) -> Iterator[str]:
+        mapped = self._map
+        size = len(mapped)
+        start = 0
+        while start < size:
+            # decode a window ending on a line break, so no character or line is cut in two
+            end = mapped.rfind(b"\n", start, start + WINDOW_SIZE) + 1
+            if start + WINDOW_SIZE >= size:
+                end = size
+            elif end == 0:
+                # a line longer than the window
+                end = mapped.find(b"\n", start + WINDOW_SIZE) + 1 or size
+            window = mapped[start:end].decode("utf-8")
+            # universal newlines, like a file opened in text mode
+            yield from io.StringIO(window, newline=None)
+            start = end
+
+            if _can_release:
+                # the parsed pages are dropped from memory, they are read back from disk if needed
+                mapped.madvise(mmap.MADV_DONTNEED, 0, start - start % mmap.PAGESIZE)
+
+    def read(self) -> str:
+        """Decodes the whole file, for the callers that need it as a single string"""
+        return io.StringIO(self._map[:].decode("utf-8"), newline=None).read()
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self) -> "MappedFile":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"MappedFile(path={self.path!r})"
+
+
+def open_markdown(path: Path, threshold: int = MMAP_THRESHOLD) -> TextIO | MappedFile:
+    """Opens a markdown file for parsing, memory-mapping it if it's large. Either way the file is
+    decoded as UTF-8, whatever the locale, so whether a page builds doesn't depend on its size
+
+    Args:
+        path: The path of the markdown file
+        threshold: The size in bytes from which the file is memory-mapped (default: MMAP_THRESHOLD)
+
+    Returns:
+        TextIO | MappedFile: The open file, both iterate over lines and support `read`
+
+    """
+    if path.stat().st_size >= max(threshold, 1):
+        return MappedFile(path)
+    return open(path, encoding="utf-8")
@@ -0,0 +1,149 @@
+import json
+import os
+import time
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import ContextManager, Dict, Iterator, List, NamedTuple
+
+
+class StageEvent(NamedTuple):
+    """A timed run of a pipeline stage"""
+
+    name: str
+    page: str | None
+    start_ns: int
+    duration_ns: int
+    pid: int
+
+
+class Profiler:
+    """Records the wall time of the pipeline stages, per stage and per page"""
+
+    enabled = True
+
+    def __init__(self) -> None:
+        self.events: List[StageEvent] = []
+
+    @contextmanager
+    def stage(self, name: str, page: str | None = None) -> Iterator[None]:
+        """Times the body of the `with` statement as a run of the stage `name`
+
+        Args:
+            name: The name of the stage, e.g. "parse"
+            page: The source of the page the stage works on, if any
+
+        """
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            self.events.append(StageEvent(name, page, start, duration, os.getpid()))
+
+    def take_events(self) -> List[StageEvent]:
+        """Returns the recorded events and forgets them, used to ship them out of a worker"""
+        events, self.events = self.events, []
+        return events
+
+    def add_events(self, events: List[StageEvent]):
+        """Merges events recorded by another process"""
+        self.events.extend(events)
+
+    def report(self, top: int = 10) -> str:
+        """Builds a per stage breakdown and the list of the slowest pages
+
+        Args:
+            top: The number of slowest pages listed (default: 10)
+
+        Returns:
+            str: The report, ready to be printed
+
+        """
+        totals: Dict[str, int] = defaultdict(int)
+        calls: Dict[str, int] = defaultdict(int)
+        pages: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for event in self.events:
+            totals[event.name] += event.duration_ns
+            calls[event.name] += 1
+            if event.page is not None:
+                pages[event.page][event.name] += event.duration_ns
+
+        lines = ["Stages:"]
+        lines.append(f"  {'stage':<12}{'calls':>8}{'total ms':>12}{'mean ms':>10}")
+        for name, total in sorted(totals.items(), key=lambda item: -item[1]):
+            lines.append(
+                f"  {name:<12}{calls[name]:>8}{total / 1e6:>12.2f}{total / calls[name] / 1e6:>10.3f}"
+            )
+
+        page_stages = sorted({name for stages in pages.values() for name in stages})
+        slowest = sorted(pages.items(), key=lambda item: -sum(item[1].values()))[:top]
+        lines.append(f"Slowest {len(slowest)} page(s):")
+        lines.append(
+            f"  {'total ms':>10}"
+            + "".join(f"{name + ' ms':>12}" for name in page_stages)
+            + "  page"
+        )
+        for page, stages in slowest:
+            lines.append(
+                f"  {sum(stages.values()) / 1e6:>10.2f}"
+                + "".join(f"{stages.get(name, 0) / 1e6:>12.2f}" for name in page_stages)
+                + f"  {page}"
+            )
+
+        return "\n".join(lines)
+
+    def write_trace(self, path: Path):
+        """Writes the events in the Chrome trace event format (chrome://tracing, Perfetto)
+
+        Args:
+            path: The path of the JSON file
+
+        """
+        trace_events = [
+            {
+                "name": event.name,
+                "cat": "build",
+                "ph": "X",
+                "ts": event.start_ns / 1000,
+                "dur": event.duration_ns / 1000,
+                "pid": event.pid,
+                "tid": event.pid,
+                "args": {"page": event.page} if event.page is not None else {},
+            }
+            for event in self.events
+        ]
+        with open(path, "w") as f:
+            json.dump({"traceEvents": trace_events}, f)
+
+
+class NullProfiler:
+    """The profiler used when profiling is off, its stages are a shared no-op context manager"""
+
+    enabled = False
+
+    def __init__(self) -> None:
+        self._stage = nullcontext()
+
+    def stage(self, name: str, page: str | None = None) -> ContextManager[None]:
+        return self._stage
+
+    def take_events(self) -> List[StageEvent]:
+        return []
+
+    def add_events(self, events: List[StageEvent]):
+        pass
+
+
+_profiler: Profiler | NullProfiler = NullProfiler()
+
+
+def get_profiler() -> Profiler | NullProfiler:
+    """Returns the profiler of the current process"""
+    return _profiler
+
+
+def set_profiler(profiler: Profiler | NullProfiler):
+    """Replaces the profiler of the current process"""
+    global _profiler
+    _profiler = profiler
@@ -0,0 +1,298 @@
+import mimetypes
+import threading
+import time
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from pathlib import Path
+from typing import Tuple
+
+from .fs import write_page
+from .mapped import open_markdown
+from .template import Template
+from .watch import TreeSnapshot
+
+# The endpoint the browser listens on for reload notifications (server-sent events)
+LIVE_RELOAD_PATH = "/__livereload"
+LIVE_RELOAD_SCRIPT = (
+    "<script>"
+    f'new EventSource("{LIVE_RELOAD_PATH}").onmessage = () => location.reload();'
+    "</script>"
+)
+
+
+class PageCache:
+    """A thread safe LRU cache of rendered pages.
+
+    Each entry remembers the modification time of its source and the version of the template it
+    was rendered with, a page whose source or template changed since is rendered again.
+    """
+
+    def __init__(self, max_pages: int = 128) -> None:
+        """
+        Args:
+            max_pages: The number of rendered pages kept in memory (default: 128)
+        """
+        self.max_pages = max_pages
+        self.pages: OrderedDict[Path, Tuple[int, int, bytes]] = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, source: Path, mtime: int, template_version: int) -> bytes | None:
+        with self.lock:
+            entry = self.pages.get(source)
+            if entry is None or entry[:2] != (mtime, template_version):
+                return None
+            self.pages.move_to_end(source)
+            return entry[2]
+
+    def put(self, source: Path, mtime: int, template_version: int, html: bytes):
+        with self.lock:
+            self.pages[source] = (mtime, template_version, html)
+            self.pages.move_to_end(source)
+            while len(self.pages) > self.max_pages:
+                self.pages.popitem(last=False)
+
+
+class DevServer(ThreadingHTTPServer):
+    """A development server that renders pages on demand and reloads the browser on changes.
+
+    Pages are rendered from the markdown content when requested and static files are served
+    straight from the static directory, nothing is written to disk. Startup doesn't walk the site,
+    so the first page is served as fast on a large site as on a small one.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        source: Path,
+        template_path: Path,
+        statics: Path,
+        basepath: str = "/",
+        cache_size: int = 128,
+    ) -> None:
+        """
+        Args:
+            address: The (host, port) tuple to listen on
+            source: Path to the markdown content
+            template_path: Path to the template file
+            statics: Path to the static files directory
+            basepath: The base path for relative URLs (default: "/")
+            cache_size: The number of rendered pages kept in memory (default: 128)
+        """
+        super().__init__(address, DevRequestHandler)
+        self.source = source.resolve()
+        self.template_path = template_path
+        self.statics = statics.resolve()
+        self.basepath = basepath
+        self.cache = PageCache(cache_size)
+
+        self.template = Template.load(template_path, basepath)
+        self.template_version = 0
+        self.template_lock = threading.Lock()
+
+        # bumped on every change, the reload streams wait on it
+        self.change_version = 0
+        self.changed = threading.Condition()
+
+    def resolve(self, url_path: str) -> Tuple[Path, bool] | None:
+        """Maps a request path to a markdown source or a static file
+
+        Args:
+            url_path: The path of the request, without query string
+
+        Returns:
+            Tuple[Path, bool] | None: The file and whether it's a page to render, or None if the
+            path doesn't match any file
+
+        """
+        if self.basepath != "/" and url_path.startswith(self.basepath):
+            url_path = "/" + url_path[len(self.basepath) :]
+        relative = url_path.lstrip("/")
+
+        if relative == "" or relative.endswith("/"):
+            candidates = [relative + "index.md"]
+        elif relative.endswith(".html"):
+            candidates = [relative[: -len(".html")] + ".md"]
+        else:
+            candidates = [relative + "/index.md"]
+
+        for candidate in candidates:
+            page = _inside(self.source, candidate)
+            if page is not None and page.is_file():
+                return page, True
+
+        static = _inside(self.statics, relative)
+        if static is not None and static.is_file():
+            return static, False
+        return None
+
+    def render(self, source: Path) -> bytes:
+        """Renders a page, reusing the cached HTML while its source and the template are unchanged
+
+        Args:
+            source: The path of the markdown file
+
+        Returns:
+            bytes: The HTML of the page, with the live reload script
+
+        """
+        mtime = source.stat().st_mtime_ns
+        with self.template_lock:
+            template, template_version = self.template, self.template_version
+
+        html = self.cache.get(source, mtime, template_version)
+        if html is not None:
+            return html
+
+        buffer = StringIO()
+        with open_markdown(source) as f:
+            write_page(f, template, buffer)
+        buffer.write(LIVE_RELOAD_SCRIPT)
+
+        html = buffer.getvalue().encode()
+        self.cache.put(source, mtime, template_version, html)
+        return html
+
+    def watch(self, interval: float = 0.25):
+        """Polls the sources for changes and notifies the browsers, runs in a background thread
+
+        Args:
+            interval: The seconds to wait between polls (default: 0.25)
+
+        """
+        self.snapshot()
+        while True:
+            time.sleep(interval)
+            self.poll()
+
+    def snapshot(self):
+        """Records the current state of the sources, the next poll reports the changes since"""
+        self.content_snapshot = TreeSnapshot(self.source)
+        self.static_snapshot = TreeSnapshot(self.statics)
+        self.template_mtime = self.template_path.stat().st_mtime_ns
+
+    def poll(self) -> bool:
+        """Reloads the template if it changed and notifies the browsers of any change since the
+        last poll
+
+        Returns:
+            bool: True if anything changed
+
+        """
+        # both snapshots are updated on every poll
+        content_changes = self.content_snapshot.changes()
+        static_changes = self.static_snapshot.changes()
+        changed = any(content_changes) or any(static_changes)
+
+        try:
+            mtime = self.template_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = self.template_mtime
+        if mtime != self.template_mtime:
+            self.template_mtime = mtime
+            try:
+                template = Template.load(self.template_path, self.basepath)
+            except Exception as e:
+                # e.g. saved half-written, the watch goes on and the next save loads it again
+                print(f"Could not reload {self.template_path}: {type(e).__name__}: {e}")
+            else:
+                with self.template_lock:
+                    self.template = template
+                    self.template_version += 1
+                changed = True
+
+        if changed:
+            with self.changed:
+                self.change_version += 1
+                self.changed.notify_all()
+        return changed
+
+    def serve(self):
+        """Starts watching the sources and serves until interrupted"""
+        threading.Thread(target=self.watch, daemon=True).start()
+        host, port = self.server_address[:2]
+        print(f"Serving {self.source} on http://{host}:{port}{self.basepath}")
+        try:
+            self.serve_forever()
+        except KeyboardInterrupt:
+            print("Stopped serving")
+        finally:
+            self.server_close()
+
+
+class DevRequestHandler(BaseHTTPRequestHandler):
+    server: DevServer
+
+    def do_GET(self):
+        url_path = self.path.split("?", 1)[0]
+        if url_path == LIVE_RELOAD_PATH:
+            self._stream_changes()
+            return
+
+        resolved = self.server.resolve(url_path)
+        if resolved is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        path, is_page = resolved
+        if is_page and not url_path.endswith((".html", "/")):
+            # relative links of the page resolve against its directory
+            self.send_response(HTTPStatus.MOVED_PERMANENTLY)
+            self.send_header("Location", url_path + "/")
+            self.end_headers()
+            return
+
+        try:
+            if is_page:
+                body = self.server.render(path)
+                content_type = "text/html; charset=utf-8"
+            else:
+                body = path.read_bytes()
+                content_type = mimetypes.guess_type(path.name)[0]
+        except Exception as e:
+            self.send_error(
+                HTTPStatus.INTERNAL_SERVER_ERROR, f"{type(e).__name__}: {e}"
+            )
+            return
+
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", content_type or "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream_changes(self):
+        """Keeps the connection open and sends an event every time a source changes"""
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        server = self.server
+        with server.changed:
+            seen = server.change_version
+        try:
+            while True:
+                with server.changed:
+                    server.changed.wait_for(lambda: server.change_version != seen, 15)
+                    version = server.change_version
+                if version == seen:
+                    # keeps the connection alive and detects closed tabs
+                    self.wfile.write(b": ping\n\n")
+                else:
+                    seen = version
+                    self.wfile.write(b"data: reload\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def _inside(root: Path, relative: str) -> Path | None:
+    """Joins a request path to a root directory, refusing paths that escape it"""
+    path = (root / relative).resolve()
+    if path != root and root not in path.parents:
+        return None
+    return path
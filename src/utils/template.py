@@ -0,0 +1,114 @@
+import re
+from io import StringIO
+from pathlib import Path
+from typing import Iterable, List, TextIO
+
+# Matches a template placeholder, e.g. "{{ Title }}"
+SLOT_PATTERN = re.compile(r"\{\{ (?P<name>\w+) \}\}")
+
+
+def rewrite_urls(html: str, basepath: str) -> str:
+    """Updates the root relative URLs of an HTML string to use the basepath
+
+    Args:
+        html: The HTML to be processed
+        basepath: The base path for relative URLs
+
+    Returns:
+        str: The HTML with every `href="/` and `src="/` pointing to the basepath
+
+    """
+    if basepath == "/":
+        # nothing to rewrite, avoid scanning the string
+        return html
+    html = html.replace('href="/', f'href="{basepath}')
+    return html.replace('src="/', f'src="{basepath}')
+
+
+class Template:
+    """A page template compiled once per build.
+
+    The template is split into static segments and named slots (e.g. `{{ Title }}`) at load time
+    and the URLs of the static segments are already rewritten to use the basepath, so rendering a
+    page only rewrites the slot values and joins the pieces once.
+    """
+
+    def __init__(self, source: str, basepath: str = "/", path: Path | None = None) -> None:
+        """
+        Args:
+            source: The raw HTML of the template
+            basepath: The base path for relative URLs (default: "/")
+            path: The path the template was loaded from, if any
+        """
+        self.basepath = basepath
+        self.path = path
+        # segments[i] is followed by the slot slots[i], the last segment has no slot after it
+        self.segments: List[str] = []
+        self.slots: List[str] = []
+
+        cursor = 0
+        for match in SLOT_PATTERN.finditer(source):
+            self.segments.append(rewrite_urls(source[cursor : match.start()], basepath))
+            self.slots.append(match.group("name"))
+            cursor = match.end()
+        self.segments.append(rewrite_urls(source[cursor:], basepath))
+        self.repeated_slots = {slot for slot in self.slots if self.slots.count(slot) > 1}
+
+    @classmethod
+    def load(cls, path: Path, basepath: str = "/") -> "Template":
+        """Reads and compiles a template file
+
+        Args:
+            path: The path of the HTML template file
+            basepath: The base path for relative URLs (default: "/")
+
+        Returns:
+            Template: The compiled template
+
+        """
+        with open(path) as f:
+            return cls(f.read(), basepath, path)
+
+    def render(self, **values: str) -> str:
+        """Fills the slots of the template into a string, see `write`
+
+        Args:
+            values: The value of each slot, keyed by slot name. Slots without a value are kept as is
+
+        Returns:
+            str: The rendered HTML
+
+        """
+        buffer = StringIO()
+        self.write(buffer, **values)
+        return buffer.getvalue()
+
+    def write(self, out: TextIO, **values: str | Iterable[str]):
+        """Writes the filled template into `out` without building the whole page in memory
+
+        Args:
+            out: The file-like object the HTML is written into
+            values: The value of each slot, keyed by slot name. A value can be a string or an
+                iterable of HTML fragments, which are written as they are produced. Slots without
+                a value are kept as is
+
+        """
+        basepath = self.basepath
+        # a stream can only be consumed once, keep its fragments if the slot is used again
+        for slot in self.repeated_slots:
+            if slot in values and not isinstance(values[slot], str):
+                values[slot] = list(values[slot])
+
+        for segment, slot in zip(self.segments, self.slots):
+            out.write(segment)
+            value = values.get(slot)
+            if value is None:
+                out.write(f"{{{{ {slot} }}}}")
+            elif isinstance(value, str):
+                out.write(rewrite_urls(value, basepath))
+            else:
+                out.writelines(rewrite_urls(fragment, basepath) for fragment in value)
+        out.write(self.segments[-1])
+
+    def __repr__(self) -> str:
+        return f"Template(path={self.path!r}, basepath={self.basepath!r}, slots={self.slots!r})"
@@ -0,0 +1,123 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from markdown.block_parser import BLOCK_CLASSIFIER
+from utils.cache import RenderCache
+from utils.fs import generate_page_recursive
+
+TEMPLATE = '<title>{{ Title }}</title><main>{{ Content }}</main><a href="/">home</a>'
+
+
+class TestRenderCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = RenderCache(Path(self.tmp.name) / "cache")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_depends_on_markdown_and_parser_version(self):
+        key = RenderCache.key("# Title")
+        self.assertEqual(key, RenderCache.key("# Title"))
+        self.assertNotEqual(key, RenderCache.key("# Other"))
+        with mock.patch("utils.cache.PARSER_VERSION", "next"):
+            self.assertNotEqual(key, RenderCache.key("# Title"))
+
+    def test_key_depends_on_block_rules(self):
+        def rule(block):
+            return None
+
+        key = RenderCache.key("# Title")
+        BLOCK_CLASSIFIER.register("!", rule)
+        self.addCleanup(BLOCK_CLASSIFIER.unregister, rule)
+        self.assertNotEqual(RenderCache.key("# Title"), key)
+
+    def test_put_and_get_round_trip(self):
+        key = RenderCache.key("# Title")
+        self.assertIsNone(self.cache.get(key))
+        self.cache.put(key, {"title": "Title"}, "<div>\n<h1>Title</h1></div>")
+        self.assertEqual(
+            self.cache.get(key), ({"title": "Title"}, "<div>\n<h1>Title</h1></div>")
+        )
+
+    def test_read_only_cache_hits(self):
+        key = RenderCache.key("# Title")
+        self.cache.put(key, {"title": "Title"}, "<div></div>")
+        with mock.patch("utils.cache.os.utime", side_effect=PermissionError):
+            self.assertEqual(self.cache.get(key), ({"title": "Title"}, "<div></div>"))
+
+    def test_corrupt_entry_is_a_miss(self):
+        key = RenderCache.key("# Title")
+        self.cache.put(key, {"title": "Title"}, "<div></div>")
+        path = self.cache.directory / key[:2] / key[2:]
+        path.write_text("{not json\n<div></div>")
+        self.assertIsNone(self.cache.get(key))
+
+    def test_evict_removes_least_recently_used(self):
+        keys = [RenderCache.key(str(i)) for i in range(3)]
+        for index, key in enumerate(keys):
+            self.cache.put(key, {"title": str(index)}, "x" * 100)
+            path = self.cache.directory / key[:2] / key[2:]
+            os.utime(path, ns=(index * 10**9, index * 10**9))
+        # reading the oldest entry makes it the most recently used
+        self.cache.get(keys[0])
+
+        size = (self.cache.directory / keys[0][:2] / keys[0][2:]).stat().st_size
+        self.cache.max_bytes = size * 2
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertIsNotNone(self.cache.get(keys[0]))
+        self.assertIsNone(self.cache.get(keys[1]))
+        self.assertIsNotNone(self.cache.get(keys[2]))
+
+
+class TestCachedBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.content = root / "content"
+        self.template = root / "template.html"
+        self.cache = RenderCache(root / "cache")
+        (self.content / "blog").mkdir(parents=True)
+        self.template.write_text(TEMPLATE)
+        (self.content / "index.md").write_text("# Home\n\nSee [the blog](/blog/post.html)")
+        (self.content / "blog" / "post.md").write_text("# Post\n\nSome **bold** text")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, name: str, basepath: str = "/", cache: RenderCache | None = None):
+        output = Path(self.tmp.name) / name
+        output.mkdir()
+        generate_page_recursive(self.content, self.template, output, basepath, cache=cache)
+        return {
+            path.relative_to(output).as_posix(): path.read_text()
+            for path in output.rglob("*.html")
+        }
+
+    def test_cached_build_matches_uncached_build(self):
+        expected = self.build("uncached", "/docs/")
+        self.assertEqual(self.build("cold", "/docs/", self.cache), expected)
+        with mock.patch("utils.fs.iter_page_html") as parse:
+            self.assertEqual(self.build("warm", "/docs/", self.cache), expected)
+        parse.assert_not_called()
+
+    def test_entries_are_shared_across_basepaths(self):
+        self.build("root", "/", self.cache)
+        expected = self.build("uncached", "/docs/")
+        with mock.patch("utils.fs.iter_page_html") as parse:
+            self.assertEqual(self.build("docs", "/docs/", self.cache), expected)
+        parse.assert_not_called()
+
+    def test_changed_page_is_rendered_again(self):
+        self.build("cold", cache=self.cache)
+        (self.content / "index.md").write_text("# Welcome")
+        pages = self.build("warm", cache=self.cache)
+        self.assertIn("<title>Welcome</title>", pages["index.html"])
+        self.assertIn("<title>Post</title>", pages["blog/post.html"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,151 @@
+import json
+import os
+import socket
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from typing import List
+
+from utils.daemon import BuildDaemon, SiteCache
+from utils.fs import discover_pages
+
+
+def touch(path: Path, text: str):
+    """Writes a file with a modification time one second later than the current one"""
+    mtime = path.stat().st_mtime_ns if path.exists() else 0
+    path.write_text(text)
+    os.utime(path, ns=(mtime + 10**9, mtime + 10**9))
+
+
+class TestSiteCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.content = self.root / "content"
+        (self.content / "blog").mkdir(parents=True)
+        (self.content / "index.md").write_text("# Home")
+        (self.content / "blog" / "post.md").write_text("# Post")
+        self.template = self.root / "template.html"
+        self.template.write_text("<title>{{ Title }}</title>{{ Content }}")
+        self.site = SiteCache()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_pages_as_discover_pages(self):
+        output = self.root / "public"
+        self.assertEqual(
+            self.site.pages(self.content, output),
+            sorted(discover_pages(self.content, output)),
+        )
+
+    def test_pages_follow_changes(self):
+        output = self.root / "public"
+        self.site.pages(self.content, output)
+        (self.content / "blog" / "post.md").unlink()
+        touch(self.content / "about.md", "# About")
+        os.utime(self.content, ns=(0, 0))
+        os.utime(self.content / "blog", ns=(0, 0))
+
+        pages = self.site.pages(self.content, output)
+        self.assertEqual(pages, sorted(discover_pages(self.content, output)))
+        self.assertIn((self.content / "about.md", output / "about.html"), pages)
+
+    def test_missing_content(self):
+        self.assertIsNone(self.site.pages(self.root / "missing", self.root / "public"))
+
+    def test_template_compiled_once(self):
+        template = self.site.template(self.template, "/base/")
+        self.assertIs(self.site.template(self.template, "/base/"), template)
+        self.assertIsNot(self.site.template(self.template, "/"), template)
+
+        touch(self.template, "<h1>{{ Title }}</h1>")
+        reloaded = self.site.template(self.template, "/base/")
+        self.assertIsNotNone(reloaded)
+        self.assertIsNot(reloaded, template)
+        self.assertEqual(reloaded.render(Title="Home", Content=""), "<h1>Home</h1>")
+
+    def test_missing_template(self):
+        self.assertIsNone(self.site.template(self.root / "missing.html"))
+
+
+class TestBuildDaemon(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.socket_path = self.root / "daemon.sock"
+        self.builds: List[List[str]] = []
+        self.daemon = BuildDaemon(self.socket_path, self.build)
+        self.thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        self.thread.start()
+
+    def tearDown(self):
+        if not self.daemon.stopped:
+            self.send({"stop": True})
+        self.thread.join()
+        self.tmp.cleanup()
+
+    def build(self, argv: List[str], site: SiteCache):
+        self.assertIs(site, self.daemon.site)
+        self.builds.append(argv)
+        print(f"Building in {Path.cwd()}")
+        if argv == ["fail"]:
+            raise SystemExit("Build failed")
+        if argv == ["crash"]:
+            raise RuntimeError("crashed")
+
+    def send(self, request: dict) -> List[dict]:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(self.socket_path))
+            with client.makefile("rwb") as stream:
+                stream.write(json.dumps(request).encode() + b"\n")
+                stream.flush()
+                return [json.loads(line) for line in stream]
+
+    def test_build(self):
+        messages = self.send({"argv": ["/base/"], "cwd": str(self.root)})
+        self.assertEqual(
+            messages, [{"stdout": f"Building in {self.root.resolve()}\n"}, {"exit": 0}]
+        )
+        self.assertEqual(self.builds, [["/base/"]])
+        # the daemon goes back to its own working directory
+        self.assertNotEqual(Path.cwd(), self.root.resolve())
+
+    def test_failed_build(self):
+        messages = self.send({"argv": ["fail"], "cwd": str(self.root)})
+        self.assertEqual(messages[-2:], [{"stderr": "Build failed\n"}, {"exit": 1}])
+
+        messages = self.send({"argv": ["crash"], "cwd": str(self.root)})
+        stderr = "".join(message.get("stderr", "") for message in messages)
+        self.assertIn("RuntimeError: crashed", stderr)
+        self.assertEqual(messages[-1], {"exit": 1})
+
+    def test_invalid_request(self):
+        messages = self.send({"cwd": str(self.root)})
+        self.assertEqual(messages[-1], {"exit": 2})
+        self.assertEqual(self.builds, [])
+
+    def test_stop(self):
+        self.assertEqual(self.send({"stop": True}), [{"exit": 0}])
+        self.thread.join()
+        self.assertFalse(self.socket_path.exists())
+
+    def test_already_listening(self):
+        with self.assertRaises(ValueError):
+            BuildDaemon(self.socket_path, self.build)
+
+    def test_stale_socket(self):
+        self.send({"stop": True})
+        self.thread.join()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+            stale.bind(str(self.socket_path))
+
+        self.daemon = BuildDaemon(self.socket_path, self.build)
+        self.thread = threading.Thread(target=self.daemon.serve, daemon=True)
+        self.thread.start()
+        self.assertEqual(self.send({"argv": [], "cwd": str(self.root)})[-1], {"exit": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,226 @@
+import contextlib
+import os
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from markdown import InlineCache, set_inline_cache
+from utils.fs import (
+    BuildError,
+    discover_pages,
+    generate_page_recursive,
+    is_unchanged,
+    mirror_directories,
+    render_pages,
+    write_page,
+)
+from utils.manifest import BuildManifest
+from utils.template import Template
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css"><main>{{ Content }}</main>'
+
+
+class TestGeneratePageRecursive(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        self.content = self.root / "content"
+        self.template = self.root / "template.html"
+        self.template.write_text(TEMPLATE)
+        for i in range(8):
+            page_dir = self.content / f"post{i}"
+            page_dir.mkdir(parents=True)
+            (page_dir / "index.md").write_text(
+                f"# Post {i}\n\nSome **bold** [link](/post{i}) text\n\n* item"
+            )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, name: str, jobs: int, io_concurrency: int = 0) -> Path:
+        output = self.root / name
+        output.mkdir()
+        generate_page_recursive(
+            self.content,
+            self.template,
+            output,
+            "/base/",
+            jobs=jobs,
+            io_concurrency=io_concurrency,
+        )
+        return output
+
+    def test_discover_pages(self):
+        pages = discover_pages(self.content, self.root / "public")
+        self.assertEqual(len(pages), 8)
+        for from_path, dest_path in pages:
+            relative = from_path.relative_to(self.content).with_suffix(".html")
+            self.assertEqual(dest_path, self.root / "public" / relative)
+
+    def test_parallel_build_matches_serial_build(self):
+        serial = self.build("serial", jobs=1)
+        parallel = self.build("parallel", jobs=4)
+        for from_path, dest_path in discover_pages(self.content, serial):
+            relative = dest_path.relative_to(serial)
+            self.assertEqual(dest_path.read_bytes(), (parallel / relative).read_bytes())
+
+    def test_async_build_matches_serial_build(self):
+        serial = self.build("serial", jobs=1)
+        for jobs in (1, 2):
+            concurrent = self.build(f"async{jobs}", jobs=jobs, io_concurrency=3)
+            for from_path, dest_path in discover_pages(self.content, serial):
+                relative = dest_path.relative_to(serial)
+                self.assertEqual(dest_path.read_bytes(), (concurrent / relative).read_bytes())
+
+    def test_inline_cache_build_matches_uncached_build(self):
+        uncached = self.build("uncached", jobs=1)
+        cache = InlineCache()
+        set_inline_cache(cache)
+        self.addCleanup(set_inline_cache, None)
+        for jobs, io_concurrency in ((1, 0), (2, 0), (2, 3)):
+            cached = self.build(f"cached{jobs}-{io_concurrency}", jobs, io_concurrency)
+            for from_path, dest_path in discover_pages(self.content, uncached):
+                relative = dest_path.relative_to(uncached)
+                self.assertEqual(dest_path.read_bytes(), (cached / relative).read_bytes())
+        # the lookups of the worker processes are merged into the cache of the build
+        stats = cache.stats()
+        self.assertGreater(stats.hits, 0)
+        self.assertEqual(stats.hits + stats.misses, 3 * 8 * 3)
+
+    def test_progress_is_printed_by_the_parent(self):
+        pages = discover_pages(self.content, self.root / "public")
+        template = Template(TEMPLATE)
+        for jobs, io_concurrency in ((1, 0), (2, 0), (2, 3)):
+            with self.subTest(jobs=jobs, io_concurrency=io_concurrency):
+                out = StringIO()
+                with contextlib.redirect_stdout(out):
+                    render_pages(pages, template, jobs, io_concurrency=io_concurrency)
+                # a line printed by a worker process would be missing from `out`
+                self.assertEqual(
+                    sorted(out.getvalue().splitlines()),
+                    sorted(
+                        f"Generating page from {from_path} to {dest_path} using None"
+                        for from_path, dest_path in pages
+                    ),
+                )
+
+    def test_async_failures_are_collected(self):
+        (self.content / "post2" / "index.md").write_text("no title")
+        with self.assertRaises(BuildError) as context:
+            self.build("public", jobs=1, io_concurrency=4)
+        failed = [path.parent.name for path, _ in context.exception.failures]
+        self.assertEqual(failed, ["post2"])
+        self.assertFalse((self.root / "public" / "post2" / "index.html").exists())
+        self.assertTrue((self.root / "public" / "post3" / "index.html").exists())
+
+    def test_failures_are_collected(self):
+        (self.content / "post1" / "index.md").write_text("no title")
+        (self.content / "post5" / "index.md").write_text("no title either")
+        with self.assertRaises(BuildError) as context:
+            self.build("public", jobs=2)
+        failed = sorted(path.parent.name for path, _ in context.exception.failures)
+        self.assertEqual(failed, ["post1", "post5"])
+        # the other pages were still generated
+        self.assertTrue((self.root / "public" / "post0" / "index.html").exists())
+
+
+class TestWritePage(unittest.TestCase):
+    def test_metadata_slots(self):
+        template = Template("<title>{{ Title }}</title><nav>{{ Outline }}</nav>{{ WordCount }}")
+        out = StringIO()
+        write_page("# Title\n\n## Part\n\nthree more words", template, out)
+        self.assertEqual(
+            out.getvalue(),
+            "<title>Title</title><nav><ul><li>Title<ul><li>Part</li></ul></li></ul></nav>5",
+        )
+
+    def test_missing_title(self):
+        with self.assertRaises(ValueError):
+            write_page("## Part", Template("{{ Title }}"), StringIO())
+
+    def test_title_followed_by_text(self):
+        out = StringIO()
+        write_page("# Title\nSome text\n\nMore", Template("<title>{{ Title }}</title>"), out)
+        self.assertEqual(out.getvalue(), "<title>Title</title>")
+
+    def test_spooled_page_matches_in_memory_page(self):
+        markdown = "".join(
+            f"## Part {i}\n\n[link](/page{i}.html) and ![img](/img{i}.png)\n\n" for i in range(50)
+        )
+        markdown = "```\ncode\n\nwith a blank line\n```\n\n# Title\n\n" + markdown
+        template = Template('{{ Title }}<a href="/">{{ Content }}</a>', "/base/")
+
+        expected = StringIO()
+        write_page(markdown, template, expected)
+        # a tiny spool forces the content to a temporary file
+        with mock.patch("utils.fs.SPOOL_SIZE", 64):
+            out = StringIO()
+            write_page(StringIO(markdown), template, out)
+        self.assertEqual(out.getvalue(), expected.getvalue())
+        self.assertIn("<pre><code>code\n\nwith a blank line</code></pre>", out.getvalue())
+        self.assertIn('<a href="/base/page49.html">', out.getvalue())
+
+
+class TestMirrorDirectories(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.static = root / "static"
+        self.output = root / "public"
+        (self.static / "images").mkdir(parents=True)
+        self.output.mkdir()
+        (self.static / "index.css").write_text("body {}")
+        (self.static / "images" / "logo.png").write_bytes(b"png")
+        self.manifest = BuildManifest(self.output / BuildManifest.FILENAME)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_copies_files_and_records_them(self):
+        mirror_directories(self.static, self.output, self.manifest)
+        self.assertEqual((self.output / "index.css").read_text(), "body {}")
+        self.assertEqual((self.output / "images" / "logo.png").read_bytes(), b"png")
+        self.assertEqual(self.manifest.static, {"index.css", "images/logo.png"})
+
+    def test_unchanged_files_are_not_copied(self):
+        mirror_directories(self.static, self.output, self.manifest)
+        copy = self.output / "index.css"
+        before = copy.stat().st_ino
+        mirror_directories(self.static, self.output, self.manifest)
+        self.assertEqual(copy.stat().st_ino, before)
+
+    def test_changed_files_are_copied(self):
+        mirror_directories(self.static, self.output, self.manifest)
+        (self.static / "index.css").write_text("body { margin: 0 }")
+        mirror_directories(self.static, self.output, self.manifest)
+        self.assertEqual((self.output / "index.css").read_text(), "body { margin: 0 }")
+
+    def test_removed_files_are_pruned_and_pages_kept(self):
+        page = self.output / "index.html"
+        page.write_text("<p>generated</p>")
+        mirror_directories(self.static, self.output, self.manifest)
+        (self.static / "images" / "logo.png").unlink()
+        mirror_directories(self.static, self.output, self.manifest)
+        self.assertFalse((self.output / "images").exists())
+        self.assertTrue(page.exists())
+
+    def test_checksum_detects_same_size_changes(self):
+        mirror_directories(self.static, self.output, self.manifest)
+        source = self.static / "index.css"
+        copy = self.output / "index.css"
+        source.write_text("body []")
+        stat = copy.stat()
+        os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        self.assertTrue(is_unchanged(source, copy))
+        self.assertFalse(is_unchanged(source, copy, checksum=True))
+
+    def test_link(self):
+        mirror_directories(self.static, self.output, self.manifest, link=True)
+        source = self.static / "index.css"
+        self.assertEqual(source.stat().st_ino, (self.output / "index.css").stat().st_ino)
+
+
+if __name__ == "__main__":
+    unittest.main()
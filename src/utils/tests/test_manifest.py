@@ -0,0 +1,160 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from markdown.block_parser import BLOCK_CLASSIFIER
+from utils.fs import generate_page_recursive
+from utils import manifest as manifest_module
+from utils.manifest import BuildManifest, file_digest
+
+TEMPLATE = "<title>{{ Title }}</title><main>{{ Content }}</main>"
+
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_load_missing_manifest_is_empty(self):
+        manifest = BuildManifest.load(self.root / BuildManifest.FILENAME)
+        self.assertEqual(manifest.outputs(), set())
+
+    def test_load_corrupt_manifest_is_empty(self):
+        path = self.root / BuildManifest.FILENAME
+        path.write_text("{not json")
+        manifest = BuildManifest.load(path)
+        self.assertEqual(manifest.outputs(), set())
+
+    def test_save_and_load_round_trip(self):
+        path = self.root / BuildManifest.FILENAME
+        dest = self.root / "index.html"
+        dest.write_text("")
+        manifest = BuildManifest(path)
+        manifest.record(Path("index.md"), dest, "a", "b", "/")
+        manifest.static = {"index.css", "images/logo.png"}
+        manifest.save()
+
+        loaded = BuildManifest.load(path)
+        self.assertEqual(loaded.static, {"index.css", "images/logo.png"})
+        self.assertTrue(loaded.is_current(Path("index.md"), dest, "a", "b", "/"))
+        self.assertFalse(loaded.is_current(Path("index.md"), dest, "a", "b", "/docs/"))
+        self.assertFalse(loaded.is_current(Path("index.md"), dest, "c", "b", "/"))
+
+    def test_is_current_requires_output(self):
+        dest = self.root / "index.html"
+        manifest = BuildManifest(self.root / BuildManifest.FILENAME)
+        manifest.record(Path("index.md"), dest, "a", "b", "/")
+        self.assertFalse(manifest.is_current(Path("index.md"), dest, "a", "b", "/"))
+
+
+class TestIncrementalBuild(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = self.root = Path(self.tmp.name)
+        self.content = root / "content"
+        self.output = root / "public"
+        self.template = root / "template.html"
+        (self.content / "blog").mkdir(parents=True)
+        self.output.mkdir()
+        self.template.write_text(TEMPLATE)
+        (self.content / "index.md").write_text("# Home\n\nhello")
+        (self.content / "blog" / "post.md").write_text("# Post\n\nworld")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def build(self, content: Path | None = None, output: Path | None = None):
+        content = content or self.content
+        output = output or self.output
+        manifest = BuildManifest.load(output / BuildManifest.FILENAME)
+        generate_page_recursive(content, self.template, output, manifest=manifest)
+
+    def test_unchanged_pages_are_skipped(self):
+        self.build()
+        page = self.output / "blog" / "post.html"
+        page.write_text("untouched")
+        self.build()
+        self.assertEqual(page.read_text(), "untouched")
+
+    def test_changed_source_is_regenerated(self):
+        self.build()
+        (self.content / "index.md").write_text("# Home\n\nchanged")
+        self.build()
+        self.assertIn("changed", (self.output / "index.html").read_text())
+
+    def test_changed_template_regenerates_every_page(self):
+        self.build()
+        self.template.write_text("<h1>{{ Title }}</h1>{{ Content }}")
+        self.build()
+        self.assertTrue((self.output / "index.html").read_text().startswith("<h1>"))
+        post = (self.output / "blog" / "post.html").read_text()
+        self.assertTrue(post.startswith("<h1>"))
+
+    def test_removed_source_removes_output(self):
+        self.build()
+        (self.content / "blog" / "post.md").unlink()
+        self.build()
+        self.assertFalse((self.output / "blog").exists())
+        self.assertTrue((self.output / "index.html").exists())
+
+    def test_paths_spelled_differently(self):
+        self.build()
+        page = self.output / "blog" / "post.html"
+        page.write_text("untouched")
+
+        cwd = os.getcwd()
+        os.chdir(self.root)
+        try:
+            self.build(Path("content"), Path("public"))
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(page.read_text(), "untouched")
+        self.assertTrue((self.output / "index.html").exists())
+
+    def test_new_parser_version_regenerates_every_page(self):
+        self.build()
+        page = self.output / "index.html"
+        page.write_text("untouched")
+        with mock.patch.object(manifest_module, "PARSER_VERSION", "next"):
+            self.build()
+        self.assertNotEqual(page.read_text(), "untouched")
+
+    def test_new_block_rule_regenerates_every_page(self):
+        def rule(block):
+            return None
+
+        self.build()
+        page = self.output / "index.html"
+        page.write_text("untouched")
+        BLOCK_CLASSIFIER.register("!", rule)
+        self.addCleanup(BLOCK_CLASSIFIER.unregister, rule)
+        self.build()
+        self.assertNotEqual(page.read_text(), "untouched")
+
+    def test_older_manifest_format_rebuilds(self):
+        self.build()
+        page = self.output / "index.html"
+        page.write_text("untouched")
+        manifest_path = self.output / BuildManifest.FILENAME
+        manifest_path.write_text(manifest_path.read_text().replace('"version": 2', '"version": 1'))
+        self.build()
+        self.assertNotEqual(page.read_text(), "untouched")
+
+
+class TestFileDigest(unittest.TestCase):
+    def test_file_digest_changes_with_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "file.md"
+            path.write_text("one")
+            first = file_digest(path)
+            path.write_text("two")
+            self.assertNotEqual(first, file_digest(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
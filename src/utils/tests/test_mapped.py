@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from utils.fs import write_page
+from utils.mapped import MappedFile, open_markdown
+from utils.template import Template
+
+MARKDOWN = (
+    "# Título\r\n\r\nSome **bold** text with ünïcödé\r\n\r\n"
+    + "".join(f"* item {i} → [link](/page{i}.html)\n" for i in range(200))
+    + "\n```\ncode\n\nmore code\n```\n\n"
+    + "a very long paragraph " * 100
+)
+
+
+class TestMappedFile(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp.name) / "page.md"
+        self.path.write_bytes(MARKDOWN.encode())
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_lines_match_text_file(self):
+        with open(self.path, encoding="utf-8") as f:
+            expected = list(f)
+        # small windows cut the file in many places, including inside multi-byte characters
+        for window_size in (7, 64, 1 << 20):
+            with mock.patch("utils.mapped.WINDOW_SIZE", window_size):
+                with MappedFile(self.path) as mapped:
+                    self.assertEqual(list(mapped), expected)
+
+    def test_read_matches_text_file(self):
+        with open(self.path, encoding="utf-8") as f, MappedFile(self.path) as mapped:
+            self.assertEqual(mapped.read(), f.read())
+
+    def test_open_markdown_threshold(self):
+        with open_markdown(self.path) as f:
+            self.assertNotIsInstance(f, MappedFile)
+        with open_markdown(self.path, threshold=0) as f:
+            self.assertIsInstance(f, MappedFile)
+
+    def test_open_markdown_decodes_utf8_on_both_paths(self):
+        with open_markdown(self.path) as f:
+            self.assertEqual(f.encoding, "utf-8")  # type: ignore[reportAttributeAccessIssue]
+            text = f.read()
+        with open_markdown(self.path, threshold=0) as mapped:
+            self.assertEqual(mapped.read(), text)
+        self.assertIn("ünïcödé", text)
+
+    def test_open_markdown_empty_file(self):
+        self.path.write_text("")
+        with open_markdown(self.path, threshold=0) as f:
+            self.assertEqual(f.read(), "")
+
+    def test_write_page_from_mapped_file(self):
+        template = Template('<title>{{ Title }}</title><a href="/">{{ Content }}</a>', "/base/")
+        expected = StringIO()
+        with open(self.path, encoding="utf-8") as f:
+            write_page(f.read(), template, expected)
+
+        out = StringIO()
+        with mock.patch("utils.mapped.WINDOW_SIZE", 64), MappedFile(self.path) as mapped:
+            write_page(mapped, template, out)
+        self.assertEqual(out.getvalue(), expected.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.profiling import NullProfiler, Profiler, StageEvent
+
+
+class TestProfiler(unittest.TestCase):
+    def test_stage_records_an_event(self):
+        profiler = Profiler()
+        with profiler.stage("parse", "index.md"):
+            pass
+        [event] = profiler.events
+        self.assertEqual((event.name, event.page), ("parse", "index.md"))
+        self.assertGreaterEqual(event.duration_ns, 0)
+
+    def test_stage_records_failed_runs(self):
+        profiler = Profiler()
+        with self.assertRaises(ValueError):
+            with profiler.stage("parse"):
+                raise ValueError("boom")
+        self.assertEqual(len(profiler.events), 1)
+
+    def test_take_events(self):
+        profiler = Profiler()
+        with profiler.stage("read"):
+            pass
+        events = profiler.take_events()
+        self.assertEqual(len(events), 1)
+        self.assertEqual(profiler.events, [])
+
+    def test_report(self):
+        profiler = Profiler()
+        profiler.add_events(
+            [
+                StageEvent("parse", "slow.md", 0, 3_000_000, 1),
+                StageEvent("parse", "fast.md", 0, 1_000_000, 1),
+                StageEvent("write", "fast.md", 0, 1_000_000, 1),
+            ]
+        )
+        report = profiler.report(top=1)
+        self.assertIn("parse", report)
+        self.assertIn("slow.md", report)
+        self.assertNotIn("fast.md", report)
+
+    def test_write_trace(self):
+        profiler = Profiler()
+        profiler.add_events([StageEvent("parse", "index.md", 2000, 5000, 42)])
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "trace.json"
+            profiler.write_trace(path)
+            trace = json.loads(path.read_text())
+        expected = {
+            "name": "parse",
+            "cat": "build",
+            "ph": "X",
+            "ts": 2.0,
+            "dur": 5.0,
+            "pid": 42,
+            "tid": 42,
+            "args": {"page": "index.md"},
+        }
+        self.assertEqual(trace, {"traceEvents": [expected]})
+
+
+class TestNullProfiler(unittest.TestCase):
+    def test_records_nothing(self):
+        profiler = NullProfiler()
+        with profiler.stage("parse", "index.md"):
+            pass
+        self.assertEqual(profiler.take_events(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from utils.server import LIVE_RELOAD_SCRIPT, DevServer, PageCache
+from utils.template import Template
+
+
+def touch(path: Path, text: str):
+    """Writes a file and moves its modification time forward, so the change is always detected"""
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestPageCache(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = PageCache()
+        cache.put(Path("a.md"), 1, 0, b"a")
+        self.assertEqual(cache.get(Path("a.md"), 1, 0), b"a")
+        # source or template changed
+        self.assertIsNone(cache.get(Path("a.md"), 2, 0))
+        self.assertIsNone(cache.get(Path("a.md"), 1, 1))
+
+    def test_least_recently_used_is_evicted(self):
+        cache = PageCache(max_pages=2)
+        cache.put(Path("a.md"), 1, 0, b"a")
+        cache.put(Path("b.md"), 1, 0, b"b")
+        cache.get(Path("a.md"), 1, 0)
+        cache.put(Path("c.md"), 1, 0, b"c")
+        self.assertIsNone(cache.get(Path("b.md"), 1, 0))
+        self.assertEqual(cache.get(Path("a.md"), 1, 0), b"a")
+
+
+class TestDevServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.content = root / "content"
+        self.static = root / "static"
+        (self.content / "blog").mkdir(parents=True)
+        self.static.mkdir()
+        template = self.template = root / "template.html"
+        template.write_text('<link href="/index.css"><h1>{{ Title }}</h1>{{ Content }}')
+        (self.content / "index.md").write_text("# Home\n\nhello")
+        (self.content / "blog" / "index.md").write_text("# Blog\n\nposts")
+        (self.static / "index.css").write_text("body {}")
+        self.server = DevServer(
+            ("localhost", 0), self.content, template, self.static, "/docs/"
+        )
+
+    def tearDown(self):
+        self.server.server_close()
+        self.tmp.cleanup()
+
+    def test_resolve_pages(self):
+        index = (self.content / "index.md").resolve()
+        blog = (self.content / "blog" / "index.md").resolve()
+        self.assertEqual(self.server.resolve("/docs/"), (index, True))
+        self.assertEqual(self.server.resolve("/docs/index.html"), (index, True))
+        self.assertEqual(self.server.resolve("/docs/blog/"), (blog, True))
+        self.assertEqual(self.server.resolve("/docs/blog"), (blog, True))
+
+    def test_resolve_static(self):
+        css = (self.static / "index.css").resolve()
+        self.assertEqual(self.server.resolve("/docs/index.css"), (css, False))
+
+    def test_resolve_outside_of_roots(self):
+        self.assertIsNone(self.server.resolve("/docs/../template.html"))
+        self.assertIsNone(self.server.resolve("/docs/missing.html"))
+
+    def test_render(self):
+        html = self.server.render(self.content / "index.md").decode()
+        expected = '<link href="/docs/index.css"><h1>Home</h1><h1>Home</h1>\n<p>hello</p>'
+        self.assertEqual(html, expected + LIVE_RELOAD_SCRIPT)
+
+    def test_render_is_cached_until_the_source_changes(self):
+        page = self.content / "index.md"
+        first = self.server.render(page)
+        self.assertIs(self.server.render(page), first)
+
+    def test_poll_reports_static_and_content_changes_together(self):
+        self.server.snapshot()
+        touch(self.content / "index.md", "# Home\n\nchanged")
+        touch(self.static / "index.css", "body { color: red }")
+        self.assertTrue(self.server.poll())
+        # the static change was consumed by the same poll
+        self.assertFalse(self.server.poll())
+        self.assertEqual(self.server.change_version, 1)
+
+    def test_template_failing_to_load_keeps_watching(self):
+        self.server.snapshot()
+        touch(self.template, "<h1>{{ Title }}</h1>")
+        half_written = UnicodeDecodeError("utf-8", b"\xe2", 0, 1, "unexpected end of data")
+        with (
+            mock.patch.object(Template, "load", side_effect=half_written),
+            contextlib.redirect_stdout(io.StringIO()),
+        ):
+            self.assertFalse(self.server.poll())
+        self.assertEqual(self.server.template_version, 0)
+
+        touch(self.template, "<h2>{{ Title }}</h2>")
+        self.assertTrue(self.server.poll())
+        self.assertEqual(self.server.template_version, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
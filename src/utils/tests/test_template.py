@@ -0,0 +1,78 @@
+import unittest
+from io import StringIO
+
+from utils.template import Template, rewrite_urls
+
+
+class TestRewriteUrls(unittest.TestCase):
+    def test_rewrite_href_and_src(self):
+        html = '<a href="/blog">x</a><img src="/a.png">'
+        expected = '<a href="/docs/blog">x</a><img src="/docs/a.png">'
+        self.assertEqual(rewrite_urls(html, "/docs/"), expected)
+
+    def test_rewrite_root_basepath_is_noop(self):
+        html = '<a href="/blog">x</a>'
+        self.assertEqual(rewrite_urls(html, "/"), html)
+
+    def test_rewrite_ignores_absolute_urls(self):
+        html = '<a href="https://example.com">x</a>'
+        self.assertEqual(rewrite_urls(html, "/docs/"), html)
+
+
+class TestTemplate(unittest.TestCase):
+    def test_template_slots(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        self.assertEqual(template.slots, ["Title", "Content"])
+        self.assertEqual(template.segments, ["<title>", "</title><main>", "</main>"])
+
+    def test_render(self):
+        template = Template("<title>{{ Title }}</title><main>{{ Content }}</main>")
+        result = template.render(Title="Home", Content="<p>hi</p>")
+        self.assertEqual(result, "<title>Home</title><main><p>hi</p></main>")
+
+    def test_render_rewrites_template_and_values(self):
+        template = Template(
+            '<link href="/index.css">{{ Content }}', basepath="/docs/"
+        )
+        result = template.render(Content='<a href="/blog">blog</a>')
+        expected = '<link href="/docs/index.css"><a href="/docs/blog">blog</a>'
+        self.assertEqual(result, expected)
+
+    def test_render_keeps_unknown_slots(self):
+        template = Template("{{ Title }} {{ Author }}")
+        self.assertEqual(template.render(Title="Home"), "Home {{ Author }}")
+
+    def test_render_repeated_slot(self):
+        template = Template("{{ Title }}|{{ Title }}")
+        self.assertEqual(template.render(Title="a"), "a|a")
+
+    def test_template_without_slots(self):
+        template = Template("<p>static</p>")
+        self.assertEqual(template.render(Title="ignored"), "<p>static</p>")
+
+
+class TestTemplateWrite(unittest.TestCase):
+    def test_write_matches_render(self):
+        template = Template(
+            '<link href="/index.css"><h1>{{ Title }}</h1>{{ Content }}', basepath="/docs/"
+        )
+        out = StringIO()
+        fragments = iter(["<p>", '<a href="/blog">blog</a>', "</p>"])
+        template.write(out, Title="Home", Content=fragments)
+        expected = template.render(Title="Home", Content='<p><a href="/blog">blog</a></p>')
+        self.assertEqual(out.getvalue(), expected)
+
+    def test_write_repeated_streamed_slot(self):
+        template = Template("{{ Content }}|{{ Content }}")
+        out = StringIO()
+        template.write(out, Content=iter(["a", "b"]))
+        self.assertEqual(out.getvalue(), "ab|ab")
+
+    def test_write_keeps_unknown_slots(self):
+        out = StringIO()
+        Template("{{ Title }} {{ Author }}").write(out, Title="Home")
+        self.assertEqual(out.getvalue(), "Home {{ Author }}")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from utils.fs import generate_page_recursive
+from utils.watch import SiteWatcher, TreeSnapshot
+
+
+def touch(path: Path, text: str):
+    """Writes a file and moves its modification time forward, so the change is always detected"""
+    path.write_text(text)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+class TestTreeSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "a.md").write_text("a")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_no_changes(self):
+        snapshot = TreeSnapshot(self.root)
+        self.assertEqual(snapshot.changes(), (set(), set()))
+
+    def test_modified_added_and_removed(self):
+        snapshot = TreeSnapshot(self.root)
+        touch(self.root / "a.md", "changed")
+        (self.root / "sub").mkdir()
+        (self.root / "sub" / "b.md").write_text("b")
+        changed, removed = snapshot.changes()
+        self.assertEqual(changed, {self.root / "a.md", self.root / "sub" / "b.md"})
+        self.assertEqual(removed, set())
+
+        (self.root / "sub" / "b.md").unlink()
+        changed, removed = snapshot.changes()
+        self.assertEqual(changed, set())
+        self.assertEqual(removed, {self.root / "sub" / "b.md"})
+
+
+class TestSiteWatcher(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        root = Path(self.tmp.name)
+        self.content = root / "content"
+        self.static = root / "static"
+        self.output = root / "public"
+        self.template = root / "template.html"
+        for directory in (self.content, self.static, self.output):
+            directory.mkdir()
+        self.template.write_text("<title>{{ Title }}</title>{{ Content }}")
+        (self.content / "index.md").write_text("# Home\n\nhello")
+        (self.content / "about.md").write_text("# About\n\nabout")
+        generate_page_recursive(self.content, self.template, self.output)
+        self.watcher = SiteWatcher(self.content, self.template, self.static, self.output)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_poll_without_changes(self):
+        self.assertFalse(self.watcher.poll())
+
+    def test_changed_page_is_the_only_one_rendered(self):
+        (self.output / "about.html").write_text("untouched")
+        touch(self.content / "index.md", "# Home\n\nchanged")
+        self.assertTrue(self.watcher.poll())
+        self.assertIn("changed", (self.output / "index.html").read_text())
+        self.assertEqual((self.output / "about.html").read_text(), "untouched")
+
+    def test_template_change_renders_every_page(self):
+        touch(self.template, "<h1>{{ Title }}</h1>")
+        self.watcher.poll()
+        self.assertEqual((self.output / "index.html").read_text(), "<h1>Home</h1>")
+        self.assertEqual((self.output / "about.html").read_text(), "<h1>About</h1>")
+
+    def test_removed_page(self):
+        (self.content / "about.md").unlink()
+        self.watcher.poll()
+        self.assertFalse((self.output / "about.html").exists())
+
+    def test_static_file_is_copied(self):
+        (self.static / "index.css").write_text("body {}")
+        self.watcher.poll()
+        self.assertEqual((self.output / "index.css").read_text(), "body {}")
+
+    def test_failed_page_keeps_watching(self):
+        touch(self.content / "index.md", "no title")
+        self.assertTrue(self.watcher.poll())
+        touch(self.content / "index.md", "# Fixed\n\nok")
+        self.watcher.poll()
+        self.assertIn("Fixed", (self.output / "index.html").read_text())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,238 @@
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Set, Tuple
+
+from markdown import get_inline_cache
+
+from .fs import copy_file, remove_output, render_pages
+from .manifest import BuildManifest, file_digest
+from .template import Template
+
+
+class TreeSnapshot:
+    """The modification times of the files of a directory tree.
+
+    Checking for changes stats the known files and directories, a directory is only listed again
+    when its own modification time changed (i.e. an entry was added, removed or renamed).
+    """
+
+    def __init__(self, root: Path) -> None:
+        """
+        Args:
+            root: The directory to track
+        """
+        self.root = root
+        self.directories: Dict[Path, int] = {}
+        self.files: Dict[Path, int] = {}
+        if root.is_dir():
+            self._scan(root, set())
+
+    def _scan(self, directory: Path, added: Set[Path]):
+        """Records a directory and everything below it, collecting the files not known yet"""
+        try:
+            self.directories[directory] = directory.stat().st_mtime_ns
+            entries = list(os.scandir(directory))
+        except FileNotFoundError:
+            self.directories.pop(directory, None)
+            return
+
+        for entry in entries:
+            path = Path(entry.path)
+            if entry.is_dir():
+                if path not in self.directories:
+                    self._scan(path, added)
+            elif entry.is_file() and path not in self.files:
+                self.files[path] = entry.stat().st_mtime_ns
+                added.add(path)
+
+    def changes(self) -> Tuple[Set[Path], Set[Path]]:
+        """Updates the snapshot
+
+        Returns:
+            Tuple[Set[Path], Set[Path]]: The files added or modified, and the files removed, since
+            the last call
+
+        """
+        changed: Set[Path] = set()
+        removed: Set[Path] = set()
+
+        for directory, mtime in list(self.directories.items()):
+            try:
+                current = directory.stat().st_mtime_ns
+            except FileNotFoundError:
+                del self.directories[directory]
+                continue
+            if current != mtime:
+                self._scan(directory, changed)
+
+        for path, mtime in list(self.files.items()):
+            try:
+                current = path.stat().st_mtime_ns
+            except FileNotFoundError:
+                del self.files[path]
+                removed.add(path)
+                continue
+            if current != mtime:
+                self.files[path] = current
+                changed.add(path)
+
+        return changed, removed
+
+
+class SiteWatcher:
+    """Keeps a site up to date while its sources change.
+
+    A changed markdown file re-renders only its page, a changed template re-renders every page and
+    a changed static file is copied alone. The compiled template and the file snapshots stay in
+    memory between changes.
+    """
+
+    def __init__(
+        self,
+        source: Path,
+        template_path: Path,
+        statics: Path,
+        output: Path,
+        basepath: str = "/",
+        manifest: BuildManifest | None = None,
+        jobs: int = 1,
+    ) -> None:
+        """
+        Args:
+            source: Path to the markdown content
+            template_path: Path to the template file
+            statics: Path to the static files directory
+            output: Path to the output directory
+            basepath: The base path for relative URLs (default: "/")
+            manifest: The build manifest to keep up to date, if the build is incremental
+            jobs: The number of worker processes used when every page is re-rendered
+        """
+        self.source = source
+        self.template_path = template_path
+        self.statics = statics
+        self.output = output
+        self.basepath = basepath
+        self.manifest = manifest
+        self.jobs = jobs
+
+        self.template = Template.load(template_path, basepath)
+        self.template_mtime = template_path.stat().st_mtime_ns
+        self.content_snapshot = TreeSnapshot(source)
+        self.static_snapshot = TreeSnapshot(statics)
+
+    def page_destination(self, from_path: Path) -> Path:
+        """Returns the path of the HTML page generated from a markdown file"""
+        relative = from_path.relative_to(self.source)
+        return self.output / relative.parent / (relative.stem + ".html")
+
+    def poll(self) -> bool:
+        """Applies the changes made since the last poll
+
+        Returns:
+            bool: True if anything changed
+
+        """
+        template_changed = self._check_template()
+        changed_pages, removed_pages = self.content_snapshot.changes()
+        changed_statics, removed_statics = self.static_snapshot.changes()
+
+        if template_changed:
+            # every page depends on the template
+            self._render_all()
+        elif changed_pages:
+            self._render(sorted(changed_pages))
+        for from_path in removed_pages:
+            self._remove_page(from_path)
+
+        for static_path in changed_statics:
+            destination = self.output / static_path.relative_to(self.statics)
+            print(f"Copying {static_path} to {destination}")
+            destination.parent.mkdir(parents=True, exist_ok=True)
+            copy_file(static_path, destination)
+            if self.manifest is not None:
+                self.manifest.static.add(destination.relative_to(self.output).as_posix())
+        for static_path in removed_statics:
+            destination = self.output / static_path.relative_to(self.statics)
+            print(f"Removing {destination}, it was removed from {self.statics}")
+            remove_output(destination, self.output)
+            if self.manifest is not None:
+                self.manifest.static.discard(destination.relative_to(self.output).as_posix())
+
+        anything_changed = bool(
+            template_changed
+            or changed_pages
+            or removed_pages
+            or changed_statics
+            or removed_statics
+        )
+        if anything_changed and self.manifest is not None:
+            self.manifest.save()
+        return anything_changed
+
+    def run(self, interval: float = 0.25):
+        """Polls for changes until interrupted
+
+        Args:
+            interval: The seconds to wait between polls (default: 0.25)
+
+        """
+        print(f"Watching {self.source}, {self.statics} and {self.template_path} for changes")
+        try:
+            while True:
+                self.poll()
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopped watching")
+
+    def _check_template(self) -> bool:
+        try:
+            mtime = self.template_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return False
+        if mtime == self.template_mtime:
+            return False
+
+        self.template_mtime = mtime
+        try:
+            self.template = Template.load(self.template_path, self.basepath)
+        except OSError as e:
+            print(f"Could not reload {self.template_path}: {e}")
+            return False
+        return True
+
+    def _render_all(self):
+        self._render(sorted(self.content_snapshot.files), jobs=self.jobs)
+
+    def _render(self, pages: List[Path], jobs: int = 1):
+        tasks = [(from_path, self.page_destination(from_path)) for from_path in pages]
+        inline_cache = get_inline_cache()
+        if inline_cache is not None:
+            # every rebuild starts from an empty cache, its summary covers that rebuild only
+            inline_cache.clear()
+        failures = dict(render_pages(tasks, self.template, jobs))
+        if inline_cache is not None:
+            print(inline_cache.summary())
+
+        for from_path, error in failures.items():
+            # keep watching, the page is generated again on its next change
+            print(f"Failed to generate {from_path}: {type(error).__name__}: {error}")
+
+        if self.manifest is not None:
+            template_hash = file_digest(self.template_path)
+            for from_path, dest_path in tasks:
+                if from_path not in failures:
+                    self.manifest.record(
+                        from_path.relative_to(self.source),
+                        dest_path,
+                        file_digest(from_path),
+                        template_hash,
+                        self.basepath,
+                    )
+
+    def _remove_page(self, from_path: Path):
+        dest_path = self.page_destination(from_path)
+        print(f"Removing {dest_path}, its source is gone")
+        remove_output(dest_path, self.output)
+        if self.manifest is not None:
+            self.manifest.forget(dest_path)